@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:04
+
+import apps.core.identificadores
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0006_dropar_tabelas_legadas'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='departamento',
+            name='id',
+            field=models.UUIDField(db_column='id_departamento', default=apps.core.identificadores.uuid7, editable=False, primary_key=True, serialize=False, verbose_name='ID'),
+        ),
+        migrations.AlterField(
+            model_name='historicaluser',
+            name='id',
+            field=models.UUIDField(db_column='id_usuario', db_index=True, default=apps.core.identificadores.uuid7, editable=False, verbose_name='ID'),
+        ),
+        migrations.AlterField(
+            model_name='historicalusuariovinculo',
+            name='id',
+            field=models.UUIDField(db_column='id_usuario_vinculo', db_index=True, default=apps.core.identificadores.uuid7, editable=False, verbose_name='ID'),
+        ),
+        migrations.AlterField(
+            model_name='sistema',
+            name='id',
+            field=models.UUIDField(db_column='id_sistema', default=apps.core.identificadores.uuid7, editable=False, primary_key=True, serialize=False, verbose_name='ID'),
+        ),
+        migrations.AlterField(
+            model_name='user',
+            name='id',
+            field=models.UUIDField(db_column='id_usuario', default=apps.core.identificadores.uuid7, editable=False, primary_key=True, serialize=False, verbose_name='ID'),
+        ),
+        migrations.AlterField(
+            model_name='usuariovinculo',
+            name='id',
+            field=models.UUIDField(db_column='id_usuario_vinculo', default=apps.core.identificadores.uuid7, editable=False, primary_key=True, serialize=False, verbose_name='ID'),
+        ),
+    ]
@@ -11,10 +11,10 @@ Permissões = auth_group.permissions (Django nativo)
 Vínculos = usuario_vinculo (Sistema + Departamento)
 """
 
-import uuid
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, Group, PermissionsMixin
 from django.db import models
 from simple_history.models import HistoricalRecords
+from apps.core.identificadores import uuid7
 
 
 # ============================================================
@@ -38,7 +38,7 @@ class Sistema(models.Model):
     id = models.UUIDField(
         'ID',
         primary_key=True,
-        default=uuid.uuid4,
+        default=uuid7,
         editable=False,
         db_column='id_sistema'
     )
@@ -95,7 +95,7 @@ class Departamento(models.Model):
     id = models.UUIDField(
         'ID',
         primary_key=True,
-        default=uuid.uuid4,
+        default=uuid7,
         editable=False,
         db_column='id_departamento'
     )
@@ -181,7 +181,7 @@ class User(AbstractBaseUser, PermissionsMixin):
     id = models.UUIDField(
         'ID',
         primary_key=True,
-        default=uuid.uuid4,
+        default=uuid7,
         editable=False,
         db_column='id_usuario'
     )
@@ -509,7 +509,7 @@ class UsuarioVinculo(models.Model):
     id = models.UUIDField(
         'ID',
         primary_key=True,
-        default=uuid.uuid4,
+        default=uuid7,
         editable=False,
         db_column='id_usuario_vinculo'
     )
@@ -61,6 +61,8 @@ SHARED_ROUTES = {
 SISTEMA_ROUTES = {
     'prazos': {
         'pesquisa',           # Pesquisa unificada só existe em prazos
+        'vencimentos',        # Calendário de vencimentos de vínculos
+        'notificacoes',       # Alertas de vencimento
     },
     'ordem_servico': {
         'ordem_servico',      # App de ordens de serviço
@@ -196,6 +198,9 @@ class CargoBasedPermission(permissions.BasePermission):
     - PUT, PATCH → app.change_model
     - DELETE → app.delete_model
     
+    Ações podem definir o tipo de permissão na view, independente do método
+    (ex.: permissoes_por_acao = {'marcar_lida': 'view'}).
+    
     Mensagens de erro em português para melhor UX.
     
     Uso:
@@ -220,7 +225,9 @@ class CargoBasedPermission(permissions.BasePermission):
         Retorna o nome da permissão Django necessária.
         Ex: 'titulares.delete_titular'
         """
-        perm_type = self.METHOD_PERMISSION_MAP.get(request.method, 'view')
+        perm_type = getattr(view, 'permissoes_por_acao', {}).get(getattr(view, 'action', None))
+        if perm_type is None:
+            perm_type = self.METHOD_PERMISSION_MAP.get(request.method, 'view')
         
         # Obter o modelo da view
         model = None
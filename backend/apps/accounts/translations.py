@@ -35,6 +35,8 @@ MODEL_TRANSLATIONS = {
     'titulares.historicaltitular': 'histórico de titular',
     'titulares.historicaldependente': 'histórico de dependente',
     'titulares.historicalprocesso': 'histórico de processo',
+    'titulares.notificacao': 'notificação',
+    'titulares.execucaoalertavencimento': 'execução de alertas de vencimento',
     
     # ===== Empresa =====
     'empresa.empresa': 'empresa',
@@ -50,6 +50,13 @@ class ContratoAdmin(admin.ModelAdmin):
     
     inlines = [ContratoServicoInline]
     
+    def get_queryset(self, request):
+        from django.db.models import Q, Sum
+        # Evita a agregação de Contrato.valor_total_servicos por linha
+        return super().get_queryset(request).annotate(
+            soma_valor_servicos=Sum('servicos_contratados__valor', filter=Q(servicos_contratados__ativo=True))
+        )
+    
     def valor_total_servicos_display(self, obj):
         return f"R$ {obj.valor_total_servicos:,.2f}"
     valor_total_servicos_display.short_description = 'Valor Total'
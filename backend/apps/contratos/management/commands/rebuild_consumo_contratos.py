@@ -0,0 +1,31 @@
+"""
+Management command para reconstruir o razão de consumo dos serviços do contrato.
+
+Recalcula toda a tabela `consumo_contrato_servico` a partir dos itens das
+Ordens de Serviço não canceladas com uma única agregação (GROUP BY serviço
+do contrato) e informa quantas linhas estavam divergentes.
+
+Uso:
+    python manage.py rebuild_consumo_contratos
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.contratos.services.consumo import reconstruir_consumo
+
+
+class Command(BaseCommand):
+    help = 'Reconstrói o razão de consumo (quantidade/valor executados) dos serviços do contrato'
+    
+    def handle(self, *args, **options):
+        self.stdout.write('Reconstruindo razão de consumo dos contratos...')
+        
+        total, divergentes = reconstruir_consumo()
+        
+        if divergentes:
+            self.stdout.write(
+                self.style.WARNING(f'{divergentes} linhas estavam divergentes ou ausentes e foram corrigidas.')
+            )
+        self.stdout.write(
+            self.style.SUCCESS(f'✓ {total} linhas de consumo geradas com sucesso!')
+        )
@@ -0,0 +1,61 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:29
+
+import django.db.models.deletion
+import uuid
+from decimal import Decimal
+from django.db import migrations, models
+from django.db.models import DecimalField, F, IntegerField, Q, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+def popular_consumo(apps, schema_editor):
+    """Popula o razão de consumo com os itens das OS já existentes."""
+    ContratoServico = apps.get_model('contratos', 'ContratoServico')
+    ConsumoContratoServico = apps.get_model('contratos', 'ConsumoContratoServico')
+
+    filtro = Q(itens_os__ordem_servico__status__in=['ABERTA', 'FINALIZADA', 'FATURADA', 'RECEBIDA'])
+    totais = ContratoServico.objects.order_by().annotate(
+        soma_quantidade=Coalesce(
+            Sum('itens_os__quantidade', filter=filtro), Value(0), output_field=IntegerField()
+        ),
+        soma_valor=Coalesce(
+            Sum(F('itens_os__quantidade') * F('itens_os__valor_aplicado'), filter=filtro),
+            Value(Decimal('0.00')),
+            output_field=DecimalField(max_digits=14, decimal_places=2),
+        ),
+    ).values_list('id', 'soma_quantidade', 'soma_valor')
+    ConsumoContratoServico.objects.bulk_create([
+        ConsumoContratoServico(
+            contrato_servico_id=contrato_servico_id,
+            quantidade_executada=quantidade,
+            valor_executado=valor,
+        )
+        for contrato_servico_id, quantidade, valor in totais
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contratos', '0006_add_tipo_contrato'),
+        ('ordem_servico', '0017_documento_os_snapshot_comprimido'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ConsumoContratoServico',
+            fields=[
+                ('id', models.UUIDField(db_column='id_consumo_contrato_servico', default=uuid.uuid4, editable=False, primary_key=True, serialize=False, verbose_name='ID')),
+                ('quantidade_executada', models.PositiveIntegerField(default=0, verbose_name='Quantidade Executada')),
+                ('valor_executado', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14, verbose_name='Valor Executado')),
+                ('ultima_atualizacao', models.DateTimeField(auto_now=True, verbose_name='Última Atualização')),
+                ('contrato_servico', models.OneToOneField(db_column='id_contrato_servico', on_delete=django.db.models.deletion.CASCADE, related_name='consumo', to='contratos.contratoservico', verbose_name='Serviço do Contrato')),
+            ],
+            options={
+                'verbose_name': 'Consumo do Serviço do Contrato',
+                'verbose_name_plural': 'Consumo dos Serviços do Contrato',
+                'db_table': 'consumo_contrato_servico',
+            },
+        ),
+        migrations.RunPython(popular_consumo, migrations.RunPython.noop),
+    ]
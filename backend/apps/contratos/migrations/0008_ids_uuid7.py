@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:04
+
+import apps.core.identificadores
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contratos', '0007_consumo_contrato_servico'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='consumocontratoservico',
+            name='id',
+            field=models.UUIDField(db_column='id_consumo_contrato_servico', default=apps.core.identificadores.uuid7, editable=False, primary_key=True, serialize=False, verbose_name='ID'),
+        ),
+        migrations.AlterField(
+            model_name='contrato',
+            name='id',
+            field=models.UUIDField(db_column='id_contrato', default=apps.core.identificadores.uuid7, editable=False, primary_key=True, serialize=False, verbose_name='ID'),
+        ),
+        migrations.AlterField(
+            model_name='contratoservico',
+            name='id',
+            field=models.UUIDField(db_column='id_contrato_servico', default=apps.core.identificadores.uuid7, editable=False, primary_key=True, serialize=False, verbose_name='ID'),
+        ),
+    ]
@@ -1,8 +1,9 @@
-import uuid
 from decimal import Decimal
 from django.conf import settings
 from django.db import models
+from django.db.models import DEFERRED
 from django.core.validators import MinValueValidator
+from apps.core.identificadores import uuid7
 
 
 class Contrato(models.Model):
@@ -25,7 +26,7 @@ class Contrato(models.Model):
     id = models.UUIDField(
         'ID',
         primary_key=True,
-        default=uuid.uuid4,
+        default=uuid7,
         editable=False,
         db_column='id_contrato'
     )
@@ -127,11 +128,47 @@ class Contrato(models.Model):
     def valor_total_servicos(self):
         """Retorna o valor total de todos os serviços ativos do contrato."""
         from django.db.models import Sum
+        # Valor anotado na listagem/detalhe (ContratoViewSet) evita a agregação por instância
+        if 'soma_valor_servicos' in self.__dict__:
+            return self.soma_valor_servicos or Decimal('0.00')
         total = self.servicos_contratados.filter(ativo=True).aggregate(
             total=Sum('valor')
         )['total']
         return total or Decimal('0.00')
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._contratada_original = instance.__dict__.get('empresa_contratada_id', DEFERRED)
+        return instance
+    
+    def save(self, *args, **kwargs):
+        from apps.ordem_servico.services.faturamento import agendar_troca_contratada
+        from .services.cache import agendar_invalidacao
+        
+        anterior = getattr(self, '_contratada_original', DEFERRED)
+        atual = self.__dict__.get('empresa_contratada_id', DEFERRED)
+        if anterior is DEFERRED and atual is not DEFERRED and not self._state.adding:
+            # Campo adiado (.only/.defer) e atribuído depois: o anterior vem do banco
+            anterior = Contrato.objects.filter(pk=self.pk).values_list(
+                'empresa_contratada_id', flat=True
+            ).first()
+        
+        super().save(*args, **kwargs)
+        agendar_invalidacao([self.pk])
+        
+        # Resumo de faturamento é agrupado pela contratada do contrato
+        if not self._state.adding and DEFERRED not in (anterior, atual) and anterior != atual:
+            agendar_troca_contratada(self.pk, anterior, atual)
+        self._contratada_original = atual
+    
+    def delete(self, *args, **kwargs):
+        from .services.cache import agendar_invalidacao
+        contrato_id = self.pk
+        resultado = super().delete(*args, **kwargs)
+        agendar_invalidacao([contrato_id])
+        return resultado
+    
 
 class ContratoServico(models.Model):
     """
@@ -141,7 +178,7 @@ class ContratoServico(models.Model):
     id = models.UUIDField(
         'ID',
         primary_key=True,
-        default=uuid.uuid4,
+        default=uuid7,
         editable=False,
         db_column='id_contrato_servico'
     )
@@ -210,18 +247,80 @@ class ContratoServico(models.Model):
         """Retorna o valor do serviço (alias para compatibilidade com admin)."""
         return self.valor or Decimal('0.00')
 
+    def _consumo(self):
+        """Linha do razão de consumo (use select_related('consumo') nas listagens)."""
+        try:
+            return self.consumo
+        except ConsumoContratoServico.DoesNotExist:
+            return None
+
     @property
     def quantidade_executada(self):
         """Retorna a quantidade total já executada em OS (não canceladas)."""
-        from django.db.models import Sum
-        total = self.itens_os.filter(
-            ordem_servico__status__in=['RASCUNHO', 'ABERTA', 'EM_ANDAMENTO', 'AGUARDANDO', 'CONCLUIDA']
-        ).aggregate(total=Sum('quantidade'))['total']
-        return total or 0
+        consumo = self._consumo()
+        return consumo.quantidade_executada if consumo else 0
+
+    @property
+    def valor_executado(self):
+        """Retorna o valor total já executado em OS (não canceladas)."""
+        consumo = self._consumo()
+        return consumo.valor_executado if consumo else Decimal('0.00')
 
     def save(self, *args, **kwargs):
+        from .services.cache import agendar_invalidacao
+        adicionando = self._state.adding
         # Se valor não foi definido, usa o valor base do serviço
         if self.valor is None and self.servico is not None:
             self.valor = self.servico.valor_base
         super().save(*args, **kwargs)
+        if adicionando:
+            ConsumoContratoServico.objects.get_or_create(contrato_servico=self)
+        agendar_invalidacao([self.contrato_id])
+
+    def delete(self, *args, **kwargs):
+        from .services.cache import agendar_invalidacao
+        resultado = super().delete(*args, **kwargs)
+        agendar_invalidacao([self.contrato_id])
+        return resultado
+
+
+class ConsumoContratoServico(models.Model):
+    """
+    Razão de consumo de um serviço do contrato: quantidade e valor já
+    executados em OS não canceladas.
+
+    Mantido na mesma transação pelos save()/delete() de OrdemServicoItem e
+    OrdemServico (ver apps.contratos.services.consumo) e reconstruído pelo
+    comando `rebuild_consumo_contratos`.
+    """
+    id = models.UUIDField(
+        'ID',
+        primary_key=True,
+        default=uuid7,
+        editable=False,
+        db_column='id_consumo_contrato_servico'
+    )
+    contrato_servico = models.OneToOneField(
+        ContratoServico,
+        on_delete=models.CASCADE,
+        related_name='consumo',
+        verbose_name='Serviço do Contrato',
+        db_column='id_contrato_servico'
+    )
+    quantidade_executada = models.PositiveIntegerField('Quantidade Executada', default=0)
+    valor_executado = models.DecimalField(
+        'Valor Executado',
+        max_digits=14,
+        decimal_places=2,
+        default=Decimal('0.00')
+    )
+    ultima_atualizacao = models.DateTimeField('Última Atualização', auto_now=True)
+
+    class Meta:
+        verbose_name = 'Consumo do Serviço do Contrato'
+        verbose_name_plural = 'Consumo dos Serviços do Contrato'
+        db_table = 'consumo_contrato_servico'
+
+    def __str__(self):
+        return f"{self.contrato_servico_id} - {self.quantidade_executada}"
 
@@ -15,15 +15,18 @@ class ContratoServicoSerializer(serializers.ModelSerializer):
         read_only=True
     )
     quantidade_executada = serializers.IntegerField(read_only=True)
+    valor_executado = serializers.DecimalField(max_digits=14, decimal_places=2, read_only=True)
     criado_por_nome = serializers.CharField(source='criado_por.nome', read_only=True)
     atualizado_por_nome = serializers.CharField(source='atualizado_por.nome', read_only=True)
     
+    fontes_projecao = {'quantidade_executada': ('consumo',), 'valor_executado': ('consumo',)}
+    
     class Meta:
         model = ContratoServico
         fields = [
             'id', 'contrato', 'servico', 'servico_item', 'servico_descricao',
             'servico_valor_base', 'valor', 
-            'quantidade_executada', 'ativo',
+            'quantidade_executada', 'valor_executado', 'ativo',
             'data_criacao', 'ultima_atualizacao',
             'criado_por', 'criado_por_nome', 'atualizado_por', 'atualizado_por_nome'
         ]
@@ -60,13 +63,14 @@ class ContratoServicoListSerializer(serializers.ModelSerializer):
     servico_item = serializers.CharField(source='servico.item', read_only=True)
     servico_descricao = serializers.CharField(source='servico.descricao', read_only=True)
     quantidade_executada = serializers.IntegerField(read_only=True)
+    valor_executado = serializers.DecimalField(max_digits=14, decimal_places=2, read_only=True)
     
     class Meta:
         model = ContratoServico
         fields = [
             'id', 'servico', 'servico_item', 'servico_descricao',
             'valor',
-            'quantidade_executada', 'ativo'
+            'quantidade_executada', 'valor_executado', 'ativo'
         ]
     
 
@@ -87,6 +91,11 @@ class ContratoSerializer(serializers.ModelSerializer):
     servicos_contratados = ContratoServicoListSerializer(many=True, read_only=True)
     qtd_ordens_servico = serializers.SerializerMethodField()
     
+    # Totais anotados em ContratoViewSet.get_queryset (?fields=/?omit=)
+    fontes_projecao = {
+        'esta_ativo': (), 'valor_total_servicos': (), 'qtd_servicos': (), 'qtd_ordens_servico': (),
+    }
+    
     class Meta:
         model = Contrato
         fields = [
@@ -106,6 +115,9 @@ class ContratoSerializer(serializers.ModelSerializer):
         ]
     
     def get_qtd_ordens_servico(self, obj):
+        # Anotado em ContratoViewSet.get_queryset
+        if hasattr(obj, 'qtd_ordens_servico'):
+            return obj.qtd_ordens_servico
         return obj.ordens_servico.count()
 
 
@@ -121,6 +133,11 @@ class ContratoListSerializer(serializers.ModelSerializer):
     qtd_servicos = serializers.SerializerMethodField()
     qtd_ordens_servico = serializers.SerializerMethodField()
     
+    # Totais anotados em ContratoViewSet.get_queryset (?fields=/?omit=)
+    fontes_projecao = {
+        'esta_ativo': (), 'valor_total_servicos': (), 'qtd_servicos': (), 'qtd_ordens_servico': (),
+    }
+    
     class Meta:
         model = Contrato
         fields = [
@@ -134,9 +151,14 @@ class ContratoListSerializer(serializers.ModelSerializer):
         ]
     
     def get_qtd_servicos(self, obj):
+        # Anotado em ContratoViewSet.get_queryset
+        if hasattr(obj, 'qtd_servicos'):
+            return obj.qtd_servicos
         return obj.servicos_contratados.filter(ativo=True).count()
     
     def get_qtd_ordens_servico(self, obj):
+        if hasattr(obj, 'qtd_ordens_servico'):
+            return obj.qtd_ordens_servico
         return obj.ordens_servico.count()
 
 
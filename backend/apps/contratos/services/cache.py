@@ -0,0 +1,95 @@
+"""
+Cache das respostas de contratos usadas pelo formulário de OS.
+
+- `ativos`: cada página/projeção é guardada sob uma versão global, trocada
+  a cada escrita em Contrato, ContratoServico ou criação/exclusão de OS
+  (totais exibidos na listagem).
+- `servicos-disponiveis` (Contrato e OS): payload por contrato, removido nas
+  escritas do contrato, dos seus serviços e do razão de consumo.
+
+A invalidação é feita após o commit, pelos save()/delete() dos modelos.
+"""
+
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+CACHE_PREFIX = 'contratos'
+CHAVE_VERSAO_ATIVOS = f'{CACHE_PREFIX}:ativos:versao'
+
+
+def timeout_contratos():
+    return getattr(settings, 'CONTRATOS_CACHE_TIMEOUT', 60 * 5)
+
+
+# =============================================================================
+# CONTRATOS ATIVOS
+# =============================================================================
+def _versao_ativos():
+    versao = cache.get(CHAVE_VERSAO_ATIVOS)
+    if versao is None:
+        versao = uuid.uuid4().hex
+        if not cache.add(CHAVE_VERSAO_ATIVOS, versao, timeout=None):
+            versao = cache.get(CHAVE_VERSAO_ATIVOS, versao)
+    return versao
+
+
+def chave_ativos(hoje, caminho):
+    """Chave de uma página de `ativos` (a vigência depende da data atual)."""
+    return f'{CACHE_PREFIX}:ativos:{_versao_ativos()}:{hoje.isoformat()}:{caminho}'
+
+
+def obter_ativos(chave):
+    return cache.get(chave)
+
+
+def armazenar_ativos(chave, payload):
+    cache.set(chave, payload, timeout=timeout_contratos())
+
+
+def invalidar_contratos_ativos():
+    """Descarta todas as páginas de `ativos` trocando a versão."""
+    cache.set(CHAVE_VERSAO_ATIVOS, uuid.uuid4().hex, timeout=None)
+
+
+# =============================================================================
+# SERVIÇOS DISPONÍVEIS
+# =============================================================================
+def chave_servicos_disponiveis(contrato_id):
+    return f'{CACHE_PREFIX}:servicos_disponiveis:{contrato_id}'
+
+
+def obter_servicos_disponiveis(contrato_id):
+    return cache.get(chave_servicos_disponiveis(contrato_id))
+
+
+def armazenar_servicos_disponiveis(contrato_id, payload):
+    cache.set(chave_servicos_disponiveis(contrato_id), payload, timeout=timeout_contratos())
+
+
+def invalidar_servicos_disponiveis(*contrato_ids):
+    cache.delete_many([chave_servicos_disponiveis(contrato_id) for contrato_id in contrato_ids])
+
+
+# =============================================================================
+# INVALIDAÇÃO APÓS COMMIT
+# =============================================================================
+def agendar_invalidacao(contrato_ids=(), ativos=True):
+    """
+    Agenda a invalidação para depois do commit.
+
+    Args:
+        contrato_ids: contratos cujos serviços disponíveis mudaram
+        ativos: se a listagem de contratos ativos também deve ser descartada
+    """
+    contrato_ids = [contrato_id for contrato_id in contrato_ids if contrato_id]
+
+    def invalidar():
+        if ativos:
+            invalidar_contratos_ativos()
+        if contrato_ids:
+            invalidar_servicos_disponiveis(*contrato_ids)
+
+    transaction.on_commit(invalidar)
@@ -0,0 +1,166 @@
+"""
+Razão de consumo dos serviços do contrato.
+
+Mantém a tabela `consumo_contrato_servico` com a quantidade e o valor
+executados por ContratoServico em OS não canceladas
+(OrdemServico.STATUS_CONSUMO).
+
+- Atualização incremental: OrdemServicoItem.save()/delete() e
+  OrdemServico.save()/delete() aplicam os deltas com F() na mesma transação
+  da alteração.
+- Reconstrução completa: comando `python manage.py rebuild_consumo_contratos`.
+"""
+
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import DecimalField, F, IntegerField, Q, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+
+def consome_contrato(status):
+    """Indica se uma OS com o status informado consome os serviços do contrato."""
+    from apps.ordem_servico.models import OrdemServico
+
+    return status in OrdemServico.STATUS_CONSUMO
+
+
+def aplicar_consumo(deltas):
+    """
+    Soma os deltas ao razão de consumo.
+
+    Args:
+        deltas: dict {contrato_servico_id: (quantidade, valor)}
+    """
+    from ..models import ConsumoContratoServico, ContratoServico
+    from .cache import agendar_invalidacao
+
+    deltas = {chave: delta for chave, delta in deltas.items() if delta[0] or delta[1]}
+    if not deltas:
+        return
+
+    agora = timezone.now()
+    with transaction.atomic():
+        for contrato_servico_id, (quantidade, valor) in deltas.items():
+            atualizados = ConsumoContratoServico.objects.filter(
+                contrato_servico_id=contrato_servico_id
+            ).update(
+                quantidade_executada=F('quantidade_executada') + quantidade,
+                valor_executado=F('valor_executado') + valor,
+                ultima_atualizacao=agora,
+            )
+            if not atualizados:
+                # Serviço criado antes do razão: recalcula a linha inteira
+                recalcular_consumo([contrato_servico_id])
+
+        # Serviços disponíveis em cache exibem as quantidades executadas
+        agendar_invalidacao(
+            set(ContratoServico.objects.filter(pk__in=deltas).values_list('contrato_id', flat=True)),
+            ativos=False,
+        )
+
+
+def acumular(deltas, contrato_servico_id, quantidade, valor, sinal=1):
+    """Acumula (quantidade, valor) * sinal em `deltas` para o serviço do contrato."""
+    quantidade_atual, valor_atual = deltas.get(contrato_servico_id, (0, Decimal('0.00')))
+    deltas[contrato_servico_id] = (
+        quantidade_atual + sinal * quantidade,
+        valor_atual + sinal * valor,
+    )
+    return deltas
+
+
+def aplicar_consumo_os(ordem_servico_id, sinal):
+    """
+    Soma (sinal=1) ou subtrai (sinal=-1) do razão todos os itens de uma OS.
+
+    Usado quando a OS entra ou sai de STATUS_CONSUMO e na sua exclusão.
+    """
+    from apps.ordem_servico.models import OrdemServicoItem
+
+    itens = OrdemServicoItem.objects.filter(
+        ordem_servico_id=ordem_servico_id
+    ).order_by().values('contrato_servico').annotate(
+        soma_quantidade=Sum('quantidade'),
+        soma_valor=Sum(F('quantidade') * F('valor_aplicado')),
+    )
+
+    deltas = {}
+    for item in itens:
+        acumular(
+            deltas, item['contrato_servico'],
+            item['soma_quantidade'] or 0, item['soma_valor'] or Decimal('0.00'), sinal
+        )
+    aplicar_consumo(deltas)
+
+
+def _consumo_por_servico(queryset):
+    """Anota quantidade e valor executados em um queryset de ContratoServico."""
+    from apps.ordem_servico.models import OrdemServico
+
+    filtro = Q(itens_os__ordem_servico__status__in=OrdemServico.STATUS_CONSUMO)
+    return queryset.order_by().annotate(
+        soma_quantidade=Coalesce(
+            Sum('itens_os__quantidade', filter=filtro), Value(0), output_field=IntegerField()
+        ),
+        soma_valor=Coalesce(
+            Sum(F('itens_os__quantidade') * F('itens_os__valor_aplicado'), filter=filtro),
+            Value(Decimal('0.00')),
+            output_field=DecimalField(max_digits=14, decimal_places=2),
+        ),
+    ).values_list('id', 'soma_quantidade', 'soma_valor')
+
+
+def recalcular_consumo(contrato_servico_ids):
+    """Recalcula as linhas do razão dos serviços informados a partir dos itens de OS."""
+    from ..models import ContratoServico, ConsumoContratoServico
+
+    totais = _consumo_por_servico(ContratoServico.objects.filter(pk__in=contrato_servico_ids))
+    with transaction.atomic():
+        for contrato_servico_id, quantidade, valor in totais:
+            ConsumoContratoServico.objects.update_or_create(
+                contrato_servico_id=contrato_servico_id,
+                defaults={'quantidade_executada': quantidade, 'valor_executado': valor},
+            )
+
+
+def reconstruir_consumo():
+    """
+    Reconstrói todo o razão de consumo com uma única agregação
+    (GROUP BY serviço do contrato), incluindo serviços sem execução.
+
+    Returns:
+        tuple: (linhas geradas, linhas que estavam divergentes ou ausentes)
+    """
+    from ..models import ContratoServico, ConsumoContratoServico
+    from .cache import agendar_invalidacao
+
+    with transaction.atomic():
+        atuais = {
+            contrato_servico_id: (quantidade, valor)
+            for contrato_servico_id, quantidade, valor in ConsumoContratoServico.objects.values_list(
+                'contrato_servico_id', 'quantidade_executada', 'valor_executado'
+            )
+        }
+        linhas = [
+            ConsumoContratoServico(
+                contrato_servico_id=contrato_servico_id,
+                quantidade_executada=quantidade,
+                valor_executado=valor,
+            )
+            for contrato_servico_id, quantidade, valor in _consumo_por_servico(ContratoServico.objects.all())
+        ]
+        divergentes = sum(
+            1 for linha in linhas
+            if atuais.get(linha.contrato_servico_id) != (linha.quantidade_executada, linha.valor_executado)
+        )
+        ConsumoContratoServico.objects.all().delete()
+        ConsumoContratoServico.objects.bulk_create(linhas, batch_size=1000)
+
+        agendar_invalidacao(
+            set(ContratoServico.objects.values_list('contrato_id', flat=True)),
+            ativos=False,
+        )
+
+    return len(linhas), divergentes
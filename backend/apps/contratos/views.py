@@ -1,3 +1,5 @@
+from django.db.models import Count, IntegerField, OuterRef, Prefetch, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
 from rest_framework import viewsets, filters, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
@@ -14,6 +16,7 @@ from .serializers import (
     ContratoServicoListSerializer
 )
 from apps.accounts.permissions import CargoBasedPermission, PermissionMessageMixin
+from apps.core.projecao import ProjecaoCamposMixin
 
 
 # =============================================================================
@@ -68,7 +71,25 @@ class ContratoServicoFilter(django_filters.FilterSet):
 # VIEWSETS
 # =============================================================================
 
-class ContratoViewSet(PermissionMessageMixin, viewsets.ModelViewSet):
+def servicos_disponiveis_contrato(contrato_id):
+    """
+    Payload dos serviços ativos do contrato (ContratoServicoListSerializer),
+    usado por Contrato e OS. Fica em cache até uma escrita no contrato,
+    nos seus serviços ou no razão de consumo.
+    """
+    from .services.cache import obter_servicos_disponiveis, armazenar_servicos_disponiveis
+    
+    payload = obter_servicos_disponiveis(contrato_id)
+    if payload is None:
+        servicos = ContratoServico.objects.filter(
+            contrato_id=contrato_id, ativo=True
+        ).select_related('servico', 'consumo')
+        payload = ContratoServicoListSerializer(servicos, many=True).data
+        armazenar_servicos_disponiveis(contrato_id, payload)
+    return payload
+
+
+class ContratoViewSet(PermissionMessageMixin, ProjecaoCamposMixin, viewsets.ModelViewSet):
     """
     ViewSet para gerenciamento de Contratos.
     
@@ -85,13 +106,7 @@ class ContratoViewSet(PermissionMessageMixin, viewsets.ModelViewSet):
     - POST /contratos/{id}/cancelar/ - Cancela contrato
     """
     
-    queryset = Contrato.objects.select_related(
-        'empresa_contratante',
-        'criado_por', 'atualizado_por'
-    ).prefetch_related(
-        'servicos_contratados', 'servicos_contratados__servico',
-        'ordens_servico'
-    )
+    queryset = Contrato.objects.all()
     permission_classes = [IsAuthenticated, CargoBasedPermission]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_class = ContratoFilter
@@ -99,6 +114,64 @@ class ContratoViewSet(PermissionMessageMixin, viewsets.ModelViewSet):
     ordering_fields = ['numero', 'status', 'data_inicio', 'data_fim', 'data_criacao']
     ordering = ['-data_criacao']
     
+    def get_queryset(self):
+        """
+        Queryset por ação.
+
+        - list/ativos: totais anotados (qtd_servicos, qtd_ordens_servico,
+          soma_valor_servicos), sem prefetch.
+        - ações que só usam o próprio contrato (servicos, ordens-servico...):
+          apenas o contrato.
+        - demais (retrieve, ativar, finalizar...): o que ContratoSerializer
+          renderiza — empresas, auditoria, serviços contratados e totais.
+        """
+        queryset = Contrato.objects.select_related('empresa_contratante', 'empresa_contratada')
+
+        if self.action in ['servicos', 'ordens_servico']:
+            return queryset
+        
+        if self.action == 'servicos_disponiveis':
+            # Só o id é usado; os serviços vêm do cache
+            return Contrato.objects.only('id')
+
+        if self.action in ['list', 'ativos']:
+            return self._anotar_totais(queryset)
+
+        return self._anotar_totais(queryset).select_related(
+            'criado_por', 'atualizado_por'
+        ).prefetch_related(
+            Prefetch(
+                'servicos_contratados',
+                queryset=ContratoServico.objects.select_related('servico', 'consumo')
+            )
+        )
+
+    @staticmethod
+    def _anotar_totais(queryset):
+        """
+        Anota os totais exibidos pelos serializers de contrato.
+
+        A contagem de OS usa subquery para não multiplicar as linhas do join
+        com servicos_contratados (o que distorceria a soma dos valores).
+        """
+        from apps.ordem_servico.models import OrdemServico
+
+        qtd_ordens = OrdemServico.objects.filter(
+            contrato=OuterRef('pk')
+        ).order_by().values('contrato').annotate(total=Count('pk')).values('total')
+
+        return queryset.annotate(
+            qtd_servicos=Count(
+                'servicos_contratados',
+                filter=Q(servicos_contratados__ativo=True)
+            ),
+            soma_valor_servicos=Sum(
+                'servicos_contratados__valor',
+                filter=Q(servicos_contratados__ativo=True)
+            ),
+            qtd_ordens_servico=Coalesce(Subquery(qtd_ordens, output_field=IntegerField()), 0),
+        )
+
     def get_serializer_class(self):
         if self.action == 'list':
             return ContratoListSerializer
@@ -117,18 +190,15 @@ class ContratoViewSet(PermissionMessageMixin, viewsets.ModelViewSet):
         """Lista TODOS os serviços vinculados ao contrato (ativos e inativos)."""
         contrato = self.get_object()
         # Retorna todos os serviços para visualização no contrato
-        servicos = contrato.servicos_contratados.select_related('servico')
+        servicos = contrato.servicos_contratados.select_related('servico', 'consumo')
         serializer = ContratoServicoListSerializer(servicos, many=True)
         return Response(serializer.data)
     
     @action(detail=True, methods=['get'], url_path='servicos-disponiveis')
     def servicos_disponiveis(self, request, pk=None):
-        """Lista serviços do contrato disponíveis para execução."""
+        """Lista serviços do contrato disponíveis para execução (em cache por contrato)."""
         contrato = self.get_object()
-        servicos = contrato.servicos_contratados.select_related('servico').filter(ativo=True)
-        
-        serializer = ContratoServicoListSerializer(servicos, many=True)
-        return Response(serializer.data)
+        return Response(servicos_disponiveis_contrato(contrato.pk))
     
     @action(detail=True, methods=['get'], url_path='ordens-servico')
     def ordens_servico(self, request, pk=None):
@@ -141,21 +211,77 @@ class ContratoViewSet(PermissionMessageMixin, viewsets.ModelViewSet):
         serializer = OrdemServicoListSerializer(ordens, many=True)
         return Response(serializer.data)
     
+    # Campos aceitos em ?fields= na listagem de ativos (campo na resposta -> caminho no ORM)
+    CAMPOS_PROJECAO_ATIVOS = {
+        'id': 'id',
+        'tipo': 'tipo',
+        'numero': 'numero',
+        'status': 'status',
+        'empresa': 'empresa_contratante__nome',
+        'empresa_contratante': 'empresa_contratante_id',
+        'empresa_contratada': 'empresa_contratada_id',
+        'data_inicio': 'data_inicio',
+        'data_fim': 'data_fim',
+    }
+    
     @action(detail=False, methods=['get'])
     def ativos(self, request):
-        """Retorna apenas contratos ativos e dentro da vigência."""
+        """
+        Retorna apenas contratos ativos e dentro da vigência (paginado, em cache).
+        
+        Com ?fields=id,numero,empresa retorna só os campos informados, sem os
+        totais da listagem (uso em selects/autocomplete).
+        """
         from django.utils import timezone
-        from django.db.models import Q
+        from .services.cache import chave_ativos, obter_ativos, armazenar_ativos
         
         hoje = timezone.now().date()
-        queryset = self.queryset.filter(
+        chave = chave_ativos(hoje, request.get_full_path())
+        payload = obter_ativos(chave)
+        if payload is not None:
+            return Response(payload)
+        
+        campos = self._campos_projecao_ativos(request)
+        queryset = Contrato.objects.all() if campos else self.get_queryset()
+        queryset = self.filter_queryset(queryset).filter(
             status='ATIVO'
         ).filter(
             Q(data_fim__isnull=True) | Q(data_fim__gte=hoje),
             data_inicio__lte=hoje
         )
-        serializer = ContratoListSerializer(queryset, many=True)
-        return Response(serializer.data)
+        
+        if campos:
+            queryset = queryset.values(*[self.CAMPOS_PROJECAO_ATIVOS[campo] for campo in campos])
+        
+        page = self.paginate_queryset(queryset)
+        linhas = page if page is not None else queryset
+        if campos:
+            data = [
+                {campo: linha[self.CAMPOS_PROJECAO_ATIVOS[campo]] for campo in campos}
+                for linha in linhas
+            ]
+        else:
+            data = ContratoListSerializer(linhas, many=True).data
+        
+        response = self.get_paginated_response(data) if page is not None else Response(data)
+        armazenar_ativos(chave, response.data)
+        return response
+    
+    def _campos_projecao_ativos(self, request):
+        """Valida ?fields= de `ativos`; retorna a lista de campos (vazia = serializer completo)."""
+        from rest_framework.exceptions import ValidationError
+        
+        fields = request.query_params.get('fields')
+        if not fields:
+            return []
+        campos = [campo.strip() for campo in fields.split(',') if campo.strip()]
+        invalidos = [campo for campo in campos if campo not in self.CAMPOS_PROJECAO_ATIVOS]
+        if invalidos:
+            raise ValidationError({
+                'fields': f"Campos inválidos: {', '.join(invalidos)}. "
+                          f"Permitidos: {', '.join(self.CAMPOS_PROJECAO_ATIVOS)}."
+            })
+        return campos
     
     @action(detail=True, methods=['post'])
     def ativar(self, request, pk=None):
@@ -235,7 +361,7 @@ class ContratoViewSet(PermissionMessageMixin, viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class ContratoServicoViewSet(PermissionMessageMixin, viewsets.ModelViewSet):
+class ContratoServicoViewSet(PermissionMessageMixin, ProjecaoCamposMixin, viewsets.ModelViewSet):
     """
     ViewSet para gerenciamento de Serviços vinculados a Contratos.
     
@@ -248,7 +374,7 @@ class ContratoServicoViewSet(PermissionMessageMixin, viewsets.ModelViewSet):
     """
     
     queryset = ContratoServico.objects.select_related(
-        'contrato', 'servico', 'criado_por', 'atualizado_por'
+        'contrato', 'servico', 'consumo', 'criado_por', 'atualizado_por'
     )
     serializer_class = ContratoServicoSerializer
     permission_classes = [IsAuthenticated, CargoBasedPermission]
@@ -0,0 +1,375 @@
+"""
+Criação e atualização em lote (`POST /<recurso>/bulk/`).
+
+- `ListaEmLoteSerializer`: ListSerializer com validação em conjunto
+  (relacionamentos carregados com uma consulta por campo e unicidade
+  verificada com lookups `__in`) e gravação com bulk_create/bulk_update.
+- `RelacionadoPorPk`: PrimaryKeyRelatedField que, dentro de um lote, busca
+  o objeto já carregado em vez de fazer um `get()` por item.
+- `EmLoteMixin`: action `bulk` para ModelViewSets; itens com `id` são
+  atualizados (parcialmente), os demais criados. O lote é gravado por
+  inteiro ou nada é gravado.
+"""
+
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework import serializers, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from rest_framework.validators import UniqueValidator
+
+from apps.accounts.permissions import PERMISSION_MESSAGES
+
+TAMANHO_LOTE_BANCO = 1000
+# bulk_update gera um CASE com um WHEN por linha: lotes menores são mais rápidos
+TAMANHO_LOTE_UPDATE = 200
+
+
+def max_itens_lote():
+    return getattr(settings, 'BULK_MAX_ITENS', 5000)
+
+
+def valores_em_uso(model, campos, itens):
+    """
+    Verifica em uma única consulta quais valores de campos únicos já estão em
+    uso, no banco ou em outro item do próprio lote.
+
+    Args:
+        model: modelo consultado
+        campos: dict {campo: mensagem de duplicidade}
+        itens: lista de (dados validados, pk do registro em edição ou None)
+
+    Returns:
+        list: um dict {campo: [mensagem]} por item (vazio quando não há conflito)
+    """
+    valores = {
+        campo: {dados[campo] for dados, _ in itens if dados.get(campo)}
+        for campo in campos
+    }
+    filtro = Q()
+    for campo, conjunto in valores.items():
+        if len(conjunto) == 1:
+            filtro |= Q(**{campo: next(iter(conjunto))})
+        elif conjunto:
+            filtro |= Q(**{f'{campo}__in': conjunto})
+
+    # Valor -> pk de quem já o utiliza (no banco e, depois, no próprio lote)
+    em_uso = {campo: {} for campo in campos}
+    if filtro:
+        for registro in model._default_manager.filter(filtro).values('pk', *campos):
+            for campo in campos:
+                if registro[campo] in valores[campo]:
+                    em_uso[campo][registro[campo]] = registro['pk']
+
+    erros = []
+    for dados, pk in itens:
+        erros_item = {}
+        for campo, mensagem in campos.items():
+            valor = dados.get(campo)
+            if not valor:
+                continue
+            dono = em_uso[campo].get(valor)
+            if isinstance(dono, tuple):
+                erros_item[campo] = ['Valor repetido em outro item do lote.']
+            elif dono is not None and dono != pk:
+                erros_item[campo] = [mensagem]
+            else:
+                # Itens seguintes do lote não podem repetir o valor
+                em_uso[campo][valor] = pk if pk is not None else ('lote',)
+        erros.append(erros_item)
+    return erros
+
+
+class RelacionadoPorPk(serializers.PrimaryKeyRelatedField):
+    """
+    PrimaryKeyRelatedField que usa os objetos pré-carregados pelo
+    ListaEmLoteSerializer. Fora de um lote se comporta como o original.
+    """
+
+    def to_internal_value(self, data):
+        carregados = getattr(self.root, 'relacionados_carregados', {}).get(self.field_name)
+        if carregados is None:
+            return super().to_internal_value(data)
+        try:
+            pk = self.get_queryset().model._meta.pk.to_python(data)
+        except (DjangoValidationError, TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        if pk not in carregados:
+            self.fail('does_not_exist', pk_value=data)
+        return carregados[pk]
+
+
+class ListaEmLoteSerializer(serializers.ListSerializer):
+    """
+    ListSerializer para lotes de criação ou atualização.
+
+    Para atualização, `instance` é a lista de registros na mesma ordem dos
+    dados. O serializer filho recebe `validacao_em_lote = True` durante a
+    validação, para pular verificações que o lote faz em conjunto.
+    """
+
+    # Campos únicos verificados em conjunto: {campo: mensagem}. Por padrão,
+    # os campos do filho que têm UniqueValidator.
+    campos_unicos = None
+
+    def _instancias(self, quantidade):
+        instancias = self.instance
+        if isinstance(instancias, (list, tuple)) and len(instancias) == quantidade:
+            return list(instancias)
+        return [None] * quantidade
+
+    def _carregar_relacionados(self, data):
+        """Carrega os objetos referenciados pelo lote com uma consulta por campo."""
+        self.relacionados_carregados = {}
+        for nome, campo in self.child.fields.items():
+            if campo.read_only or not isinstance(campo, RelacionadoPorPk):
+                continue
+            pk_field = campo.get_queryset().model._meta.pk
+            pks = set()
+            for item in data:
+                valor = item.get(nome) if isinstance(item, dict) else None
+                if valor in (None, ''):
+                    continue
+                try:
+                    pks.add(pk_field.to_python(valor))
+                except (DjangoValidationError, TypeError, ValueError):
+                    continue
+            self.relacionados_carregados[nome] = campo.get_queryset().in_bulk(pks) if pks else {}
+
+    def _campos_unicos(self):
+        if self.campos_unicos is not None:
+            return self.campos_unicos
+        campos = {}
+        for nome, campo in self.child.fields.items():
+            unicos = [v for v in campo.validators if isinstance(v, UniqueValidator)]
+            if unicos:
+                campos[campo.source] = unicos[0].message
+                # Verificado em conjunto, depois da validação dos itens
+                campo.validators = [v for v in campo.validators if not isinstance(v, UniqueValidator)]
+        self.campos_unicos = campos
+        return campos
+
+    def validar_lote(self, validados, indices):
+        """
+        Validações do lote inteiro sobre os itens válidos (`indices` são as
+        posições no lote); retorna um dict de erros por item.
+        """
+        campos = self._campos_unicos()
+        if not campos:
+            return [{} for _ in validados]
+        pks = [getattr(self._instancias_validacao[indice], 'pk', None) for indice in indices]
+        return valores_em_uso(self.child.Meta.model, campos, list(zip(validados, pks)))
+
+    def to_internal_value(self, data):
+        if not isinstance(data, list) or not data:
+            # Lista vazia ou outro tipo: erros padrão do ListSerializer
+            return super().to_internal_value(data)
+        if self.max_length is not None and len(data) > self.max_length:
+            return super().to_internal_value(data)
+
+        self._carregar_relacionados(data)
+        self._campos_unicos()
+        self._instancias_validacao = self._instancias(len(data))
+        self.child.validacao_em_lote = True
+        validados, erros = [], []
+        try:
+            for item, instancia in zip(data, self._instancias_validacao):
+                # Cada item é validado contra o seu próprio registro (atualização)
+                self.child.instance = instancia
+                try:
+                    validados.append(self.run_child_validation(item))
+                    erros.append({})
+                except serializers.ValidationError as exc:
+                    validados.append(None)
+                    erros.append(exc.detail)
+        finally:
+            self.child.validacao_em_lote = False
+            self.child.instance = None
+            self.relacionados_carregados = {}
+
+        # Validação em conjunto dos itens válidos, para reportar todos os
+        # erros do lote de uma vez
+        indices = [indice for indice, dados in enumerate(validados) if dados is not None]
+        erros_lote = self.validar_lote([validados[indice] for indice in indices], indices)
+        for indice, erros_item in zip(indices, erros_lote):
+            erros[indice] = erros_item
+
+        if any(erros):
+            raise serializers.ValidationError(erros)
+        return validados
+
+    def create(self, validated_data):
+        model = self.child.Meta.model
+        objetos = [model(**dados) for dados in validated_data]
+        model._default_manager.bulk_create(objetos, batch_size=TAMANHO_LOTE_BANCO)
+        return objetos
+
+    def update(self, instances, validated_data):
+        model = self.child.Meta.model
+        campos = set()
+        for instancia, dados in zip(instances, validated_data):
+            for campo, valor in dados.items():
+                setattr(instancia, campo, valor)
+            campos.update(dados)
+        # bulk_update não aplica auto_now
+        agora = timezone.now()
+        for campo in model._meta.concrete_fields:
+            if getattr(campo, 'auto_now', False):
+                for instancia in instances:
+                    setattr(instancia, campo.attname, agora)
+                campos.add(campo.name)
+
+        # Campos com o mesmo valor em todos os itens (auditoria, timestamps,
+        # alterações em massa) vão em um único UPDATE; os demais em
+        # bulk_update (CASE por pk), em lotes menores
+        constantes, variaveis = {}, []
+        for nome in campos:
+            attname = model._meta.get_field(nome).attname
+            try:
+                valores = {getattr(instancia, attname) for instancia in instances}
+            except TypeError:
+                # Valores não hasheáveis (ex.: JSON)
+                valores = ()
+            if len(valores) == 1:
+                constantes[attname] = valores.pop()
+            else:
+                variaveis.append(nome)
+        pks = [instancia.pk for instancia in instances]
+        for inicio in range(0, len(pks), TAMANHO_LOTE_BANCO):
+            if constantes:
+                model._default_manager.filter(pk__in=pks[inicio:inicio + TAMANHO_LOTE_BANCO]).update(**constantes)
+        if variaveis:
+            model._default_manager.bulk_update(instances, variaveis, batch_size=TAMANHO_LOTE_UPDATE)
+        return instances
+
+
+class EmLoteMixin:
+    """
+    Adiciona `POST /<recurso>/bulk/` a um ModelViewSet.
+
+    Corpo: lista de objetos (até BULK_MAX_ITENS). Itens com `id` atualizam o
+    registro (exige também a permissão de alteração); os demais são criados.
+    O serializer de escrita deve declarar `list_serializer_class` como
+    ListaEmLoteSerializer (ou subclasse).
+
+    Resposta: `resultados` com `indice`, `id` e `operacao` (criado/atualizado)
+    de cada item; em caso de erro, `erros` por item e nada é gravado.
+    """
+
+    def perform_bulk_create(self, serializer):
+        serializer.save(criado_por=self.request.user, atualizado_por=self.request.user)
+
+    def perform_bulk_update(self, serializer):
+        serializer.save(atualizado_por=self.request.user)
+
+    def _verificar_permissao_alteracao(self, request):
+        opts = self.get_queryset().model._meta
+        if request.user.is_superuser or request.user.has_perm(f'{opts.app_label}.change_{opts.model_name}'):
+            return
+        self.permission_denied(request, message=PERMISSION_MESSAGES['change'])
+
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """Cria e/ou atualiza vários registros de uma vez."""
+        itens = request.data
+        if not isinstance(itens, list) or not itens:
+            return Response(
+                {'error': 'Envie uma lista de objetos.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(itens) > max_itens_lote():
+            return Response(
+                {'error': f'O lote aceita no máximo {max_itens_lote()} itens.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        criacoes, atualizacoes = [], []
+        for indice, item in enumerate(itens):
+            if isinstance(item, dict) and item.get('id'):
+                atualizacoes.append((indice, item))
+            else:
+                criacoes.append((indice, item))
+
+        erros = {}
+        instancias = []
+        if atualizacoes:
+            self._verificar_permissao_alteracao(request)
+            pk_field = self.get_queryset().model._meta.pk
+            pks = set()
+            for indice, item in atualizacoes:
+                try:
+                    pks.add(pk_field.to_python(item['id']))
+                except DjangoValidationError:
+                    erros[indice] = {'id': ['Identificador inválido.']}
+            # Só os registros: relações pré-carregadas da listagem não são usadas
+            queryset = self.get_queryset().select_related(None).prefetch_related(None)
+            existentes = queryset.in_bulk(pks) if pks else {}
+            validas = []
+            for indice, item in atualizacoes:
+                if indice in erros:
+                    continue
+                instancia = existentes.get(pk_field.to_python(item['id']))
+                if instancia is None:
+                    erros[indice] = {'id': ['Registro não encontrado.']}
+                    continue
+                validas.append((indice, item))
+                instancias.append(instancia)
+            atualizacoes = validas
+
+        serializer_criacao = serializer_atualizacao = None
+        if criacoes:
+            serializer_criacao = self.get_serializer(data=[item for _, item in criacoes], many=True)
+            if not serializer_criacao.is_valid():
+                erros.update(self._erros_por_item(criacoes, serializer_criacao.errors))
+        if atualizacoes:
+            serializer_atualizacao = self.get_serializer(
+                instancias, data=[item for _, item in atualizacoes], many=True, partial=True
+            )
+            if not serializer_atualizacao.is_valid():
+                erros.update(self._erros_por_item(atualizacoes, serializer_atualizacao.errors))
+
+        if erros:
+            return Response({
+                'error': f'{len(erros)} item(ns) inválido(s). Nenhum registro foi gravado.',
+                'erros': [
+                    {'indice': indice, 'erros': erros[indice]} for indice in sorted(erros)
+                ],
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        resultados = []
+        with transaction.atomic():
+            if serializer_criacao is not None:
+                self.perform_bulk_create(serializer_criacao)
+                resultados += [
+                    {'indice': indice, 'id': objeto.pk, 'operacao': 'criado'}
+                    for (indice, _), objeto in zip(criacoes, serializer_criacao.instance)
+                ]
+            if serializer_atualizacao is not None:
+                self.perform_bulk_update(serializer_atualizacao)
+                resultados += [
+                    {'indice': indice, 'id': objeto.pk, 'operacao': 'atualizado'}
+                    for (indice, _), objeto in zip(atualizacoes, serializer_atualizacao.instance)
+                ]
+        resultados.sort(key=lambda resultado: resultado['indice'])
+
+        return Response({
+            'total': len(resultados),
+            'criados': len(criacoes),
+            'atualizados': len(atualizacoes),
+            'resultados': resultados,
+        }, status=status.HTTP_201_CREATED if criacoes else status.HTTP_200_OK)
+
+    @staticmethod
+    def _erros_por_item(itens, erros_lista):
+        """Mapeia os erros do ListSerializer para os índices originais do lote."""
+        if isinstance(erros_lista, dict):
+            # Erro do lote inteiro (ex.: não é uma lista) ou formato em dict
+            if all(isinstance(chave, int) for chave in erros_lista):
+                return {itens[chave][0]: erro for chave, erro in erros_lista.items()}
+            return {indice: erros_lista for indice, _ in itens}
+        return {
+            indice: erro for (indice, _), erro in zip(itens, erros_lista) if erro
+        }
@@ -0,0 +1,76 @@
+"""
+Campos de modelo customizados.
+"""
+import json
+import zlib
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.db.models.query_utils import DeferredAttribute
+
+
+class _JSONComprimido(bytes):
+    """Conteúdo ainda comprimido, lido do banco e não decodificado."""
+
+
+def comprimir_json(value, encoder=DjangoJSONEncoder):
+    return zlib.compress(
+        json.dumps(value, cls=encoder, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    )
+
+
+def descomprimir_json(raw):
+    return json.loads(zlib.decompress(raw).decode('utf-8'))
+
+
+class _CompressedJSONDescriptor(DeferredAttribute):
+    """Decodifica o JSON comprimido apenas no primeiro acesso ao atributo."""
+
+    def __get__(self, instance, cls=None):
+        if instance is None:
+            return self
+        value = super().__get__(instance, cls)
+        if isinstance(value, _JSONComprimido):
+            value = descomprimir_json(value)
+            instance.__dict__[self.field.attname] = value
+        return value
+
+    def __set__(self, instance, value):
+        # Descriptor de dados: garante que __get__ seja chamado mesmo com o
+        # valor já presente em instance.__dict__
+        instance.__dict__[self.field.attname] = value
+
+
+class CompressedJSONField(models.JSONField):
+    """
+    JSONField armazenado como JSON comprimido (zlib) em coluna binária.
+
+    Na API e no código se comporta como um JSONField comum; no banco ocupa
+    uma fração do espaço do jsonb. O valor lido do banco só é descomprimido
+    no primeiro acesso ao atributo. Lookups por chave JSON não são suportados.
+    """
+
+    descriptor_class = _CompressedJSONDescriptor
+
+    def get_internal_type(self):
+        return 'BinaryField'
+
+    def get_db_prep_value(self, value, connection, prepared=False):
+        if value is None:
+            return None
+        if not isinstance(value, _JSONComprimido):
+            value = comprimir_json(value, self.encoder or DjangoJSONEncoder)
+        return connection.Database.Binary(bytes(value))
+
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return value
+        return _JSONComprimido(value)
+
+    def to_python(self, value):
+        if isinstance(value, _JSONComprimido):
+            return descomprimir_json(value)
+        return value
+
+    def value_from_object(self, obj):
+        return self.to_python(super().value_from_object(obj))
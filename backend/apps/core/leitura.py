@@ -0,0 +1,237 @@
+"""
+Leitura rápida de listagens a partir de `.values()`.
+
+Com page_size de até 1000, instanciar o ModelSerializer e serializar campo a
+campo domina o tempo das listagens. `LeituraRapida` monta as mesmas linhas
+do serializer de referência direto dos dicionários de `.values()`:
+
+- o mapeamento campo -> coluna é calculado uma vez a partir do serializer
+  (`source` com `__`, ex.: `empresa.nome` -> `empresa__nome`, via JOIN);
+- `get_X_display` vem de um dicionário com as choices do modelo;
+- chaves estrangeiras saem como o pk, como no PrimaryKeyRelatedField;
+- aninhados (`many=True`) vêm de uma consulta por relação, agrupada pela
+  chave do pai;
+- campos calculados (SerializerMethodField, propriedades do modelo)
+  declaram em `calculados` as colunas que usam e a função que monta o valor.
+
+A formatação de cada valor usa o `to_representation` do próprio campo do
+serializer, e campos de relação anulável sem valor são omitidos como no DRF,
+então a resposta tem o mesmo formato. `LeituraRapidaMixin` aplica a leitura
+no `list` de um ModelViewSet.
+
+Comparação com os serializers: `python manage.py benchmark_leitura`.
+"""
+
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from rest_framework import serializers
+from rest_framework.fields import empty
+from rest_framework.response import Response
+
+# Tipos de campo do modelo cujo valor de `.values()` já é a representação
+# do campo do serializer (dispensa o to_representation)
+TIPOS_TEXTO = {'CharField', 'TextField', 'EmailField', 'SlugField', 'URLField'}
+REPRESENTACAO_DIRETA = {
+    serializers.CharField: TIPOS_TEXTO,
+    serializers.EmailField: TIPOS_TEXTO,
+    serializers.IntegerField: {
+        'IntegerField', 'SmallIntegerField', 'BigIntegerField', 'PositiveIntegerField',
+        'PositiveSmallIntegerField', 'PositiveBigIntegerField', 'AutoField', 'BigAutoField',
+    },
+    serializers.BooleanField: {'BooleanField'},
+}
+
+VALOR = 'valor'
+CALCULADO = 'calculado'
+ANINHADO = 'aninhado'
+OMITIR = object()
+
+
+def _formatar_display(choices):
+    """Formata get_X_display a partir das choices (como Model._get_FIELD_display)."""
+    def formatar(valor):
+        valor = choices.get(valor, valor)
+        return None if valor is None else str(valor)
+    return formatar
+
+
+def _valor_ausente(campo):
+    """O que o DRF devolve quando a relação anulável do `source` está vazia."""
+    if campo.default is not empty:
+        return campo.get_default()
+    if campo.allow_null:
+        return None
+    return OMITIR
+
+
+class LeituraRapida:
+    """
+    Serialização somente leitura de um serializer a partir de `.values()`.
+
+    Args:
+        serializer_class: serializer de referência (define campos e formato)
+        calculados: {campo: (caminhos, funcao(linha))} para os campos que não
+            saem direto de uma coluna; `linha` tem os caminhos informados e,
+            já montados, os aninhados
+        aninhados: {campo: LeituraRapida} para aninhados com calculados
+            próprios (os demais são montados do serializer filho)
+    """
+
+    def __init__(self, serializer_class, calculados=None, aninhados=None):
+        self.serializer_class = serializer_class
+        self.calculados = calculados or {}
+        self.aninhados = aninhados or {}
+        self._plano = None
+
+    @property
+    def model(self):
+        return self.serializer_class.Meta.model
+
+    @property
+    def plano(self):
+        """(caminhos do values(), campos, aninhados), calculado no primeiro uso."""
+        if self._plano is None:
+            self._plano = self._montar_plano()
+        return self._plano
+
+    def _montar_plano(self):
+        model = self.model
+        pk = model._meta.pk.attname
+        caminhos = [pk]
+        campos = []
+        aninhados = []
+
+        for nome, campo in self.serializer_class().fields.items():
+            if campo.write_only:
+                continue
+            if nome in self.calculados:
+                caminhos_calculado, funcao = self.calculados[nome]
+                caminhos += caminhos_calculado
+                campos.append((nome, CALCULADO, None, funcao, (), None))
+            elif isinstance(campo, serializers.ListSerializer):
+                relacao = model._meta.get_field(campo.source)
+                if not relacao.one_to_many:
+                    raise ImproperlyConfigured(
+                        f'{self.serializer_class.__name__}.{nome}: só aninhados de relação reversa.'
+                    )
+                leitura = self.aninhados.get(nome) or LeituraRapida(type(campo.child))
+                aninhados.append((nome, leitura, relacao.field.attname))
+                campos.append((nome, ANINHADO, None, None, (), None))
+            else:
+                caminho, formatar, nulos = self._resolver(nome, campo)
+                caminhos.append(caminho)
+                ausente = _valor_ausente(campo) if nulos else None
+                campos.append((nome, VALOR, caminho, formatar, nulos, ausente))
+                caminhos += nulos
+
+        return list(dict.fromkeys(caminhos)), campos, aninhados
+
+    def _resolver(self, nome, campo):
+        """Coluna, formatação e relações anuláveis do `source` de um campo."""
+        def invalido(motivo):
+            return ImproperlyConfigured(
+                f'{self.serializer_class.__name__}.{nome}: {motivo}; declare em calculados.'
+            )
+
+        if isinstance(campo, serializers.SerializerMethodField) or campo.source == '*':
+            raise invalido('campo calculado')
+
+        atual = self.model
+        partes = []
+        nulos = []
+        for indice, atributo in enumerate(campo.source_attrs):
+            ultimo = indice == len(campo.source_attrs) - 1
+            try:
+                field = atual._meta.get_field(atributo)
+            except FieldDoesNotExist:
+                if ultimo and atributo.startswith('get_') and atributo.endswith('_display'):
+                    field = atual._meta.get_field(atributo[4:-8])
+                    partes.append(field.name)
+                    choices = {chave: valor for chave, valor in field.flatchoices}
+                    return '__'.join(partes), _formatar_display(choices), tuple(nulos)
+                raise invalido(f'"{atributo}" não é campo do modelo')
+
+            partes.append(field.name)
+            if ultimo:
+                break
+            if not (field.many_to_one or (field.one_to_one and field.concrete)):
+                raise invalido(f'"{atributo}" não é chave estrangeira')
+            if field.null:
+                nulos.append('__'.join(partes))
+            atual = field.related_model
+
+        caminho = '__'.join(partes)
+        if field.is_relation:
+            if not isinstance(campo, serializers.PrimaryKeyRelatedField) or field.many_to_many or not field.concrete:
+                raise invalido('relação que não é PrimaryKeyRelatedField')
+            # PrimaryKeyRelatedField: o pk, que já é o valor da coluna
+            return caminho, None, tuple(nulos)
+
+        tipos_diretos = REPRESENTACAO_DIRETA.get(type(campo), ())
+        formatar = None if field.get_internal_type() in tipos_diretos else campo.to_representation
+        return caminho, formatar, tuple(nulos)
+
+    def linhas(self, queryset):
+        """Queryset de `.values()` com as colunas do serializer."""
+        return queryset.prefetch_related(None).values(*self.plano[0])
+
+    def serializar(self, linhas):
+        """Monta a saída do serializer para as linhas de `linhas()`."""
+        _, campos, aninhados = self.plano
+        linhas = list(linhas)
+        if aninhados and linhas:
+            pk = self.model._meta.pk.attname
+            ids = [linha[pk] for linha in linhas]
+            for nome, leitura, chave in aninhados:
+                grupos = leitura.agrupar(chave, ids)
+                for linha in linhas:
+                    linha[nome] = grupos.get(linha[pk], [])
+
+        resultado = []
+        for linha in linhas:
+            saida = {}
+            for nome, tipo, caminho, formatar, nulos, ausente in campos:
+                if tipo is VALOR:
+                    if nulos and any(linha[nulo] is None for nulo in nulos):
+                        if ausente is not OMITIR:
+                            saida[nome] = ausente
+                        continue
+                    valor = linha[caminho]
+                    saida[nome] = valor if valor is None or formatar is None else formatar(valor)
+                elif tipo is CALCULADO:
+                    saida[nome] = formatar(linha)
+                else:
+                    saida[nome] = linha[nome]
+            resultado.append(saida)
+        return resultado
+
+    def agrupar(self, chave, ids):
+        """Linhas serializadas cujo `chave` está em `ids`: {id do pai: [linhas]}."""
+        linhas = list(
+            self.model._default_manager.filter(**{f'{chave}__in': ids}).values(*self.plano[0], chave)
+        )
+        grupos = {}
+        for linha, saida in zip(linhas, self.serializar(linhas)):
+            grupos.setdefault(linha[chave], []).append(saida)
+        return grupos
+
+
+class LeituraRapidaMixin:
+    """
+    `list` de um ModelViewSet montado por `leitura_rapida` (LeituraRapida).
+
+    Com `?fields=`/`?omit=` (ProjecaoCamposMixin) a listagem segue pelo
+    serializer, que já busca só os campos pedidos.
+    """
+
+    leitura_rapida = None
+
+    def list(self, request, *args, **kwargs):
+        projecao = getattr(self, '_projecao_solicitada', lambda: None)()
+        if self.leitura_rapida is None or projecao is not None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.leitura_rapida.linhas(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(self.leitura_rapida.serializar(page))
+        return Response(self.leitura_rapida.serializar(queryset))
@@ -0,0 +1,80 @@
+"""
+Management command para comparar as listagens pelo serializer e pela
+leitura rápida (`.values()`, apps.core.leitura).
+
+Usa os registros existentes no banco: para cada listagem (titulares,
+vínculos de titulares e OS) e quantidade de linhas, mede o tempo médio de
+consulta + serialização nos dois caminhos e confere se a saída JSON é a
+mesma.
+
+Uso:
+    python manage.py benchmark_leitura
+    python manage.py benchmark_leitura --linhas 100 1000 --repeticoes 10
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+
+from apps.ordem_servico.views import OrdemServicoViewSet
+from apps.titulares.views import TitularViewSet, VinculoTitularViewSet
+
+LISTAGENS = {
+    'titulares': TitularViewSet,
+    'vinculos-titular': VinculoTitularViewSet,
+    'ordens-servico': OrdemServicoViewSet,
+}
+
+
+def medir(funcao, repeticoes):
+    """Tempo médio (ms) de `funcao` e o último resultado."""
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return sum(tempos) / len(tempos) * 1000, resultado
+
+
+class Command(BaseCommand):
+    help = 'Compara o tempo das listagens pelo serializer e pela leitura rápida (.values())'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--linhas', type=int, nargs='+', default=[100, 1000])
+        parser.add_argument('--repeticoes', type=int, default=5)
+
+    def handle(self, *args, **options):
+        repeticoes = options['repeticoes']
+        renderer = JSONRenderer()
+
+        self.stdout.write(
+            f'{"Listagem":<18} {"Linhas":>6} {"ms serializer":>14} {"ms values":>10} {"Ganho":>7}  Saída'
+        )
+        for nome, viewset_class in LISTAGENS.items():
+            view = viewset_class(action='list', request=None, format_kwarg=None, kwargs={})
+            queryset = view.get_queryset().order_by(*view.ordering)
+            serializer_class = view.get_serializer_class()
+            leitura = view.leitura_rapida
+
+            for linhas in options['linhas']:
+                def pelo_serializer():
+                    return serializer_class(list(queryset[:linhas]), many=True).data
+
+                def pela_leitura():
+                    return leitura.serializar(leitura.linhas(queryset)[:linhas])
+
+                # Aquecimento (plano da leitura e caches de campos do serializer)
+                pelo_serializer()
+                pela_leitura()
+
+                ms_serializer, dados_serializer = medir(pelo_serializer, repeticoes)
+                ms_leitura, dados_leitura = medir(pela_leitura, repeticoes)
+                mesma_saida = renderer.render(dados_serializer) == renderer.render(dados_leitura)
+
+                self.stdout.write(
+                    f'{nome:<18} {len(dados_leitura):>6} {ms_serializer:>14.1f} {ms_leitura:>10.1f} '
+                    f'{ms_serializer / ms_leitura:>6.1f}x  {"igual" if mesma_saida else "DIFERENTE"}'
+                )
+
+        self.stdout.write(self.style.SUCCESS('✓ Benchmark concluído!'))
@@ -0,0 +1,103 @@
+"""
+Management command para comparar chaves primárias UUID v4 (aleatórias) e
+v7 (ordenadas no tempo, apps.core.identificadores).
+
+Cria uma tabela de teste por versão (chave UUID + data), insere as linhas
+em lotes com a chave gerada pela versão e exibe o tempo de inserção, as
+linhas por segundo e o tamanho do índice da chave primária. As tabelas são
+excluídas ao final.
+
+O tamanho do índice vem de pg_indexes_size() no PostgreSQL e da tabela
+virtual dbstat no SQLite (quando disponível).
+
+Uso:
+    python manage.py benchmark_uuid
+    python manage.py benchmark_uuid --linhas 100000 --lote 5000
+"""
+
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import DatabaseError, connection, models, transaction
+from django.utils import timezone
+
+from apps.core.identificadores import uuid7
+
+GERADORES = {
+    'v4': uuid.uuid4,
+    'v7': uuid7,
+}
+
+
+def tabela(versao):
+    return f'benchmark_uuid_{versao}'
+
+
+def tamanho_indice(nome_tabela):
+    """Bytes dos índices da tabela, ou None quando o banco não informa."""
+    with connection.cursor() as cursor:
+        try:
+            if connection.vendor == 'postgresql':
+                cursor.execute('SELECT pg_indexes_size(%s::regclass)', [nome_tabela])
+            elif connection.vendor == 'sqlite':
+                cursor.execute(
+                    "SELECT SUM(pgsize) FROM dbstat WHERE name LIKE %s",
+                    [f'sqlite_autoindex_{nome_tabela}%'],
+                )
+            else:
+                return None
+        except DatabaseError:
+            return None
+        linha = cursor.fetchone()
+    return linha[0] if linha else None
+
+
+class Command(BaseCommand):
+    help = 'Compara inserção e tamanho de índice de chaves UUID v4 e v7'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--linhas', type=int, default=1_000_000)
+        parser.add_argument('--lote', type=int, default=10_000)
+
+    def handle(self, *args, **options):
+        linhas = options['linhas']
+        lote = options['lote']
+        campo_id = models.UUIDField()
+        campo_data = models.DateTimeField()
+        quote = connection.ops.quote_name
+
+        self.stdout.write(f'{"Versão":>6} {"Linhas":>10} {"Segundos":>9} {"Linhas/s":>10} {"Índice (MB)":>12}')
+        for versao, gerar in GERADORES.items():
+            nome_tabela = tabela(versao)
+            with connection.cursor() as cursor:
+                cursor.execute(f'DROP TABLE IF EXISTS {quote(nome_tabela)}')
+                cursor.execute(
+                    f'CREATE TABLE {quote(nome_tabela)} ('
+                    f'id {campo_id.db_type(connection)} NOT NULL PRIMARY KEY, '
+                    f'data_criacao {campo_data.db_type(connection)} NOT NULL)'
+                )
+            insert = f'INSERT INTO {quote(nome_tabela)} (id, data_criacao) VALUES (%s, %s)'
+
+            try:
+                inicio = time.perf_counter()
+                for offset in range(0, linhas, lote):
+                    agora = campo_data.get_db_prep_value(timezone.now(), connection)
+                    valores = [
+                        (campo_id.get_db_prep_value(gerar(), connection), agora)
+                        for _ in range(min(lote, linhas - offset))
+                    ]
+                    with transaction.atomic(), connection.cursor() as cursor:
+                        cursor.executemany(insert, valores)
+                segundos = time.perf_counter() - inicio
+                tamanho = tamanho_indice(nome_tabela)
+            finally:
+                with connection.cursor() as cursor:
+                    cursor.execute(f'DROP TABLE IF EXISTS {quote(nome_tabela)}')
+
+            tamanho_mb = f'{tamanho / 1024 / 1024:.1f}' if tamanho else '-'
+            self.stdout.write(
+                f'{versao:>6} {linhas:>10} {segundos:>9.1f} {linhas / segundos:>10.0f} {tamanho_mb:>12}'
+            )
+
+        self.stdout.write(self.style.SUCCESS('✓ Benchmark concluído!'))
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:04
+
+import apps.core.identificadores
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_remove_nacionalidade_consulado'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='amparolegal',
+            name='id',
+            field=models.UUIDField(db_column='id_amparo', default=apps.core.identificadores.uuid7, editable=False, primary_key=True, serialize=False, verbose_name='ID'),
+        ),
+        migrations.AlterField(
+            model_name='tipoatualizacao',
+            name='id',
+            field=models.UUIDField(db_column='id_tipo_atualizacao', default=apps.core.identificadores.uuid7, editable=False, primary_key=True, serialize=False, verbose_name='ID'),
+        ),
+    ]
@@ -1,5 +1,5 @@
-import uuid
 from django.db import models
+from .identificadores import uuid7
 
 
 class BaseModel(models.Model):
@@ -19,7 +19,7 @@ class AmparoLegal(BaseModel):
     id = models.UUIDField(
         'ID',
         primary_key=True,
-        default=uuid.uuid4,
+        default=uuid7,
         editable=False,
         db_column='id_amparo'
     )
@@ -42,7 +42,7 @@ class TipoAtualizacao(BaseModel):
     id = models.UUIDField(
         'ID',
         primary_key=True,
-        default=uuid.uuid4,
+        default=uuid7,
         editable=False,
         db_column='id_tipo_atualizacao'
     )
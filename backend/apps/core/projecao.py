@@ -0,0 +1,185 @@
+"""
+Projeção de campos nas respostas (`?fields=` / `?omit=`).
+
+`ProjecaoCamposMixin` remove do serializer os campos não solicitados e
+ajusta o queryset para buscar só o necessário:
+
+- `.only()` com as colunas dos campos mantidos (incluindo as de relações
+  com select_related, ex.: `empresa.nome` -> `empresa__nome`);
+- select_related e prefetch_related das relações não usadas são removidos,
+  então omitir um aninhado (ex.: `vinculos`) elimina a sua consulta.
+
+Os caminhos de cada campo vêm do `source` do serializer. Campos calculados
+(SerializerMethodField, propriedades do modelo) declaram os seus em
+`fontes_projecao` no serializer; sem isso o queryset não é reduzido e só a
+resposta é filtrada.
+"""
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+
+PARAMETRO_CAMPOS = 'fields'
+PARAMETRO_OMITIR = 'omit'
+
+
+def _lista_parametro(valor):
+    return [campo.strip() for campo in (valor or '').split(',') if campo.strip()]
+
+
+def caminhos_campo(model, campo):
+    """
+    Caminhos ORM (`__`) usados por um campo do serializer.
+
+    Returns:
+        tuple | None: caminhos, ou None quando não é possível determinar
+    """
+    fontes = getattr(campo.parent, 'fontes_projecao', {})
+    if campo.field_name in fontes:
+        return tuple(fontes[campo.field_name])
+    if isinstance(campo, serializers.SerializerMethodField) or campo.source == '*':
+        return None
+
+    partes = []
+    atual = model
+    for atributo in campo.source_attrs:
+        try:
+            field = atual._meta.get_field(atributo)
+        except FieldDoesNotExist:
+            # get_FOO_display de choices: usa a própria coluna
+            if atributo.startswith('get_') and atributo.endswith('_display') and partes == []:
+                return (atributo[4:-8],)
+            if partes:
+                # Propriedade/método do objeto relacionado: o objeto inteiro
+                return ('__'.join(partes),)
+            return None
+        partes.append(field.name)
+        if not field.is_relation or field.many_to_many or field.one_to_many:
+            break
+        if field.related_model is None:
+            break
+        atual = field.related_model
+    return ('__'.join(partes),)
+
+
+def _caminhos_select_related(valor, prefixo=''):
+    """Achata a árvore `query.select_related` em caminhos `a__b`."""
+    caminhos = []
+    for nome, filhos in (valor or {}).items():
+        caminho = f'{prefixo}{nome}'
+        caminhos.append(caminho)
+        caminhos += _caminhos_select_related(filhos, f'{caminho}__')
+    return caminhos
+
+
+def projetar_queryset(queryset, caminhos):
+    """
+    Reduz o queryset aos caminhos informados: `.only()` nas colunas,
+    select_related e prefetch_related só das relações usadas.
+    """
+    model = queryset.model
+    select_atual = queryset.query.select_related
+    if select_atual is True:
+        # select_related() sem argumentos: não é possível podar com segurança
+        return queryset
+    select_atual = _caminhos_select_related(select_atual)
+
+    colunas = set()
+    relacoes = set()
+    for caminho in caminhos:
+        partes = caminho.split('__')
+        raiz = model._meta.get_field(partes[0])
+        relacoes.add(partes[0])
+        if raiz.many_to_many or raiz.one_to_many:
+            # Reversa/M2M: carregada por prefetch, não é coluna do modelo
+            continue
+        # Maior prefixo do caminho que está no select_related: as colunas vão
+        # até um nível depois dele (os demais são carregados sob demanda)
+        selecionado = 0
+        for indice in range(len(partes), 0, -1):
+            if '__'.join(partes[:indice]) in select_atual:
+                selecionado = indice
+                break
+        if selecionado == 0 and raiz.one_to_one and not raiz.concrete:
+            # OneToOne reverso sem select_related: nada a carregar aqui
+            continue
+        colunas.add('__'.join(partes[:selecionado + 1]))
+        for indice in range(1, selecionado + 1):
+            relacoes.add('__'.join(partes[:indice]))
+
+    select_mantido = [
+        caminho for caminho in select_atual
+        if caminho in relacoes and all(
+            '__'.join(caminho.split('__')[:i]) in relacoes for i in range(1, caminho.count('__') + 1)
+        )
+    ]
+    prefetch_mantido = [
+        lookup for lookup in queryset._prefetch_related_lookups
+        if (lookup.prefetch_to if isinstance(lookup, Prefetch) else lookup).split('__')[0] in relacoes
+    ]
+
+    queryset = queryset.select_related(None).prefetch_related(None)
+    if select_mantido:
+        queryset = queryset.select_related(*select_mantido)
+    if prefetch_mantido:
+        queryset = queryset.prefetch_related(*prefetch_mantido)
+    return queryset.only(*(colunas or {model._meta.pk.name}))
+
+
+class ProjecaoCamposMixin:
+    """
+    `?fields=a,b` (só esses campos) e `?omit=c,d` (todos menos esses) nas
+    ações de leitura de um ModelViewSet.
+    """
+
+    acoes_projecao = ('list', 'retrieve')
+
+    def _projecao_solicitada(self):
+        if getattr(self, 'action', None) not in self.acoes_projecao:
+            return None
+        params = self.request.query_params
+        incluir = _lista_parametro(params.get(PARAMETRO_CAMPOS))
+        omitir = _lista_parametro(params.get(PARAMETRO_OMITIR))
+        if not incluir and not omitir:
+            return None
+        return incluir, omitir
+
+    def _campos_projetados(self, fields):
+        """Nomes mantidos de `fields`; valida os nomes informados."""
+        incluir, omitir = self._projecao_solicitada()
+        invalidos = [campo for campo in incluir + omitir if campo not in fields]
+        if invalidos:
+            raise ValidationError({
+                PARAMETRO_CAMPOS if set(invalidos) & set(incluir) else PARAMETRO_OMITIR:
+                    f"Campos inválidos: {', '.join(invalidos)}. "
+                    f"Permitidos: {', '.join(fields)}."
+            })
+        mantidos = [campo for campo in fields if not incluir or campo in incluir]
+        return [campo for campo in mantidos if campo not in omitir]
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        if self._projecao_solicitada() is not None:
+            alvo = serializer.child if isinstance(serializer, serializers.ListSerializer) else serializer
+            mantidos = set(self._campos_projetados(alvo.fields))
+            for campo in list(alvo.fields):
+                if campo not in mantidos:
+                    alvo.fields.pop(campo)
+        return serializer
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self._projecao_solicitada() is None:
+            return queryset
+
+        serializer = self.get_serializer_class()(context=self.get_serializer_context())
+        caminhos = set()
+        for nome in self._campos_projetados(serializer.fields):
+            campo = serializer.fields[nome]
+            caminhos_do_campo = caminhos_campo(queryset.model, campo)
+            if caminhos_do_campo is None:
+                # Campo calculado sem fontes declaradas: mantém o queryset
+                return queryset
+            caminhos.update(caminhos_do_campo)
+        return projetar_queryset(queryset, caminhos)
@@ -0,0 +1,16 @@
+"""
+Throttles customizados da API.
+"""
+
+from rest_framework.throttling import AnonRateThrottle
+
+
+class ValidacaoDocumentoThrottle(AnonRateThrottle):
+    """
+    Limite próprio para a validação pública de documentos (QR code).
+
+    Usa o escopo `validacao_documento`, separado do `anon` global, para que
+    picos de leitura de QR codes não consumam a cota anônima do restante
+    da API (ex: login).
+    """
+    scope = 'validacao_documento'
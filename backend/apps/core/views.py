@@ -7,9 +7,10 @@ from .serializers import (
     TipoAtualizacaoSerializer
 )
 from apps.accounts.permissions import CargoBasedPermission, PermissionMessageMixin
+from .projecao import ProjecaoCamposMixin
 
 
-class AmparoLegalViewSet(PermissionMessageMixin, viewsets.ModelViewSet):
+class AmparoLegalViewSet(PermissionMessageMixin, ProjecaoCamposMixin, viewsets.ModelViewSet):
     """
     ViewSet para gerenciamento de amparos legais.
     
@@ -25,7 +26,7 @@ class AmparoLegalViewSet(PermissionMessageMixin, viewsets.ModelViewSet):
     ordering = ['nome']
 
 
-class TipoAtualizacaoViewSet(PermissionMessageMixin, viewsets.ModelViewSet):
+class TipoAtualizacaoViewSet(PermissionMessageMixin, ProjecaoCamposMixin, viewsets.ModelViewSet):
     """
     ViewSet para gerenciamento de tipos de atualização.
     
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:04
+
+import apps.core.identificadores
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('empresa', '0004_add_contato_controle'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='empresa',
+            name='id',
+            field=models.UUIDField(db_column='id_empresa', default=apps.core.identificadores.uuid7, editable=False, primary_key=True, serialize=False, verbose_name='ID'),
+        ),
+    ]
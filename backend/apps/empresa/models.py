@@ -1,6 +1,6 @@
-import uuid
 from django.conf import settings
 from django.db import models
+from apps.core.identificadores import uuid7
 
 
 class Empresa(models.Model):
@@ -9,7 +9,7 @@ class Empresa(models.Model):
     id = models.UUIDField(
         'ID',
         primary_key=True,
-        default=uuid.uuid4,
+        default=uuid7,
         editable=False,
         db_column='id_empresa'
     )
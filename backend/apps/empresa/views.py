@@ -4,9 +4,10 @@ from django_filters.rest_framework import DjangoFilterBackend
 from .models import Empresa
 from .serializers import EmpresaSerializer, EmpresaListSerializer
 from apps.accounts.permissions import CargoBasedPermission, PermissionMessageMixin
+from apps.core.projecao import ProjecaoCamposMixin
 
 
-class EmpresaViewSet(PermissionMessageMixin, viewsets.ModelViewSet):
+class EmpresaViewSet(PermissionMessageMixin, ProjecaoCamposMixin, viewsets.ModelViewSet):
     """
     ViewSet para gerenciamento de empresas.
     
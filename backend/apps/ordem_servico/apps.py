@@ -5,3 +5,9 @@ class OrdemServicoConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.ordem_servico'
     verbose_name = 'Ordens de Serviço'
+    
+    def ready(self):
+        """Conecta a invalidação do cache de validação de documentos."""
+        from .signals import conectar
+        
+        conectar()
@@ -0,0 +1,105 @@
+"""
+Management command para medir o tempo de geração do PDF de Ordem de Serviço.
+
+Gera documentos com dados fictícios (sem acesso ao banco) para OSs de
+1, 5 e 20 páginas e exibe o tempo médio por PDF e por página.
+
+Uso:
+    python manage.py benchmark_pdf
+    python manage.py benchmark_pdf --paginas 1 5 20 --repeticoes 10
+"""
+
+import time
+import uuid
+from datetime import date
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+
+from apps.ordem_servico.services.documento import (
+    DadosDocumentoOS, EmpresaDocumento, UsuarioDocumento, ItemDocumento,
+)
+from apps.ordem_servico.services.pdf_generator import OSPDFGenerator
+
+
+def dados_ficticios(quantidade_itens):
+    """Monta um DadosDocumentoOS com a quantidade de itens informada."""
+    itens = tuple(
+        ItemDocumento(
+            servico_item=f'{indice:03}',
+            servico_descricao=f'Serviço de teste {indice}',
+            quantidade=1,
+            valor_aplicado=Decimal('100.00'),
+            valor_total=Decimal('100.00'),
+        )
+        for indice in range(1, quantidade_itens + 1)
+    )
+    return DadosDocumentoOS(
+        id=uuid.uuid4(),
+        numero=1,
+        status='ABERTA',
+        data_abertura=date.today(),
+        data_fechamento=None,
+        observacao=None,
+        valor_servicos=Decimal('100.00') * quantidade_itens,
+        valor_despesas=Decimal('0.00'),
+        valor_total=Decimal('100.00') * quantidade_itens,
+        contrato_numero='CT-0001',
+        empresa_contratada_nome='Empresa Contratada',
+        empresa_pagadora=EmpresaDocumento(nome='Empresa Pagadora', cnpj='00.000.000/0001-00'),
+        solicitante=UsuarioDocumento(nome='Solicitante', email='solicitante@example.com'),
+        itens=itens,
+    )
+
+
+def gerar(quantidade_itens):
+    """Gera o PDF e retorna (segundos, páginas)."""
+    generator = OSPDFGenerator(
+        ordem_servico=dados_ficticios(quantidade_itens),
+        codigo_documento='DOC-OS-000001-V001',
+        url_validacao=f'http://localhost:5173/validar-documento/{uuid.uuid4()}',
+    )
+    inicio = time.perf_counter()
+    pdf_bytes, _ = generator.generate()
+    return time.perf_counter() - inicio, pdf_bytes.count(b'/Type /Page\n')
+
+
+class Command(BaseCommand):
+    help = 'Mede o tempo de geração de PDF de OS por documento e por página'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--paginas', type=int, nargs='+', default=[1, 5, 20])
+        parser.add_argument('--repeticoes', type=int, default=5)
+
+    def handle(self, *args, **options):
+        repeticoes = options['repeticoes']
+
+        # Aquecimento (imports, fontes e caches de módulo)
+        gerar(1)
+
+        self.stdout.write(f'{"Páginas":>8} {"Itens":>6} {"ms/PDF":>10} {"ms/página":>10}')
+        for paginas_alvo in options['paginas']:
+            quantidade_itens = self._itens_para_paginas(paginas_alvo)
+            tempos = []
+            for _ in range(repeticoes):
+                segundos, paginas = gerar(quantidade_itens)
+                tempos.append(segundos)
+
+            ms_pdf = sum(tempos) / len(tempos) * 1000
+            self.stdout.write(
+                f'{paginas:>8} {quantidade_itens:>6} {ms_pdf:>10.1f} {ms_pdf / paginas:>10.1f}'
+            )
+
+        self.stdout.write(self.style.SUCCESS('✓ Benchmark concluído!'))
+
+    def _itens_para_paginas(self, paginas_alvo):
+        """Busca (binária) a menor quantidade de itens que gera o número de páginas."""
+        minimo, maximo = 1, 60 * paginas_alvo
+        while minimo < maximo:
+            meio = (minimo + maximo) // 2
+            _, paginas = gerar(meio)
+            if paginas < paginas_alvo:
+                minimo = meio + 1
+            else:
+                maximo = meio
+        return minimo
@@ -0,0 +1,26 @@
+"""
+Management command para reconstruir o resumo materializado de faturamento.
+
+Recalcula toda a tabela `faturamento_mensal` a partir das Ordens de Serviço
+com uma única agregação (GROUP BY mês, pagadora, contratada, status).
+
+Uso:
+    python manage.py rebuild_faturamento
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.ordem_servico.services.faturamento import reconstruir_faturamento
+
+
+class Command(BaseCommand):
+    help = 'Reconstrói o resumo de faturamento mensal das Ordens de Serviço'
+    
+    def handle(self, *args, **options):
+        self.stdout.write('Reconstruindo resumo de faturamento...')
+        
+        total = reconstruir_faturamento()
+        
+        self.stdout.write(
+            self.style.SUCCESS(f'✓ {total} linhas de faturamento geradas com sucesso!')
+        )
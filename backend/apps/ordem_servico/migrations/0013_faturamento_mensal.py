@@ -0,0 +1,74 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:04
+
+import django.db.models.deletion
+import uuid
+from decimal import Decimal
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncMonth
+
+
+def popular_faturamento(apps, schema_editor):
+    """Popula o resumo de faturamento com as OS já existentes."""
+    OrdemServico = apps.get_model('ordem_servico', 'OrdemServico')
+    FaturamentoMensal = apps.get_model('ordem_servico', 'FaturamentoMensal')
+
+    grupos = OrdemServico.objects.order_by().annotate(
+        mes=TruncMonth('data_abertura')
+    ).values(
+        'mes', 'empresa_pagadora', 'contrato__empresa_contratada', 'status'
+    ).annotate(
+        quantidade_os=Count('id'),
+        soma_servicos=Sum('valor_servicos'),
+        soma_despesas=Sum('valor_despesas'),
+        soma_total=Sum('valor_total'),
+    )
+    FaturamentoMensal.objects.bulk_create([
+        FaturamentoMensal(
+            mes=grupo['mes'],
+            empresa_pagadora_id=grupo['empresa_pagadora'],
+            empresa_contratada_id=grupo['contrato__empresa_contratada'],
+            status=grupo['status'],
+            quantidade_os=grupo['quantidade_os'],
+            valor_servicos=grupo['soma_servicos'] or Decimal('0.00'),
+            valor_despesas=grupo['soma_despesas'] or Decimal('0.00'),
+            valor_total=grupo['soma_total'] or Decimal('0.00'),
+        )
+        for grupo in grupos
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contratos', '0006_add_tipo_contrato'),
+        ('empresa', '0004_add_contato_controle'),
+        ('ordem_servico', '0012_add_titular_solicitante_pagador'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FaturamentoMensal',
+            fields=[
+                ('id', models.UUIDField(db_column='id_faturamento_mensal', default=uuid.uuid4, editable=False, primary_key=True, serialize=False, verbose_name='ID')),
+                ('mes', models.DateField(help_text='Primeiro dia do mês de abertura das OS', verbose_name='Mês')),
+                ('status', models.CharField(choices=[('ABERTA', 'Aberta'), ('FINALIZADA', 'Finalizada'), ('FATURADA', 'Faturada'), ('RECEBIDA', 'Recebida'), ('CANCELADA', 'Cancelada')], max_length=20, verbose_name='Status')),
+                ('quantidade_os', models.PositiveIntegerField(default=0, verbose_name='Quantidade de OS')),
+                ('valor_servicos', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14, verbose_name='Valor dos Serviços')),
+                ('valor_despesas', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14, verbose_name='Valor das Despesas')),
+                ('valor_total', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14, verbose_name='Valor Total')),
+                ('ultima_atualizacao', models.DateTimeField(auto_now=True, verbose_name='Última Atualização')),
+                ('empresa_contratada', models.ForeignKey(blank=True, db_column='id_empresa_contratada', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='faturamentos_mensais', to='ordem_servico.empresaprestadora', verbose_name='Empresa Contratada')),
+                ('empresa_pagadora', models.ForeignKey(blank=True, db_column='id_empresa_pagadora', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='faturamentos_mensais', to='empresa.empresa', verbose_name='Empresa Pagadora')),
+            ],
+            options={
+                'verbose_name': 'Faturamento Mensal',
+                'verbose_name_plural': 'Faturamentos Mensais',
+                'db_table': 'faturamento_mensal',
+                'ordering': ['-mes', 'status'],
+                'indexes': [models.Index(fields=['mes', 'status'], name='faturamento_mes_status_idx')],
+                'constraints': [models.UniqueConstraint(fields=('mes', 'empresa_pagadora', 'empresa_contratada', 'status'), name='faturamento_mensal_chave_uniq', nulls_distinct=False)],
+            },
+        ),
+        migrations.RunPython(popular_faturamento, migrations.RunPython.noop),
+    ]
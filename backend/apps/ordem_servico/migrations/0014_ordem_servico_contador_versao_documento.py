@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:07
+
+from django.db import migrations, models
+from django.db.models import Max, OuterRef, Subquery
+
+
+def inicializar_contador(apps, schema_editor):
+    """Inicializa o contador com a maior versão de documento já emitida por OS."""
+    OrdemServico = apps.get_model('ordem_servico', 'OrdemServico')
+    DocumentoOS = apps.get_model('ordem_servico', 'DocumentoOS')
+
+    maior_versao = DocumentoOS.objects.filter(
+        ordem_servico=OuterRef('pk')
+    ).order_by().values('ordem_servico').annotate(maior=Max('versao')).values('maior')
+
+    OrdemServico.objects.filter(
+        pk__in=DocumentoOS.objects.values('ordem_servico')
+    ).update(
+        ultima_versao_documento=Subquery(maior_versao)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ordem_servico', '0013_faturamento_mensal'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ordemservico',
+            name='ultima_versao_documento',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Última Versão de Documento'),
+        ),
+        migrations.RunPython(inicializar_contador, migrations.RunPython.noop),
+    ]
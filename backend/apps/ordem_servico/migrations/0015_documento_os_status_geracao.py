@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ordem_servico', '0014_ordem_servico_contador_versao_documento'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='documentoos',
+            name='erro_geracao',
+            field=models.TextField(blank=True, default='', verbose_name='Erro na Geração'),
+        ),
+        migrations.AddField(
+            model_name='documentoos',
+            name='status_geracao',
+            field=models.CharField(choices=[('PENDENTE', 'Pendente'), ('PROCESSANDO', 'Processando'), ('CONCLUIDO', 'Concluído'), ('ERRO', 'Erro')], default='CONCLUIDO', max_length=20, verbose_name='Status da Geração'),
+        ),
+    ]
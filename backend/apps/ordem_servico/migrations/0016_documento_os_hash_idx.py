@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:22
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ordem_servico', '0015_documento_os_status_geracao'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='documentoos',
+            index=models.Index(fields=['hash_sha256'], name='documento_o_hash_sh_3bacc6_idx'),
+        ),
+    ]
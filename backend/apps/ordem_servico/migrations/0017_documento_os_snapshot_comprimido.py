@@ -0,0 +1,59 @@
+# Snapshot de DocumentoOS passa de jsonb para JSON comprimido (zlib) em bytea.
+# Não há cast direto jsonb -> bytea: cria a coluna nova, copia, remove a antiga e renomeia.
+
+import apps.core.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ordem_servico', '0016_documento_os_hash_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='documentoos',
+            name='dados_snapshot_comprimido',
+            field=apps.core.fields.CompressedJSONField(default=dict, help_text='Cópia dos dados da OS no momento da emissão', verbose_name='Snapshot dos Dados'),
+        ),
+        migrations.RunPython(
+            code=lambda apps, schema_editor: comprimir_snapshots(apps),
+            reverse_code=lambda apps, schema_editor: descomprimir_snapshots(apps),
+        ),
+        migrations.RemoveField(
+            model_name='documentoos',
+            name='dados_snapshot',
+        ),
+        migrations.RenameField(
+            model_name='documentoos',
+            old_name='dados_snapshot_comprimido',
+            new_name='dados_snapshot',
+        ),
+    ]
+
+
+def comprimir_snapshots(apps):
+    DocumentoOS = apps.get_model('ordem_servico', 'DocumentoOS')
+    lote = []
+    for documento in DocumentoOS.objects.only('id', 'dados_snapshot').iterator(chunk_size=500):
+        documento.dados_snapshot_comprimido = documento.dados_snapshot or {}
+        lote.append(documento)
+        if len(lote) >= 500:
+            DocumentoOS.objects.bulk_update(lote, ['dados_snapshot_comprimido'])
+            lote = []
+    if lote:
+        DocumentoOS.objects.bulk_update(lote, ['dados_snapshot_comprimido'])
+
+
+def descomprimir_snapshots(apps):
+    DocumentoOS = apps.get_model('ordem_servico', 'DocumentoOS')
+    lote = []
+    for documento in DocumentoOS.objects.only('id', 'dados_snapshot_comprimido').iterator(chunk_size=500):
+        documento.dados_snapshot = documento.dados_snapshot_comprimido
+        lote.append(documento)
+        if len(lote) >= 500:
+            DocumentoOS.objects.bulk_update(lote, ['dados_snapshot'])
+            lote = []
+    if lote:
+        DocumentoOS.objects.bulk_update(lote, ['dados_snapshot'])
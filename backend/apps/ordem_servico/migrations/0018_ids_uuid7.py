@@ -0,0 +1,64 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:04
+
+import apps.core.identificadores
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ordem_servico', '0017_documento_os_snapshot_comprimido'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='despesaordemservico',
+            name='id',
+            field=models.UUIDField(db_column='id_despesa_ordem_servico', default=apps.core.identificadores.uuid7, editable=False, primary_key=True, serialize=False, verbose_name='ID'),
+        ),
+        migrations.AlterField(
+            model_name='documentoos',
+            name='id',
+            field=models.UUIDField(db_column='id_documento_os', default=apps.core.identificadores.uuid7, editable=False, primary_key=True, serialize=False, verbose_name='ID'),
+        ),
+        migrations.AlterField(
+            model_name='empresaprestadora',
+            name='id',
+            field=models.UUIDField(db_column='id_empresa_prestadora', default=apps.core.identificadores.uuid7, editable=False, primary_key=True, serialize=False, verbose_name='ID'),
+        ),
+        migrations.AlterField(
+            model_name='faturamentomensal',
+            name='id',
+            field=models.UUIDField(db_column='id_faturamento_mensal', default=apps.core.identificadores.uuid7, editable=False, primary_key=True, serialize=False, verbose_name='ID'),
+        ),
+        migrations.AlterField(
+            model_name='ordemservico',
+            name='id',
+            field=models.UUIDField(db_column='id_ordem_servico', default=apps.core.identificadores.uuid7, editable=False, primary_key=True, serialize=False, verbose_name='ID'),
+        ),
+        migrations.AlterField(
+            model_name='ordemservicodependente',
+            name='id',
+            field=models.UUIDField(db_column='id_ordem_servico_dependente', default=apps.core.identificadores.uuid7, editable=False, primary_key=True, serialize=False, verbose_name='ID'),
+        ),
+        migrations.AlterField(
+            model_name='ordemservicoitem',
+            name='id',
+            field=models.UUIDField(db_column='id_ordem_servico_item', default=apps.core.identificadores.uuid7, editable=False, primary_key=True, serialize=False, verbose_name='ID'),
+        ),
+        migrations.AlterField(
+            model_name='ordemservicotitular',
+            name='id',
+            field=models.UUIDField(db_column='id_ordem_servico_titular', default=apps.core.identificadores.uuid7, editable=False, primary_key=True, serialize=False, verbose_name='ID'),
+        ),
+        migrations.AlterField(
+            model_name='servico',
+            name='id',
+            field=models.UUIDField(db_column='id_servico', default=apps.core.identificadores.uuid7, editable=False, primary_key=True, serialize=False, verbose_name='ID'),
+        ),
+        migrations.AlterField(
+            model_name='tipodespesa',
+            name='id',
+            field=models.UUIDField(db_column='id_tipo_despesa', default=apps.core.identificadores.uuid7, editable=False, primary_key=True, serialize=False, verbose_name='ID'),
+        ),
+    ]
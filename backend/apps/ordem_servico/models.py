@@ -1,9 +1,11 @@
-import uuid
 from decimal import Decimal
 from django.conf import settings
-from django.db import models
+from django.db import models, transaction
 from django.core.validators import MinValueValidator
 
+from apps.core.fields import CompressedJSONField
+from apps.core.identificadores import uuid7
+
 
 class EmpresaPrestadora(models.Model):
     """
@@ -14,7 +16,7 @@ class EmpresaPrestadora(models.Model):
     id = models.UUIDField(
         'ID',
         primary_key=True,
-        default=uuid.uuid4,
+        default=uuid7,
         editable=False,
         db_column='id_empresa_prestadora'
     )
@@ -66,7 +68,7 @@ class Servico(models.Model):
     id = models.UUIDField(
         'ID',
         primary_key=True,
-        default=uuid.uuid4,
+        default=uuid7,
         editable=False,
         db_column='id_servico'
     )
@@ -134,10 +136,13 @@ class OrdemServico(models.Model):
         (STATUS_CANCELADA, 'Cancelada'),
     ]
     
+    # Status cujas OS consomem os serviços do contrato (ver ConsumoContratoServico)
+    STATUS_CONSUMO = [STATUS_ABERTA, STATUS_FINALIZADA, STATUS_FATURADA, STATUS_RECEBIDA]
+    
     id = models.UUIDField(
         'ID',
         primary_key=True,
-        default=uuid.uuid4,
+        default=uuid7,
         editable=False,
         db_column='id_ordem_servico'
     )
@@ -251,6 +256,13 @@ class OrdemServico(models.Model):
         validators=[MinValueValidator(Decimal('0.00'))]
     )
     
+    # Contador de versões de documentos emitidos (ver DocumentoOS.alocar_versao)
+    ultima_versao_documento = models.PositiveIntegerField(
+        'Última Versão de Documento',
+        default=0,
+        editable=False
+    )
+    
     # Timestamps
     data_criacao = models.DateTimeField('Data Criação', auto_now_add=True)
     ultima_atualizacao = models.DateTimeField('Última Atualização', auto_now=True)
@@ -291,8 +303,47 @@ class OrdemServico(models.Model):
     def __str__(self):
         return f"OS #{self.numero} - Contrato {self.contrato.numero}"
     
+    # Campos que definem a chave e os valores do resumo de faturamento
+    CAMPOS_FATURAMENTO = (
+        'data_abertura', 'empresa_pagadora_id', 'contrato_id', 'status',
+        'valor_servicos', 'valor_despesas', 'valor_total',
+    )
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._faturamento_original = instance._estado_faturamento()
+        return instance
+    
+    def _estado_faturamento(self, gravado=None):
+        """
+        Retorna os valores atuais dos campos usados no resumo de faturamento.
+        
+        Campos adiados (.only/.defer) saem como None, ou com o valor de
+        `gravado` (estado lido do banco) quando informado.
+        """
+        # Usa __dict__ para não disparar queries em campos adiados
+        if gravado is None:
+            return tuple(self.__dict__.get(campo) for campo in self.CAMPOS_FATURAMENTO)
+        return tuple(
+            self.__dict__[campo] if campo in self.__dict__ else valor
+            for campo, valor in zip(self.CAMPOS_FATURAMENTO, gravado)
+        )
+    
+    def _faturamento_gravado(self):
+        """
+        Estado gravado no banco, quando o lido em from_db está incompleto
+        (campos do resumo adiados); senão None.
+        """
+        if not self.pk or not self.get_deferred_fields() & set(self.CAMPOS_FATURAMENTO):
+            return None
+        return OrdemServico.objects.filter(pk=self.pk).values_list(*self.CAMPOS_FATURAMENTO).first()
+    
     def save(self, *args, **kwargs):
         from django.utils import timezone
+        from apps.contratos.services.cache import agendar_invalidacao
+        from apps.contratos.services.consumo import aplicar_consumo_os, consome_contrato
+        from .services.faturamento import agendar_atualizacao_faturamento
         
         # Auto-incremento do número da OS
         if not self.numero:
@@ -303,7 +354,70 @@ class OrdemServico(models.Model):
         if self.status == self.STATUS_FINALIZADA and not self.data_finalizada:
             self.data_finalizada = timezone.now()
         
-        super().save(*args, **kwargs)
+        original = getattr(self, '_faturamento_original', None)
+        gravado = self._faturamento_gravado() if original else None
+        if gravado:
+            # Campos adiados não estão no estado de from_db: o anterior vem do banco
+            # e os não carregados continuam com o valor gravado
+            original = gravado
+        atual = self._estado_faturamento(gravado)
+        
+        with transaction.atomic():
+            # Status gravado lido com o lock da OS: itens salvos em paralelo
+            # (OrdemServicoItem.save) esperam a troca de status terminar
+            update_fields = kwargs.get('update_fields')
+            altera_status = update_fields is None or 'status' in update_fields
+            status_gravado = None
+            if altera_status and not self._state.adding:
+                status_gravado = OrdemServico.status_travado([self.pk]).get(self.pk)
+            super().save(*args, **kwargs)
+            
+            # OS entrando/saindo de STATUS_CONSUMO soma/subtrai seus itens do razão de consumo
+            if status_gravado and consome_contrato(status_gravado) != consome_contrato(self.status):
+                aplicar_consumo_os(self.pk, 1 if consome_contrato(self.status) else -1)
+        
+        # Quantidade de OS exibida na listagem de contratos ativos (em cache)
+        if original is None or original[2] != atual[2]:
+            agendar_invalidacao()
+        
+        # Atualiza o resumo de faturamento se status, chave ou totais mudaram
+        if original != atual:
+            agendar_atualizacao_faturamento(original, atual)
+            self._faturamento_original = atual
+    
+    def delete(self, *args, **kwargs):
+        from apps.contratos.services.cache import agendar_invalidacao
+        from apps.contratos.services.consumo import aplicar_consumo_os, consome_contrato
+        from .services.faturamento import agendar_atualizacao_faturamento
+        
+        original = (
+            self._faturamento_gravado()
+            or getattr(self, '_faturamento_original', None)
+            or self._estado_faturamento()
+        )
+        with transaction.atomic():
+            # Itens excluídos em cascata não passam por OrdemServicoItem.delete()
+            if consome_contrato(original[3]):
+                aplicar_consumo_os(self.pk, -1)
+            resultado = super().delete(*args, **kwargs)
+        agendar_atualizacao_faturamento(original)
+        agendar_invalidacao()
+        return resultado
+    
+    @staticmethod
+    def status_travado(ids):
+        """
+        Status gravado das OS, com lock das linhas (SELECT ... FOR UPDATE).
+        
+        Deve ser chamado dentro de transaction.atomic(); o lock vale até o
+        fim da transação.
+        
+        Returns:
+            dict: {id da OS: status}
+        """
+        return dict(
+            OrdemServico.objects.select_for_update().filter(pk__in=ids).order_by('pk').values_list('pk', 'status')
+        )
     
     def calcular_totais(self):
         """Recalcula os totais baseado nos itens e despesas."""
@@ -361,6 +475,82 @@ class OrdemServico(models.Model):
         return None
 
 
+class FaturamentoMensal(models.Model):
+    """
+    Resumo materializado de faturamento das Ordens de Serviço.
+    
+    Uma linha por (mês de abertura, empresa pagadora, empresa contratada, status).
+    Mantido incrementalmente pelo save()/delete() da OrdemServico e reconstruído
+    integralmente pelo comando `rebuild_faturamento`.
+    OS com titular pagador (particular) ficam agrupadas com empresa_pagadora nula.
+    """
+    
+    id = models.UUIDField(
+        'ID',
+        primary_key=True,
+        default=uuid7,
+        editable=False,
+        db_column='id_faturamento_mensal'
+    )
+    mes = models.DateField('Mês', help_text='Primeiro dia do mês de abertura das OS')
+    empresa_pagadora = models.ForeignKey(
+        'empresa.Empresa',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='faturamentos_mensais',
+        verbose_name='Empresa Pagadora',
+        db_column='id_empresa_pagadora'
+    )
+    empresa_contratada = models.ForeignKey(
+        EmpresaPrestadora,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='faturamentos_mensais',
+        verbose_name='Empresa Contratada',
+        db_column='id_empresa_contratada'
+    )
+    status = models.CharField(
+        'Status',
+        max_length=20,
+        choices=OrdemServico.STATUS_CHOICES
+    )
+    
+    # Totais agregados
+    quantidade_os = models.PositiveIntegerField('Quantidade de OS', default=0)
+    valor_servicos = models.DecimalField(
+        'Valor dos Serviços', max_digits=14, decimal_places=2, default=Decimal('0.00')
+    )
+    valor_despesas = models.DecimalField(
+        'Valor das Despesas', max_digits=14, decimal_places=2, default=Decimal('0.00')
+    )
+    valor_total = models.DecimalField(
+        'Valor Total', max_digits=14, decimal_places=2, default=Decimal('0.00')
+    )
+    
+    ultima_atualizacao = models.DateTimeField('Última Atualização', auto_now=True)
+    
+    class Meta:
+        verbose_name = 'Faturamento Mensal'
+        verbose_name_plural = 'Faturamentos Mensais'
+        db_table = 'faturamento_mensal'
+        ordering = ['-mes', 'status']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['mes', 'empresa_pagadora', 'empresa_contratada', 'status'],
+                name='faturamento_mensal_chave_uniq',
+                nulls_distinct=False,
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['mes', 'status'], name='faturamento_mes_status_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.mes:%m/%Y} - {self.get_status_display()} - R$ {self.valor_total}"
+
+
 class OrdemServicoItem(models.Model):
     """
     Itens de serviço de uma OS - herda do ContratoServico.
@@ -370,7 +560,7 @@ class OrdemServicoItem(models.Model):
     id = models.UUIDField(
         'ID',
         primary_key=True,
-        default=uuid.uuid4,
+        default=uuid7,
         editable=False,
         db_column='id_ordem_servico_item'
     )
@@ -426,18 +616,70 @@ class OrdemServicoItem(models.Model):
         """Atalho para acessar o serviço."""
         return self.contrato_servico.servico
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._consumo_original = instance._estado_consumo()
+        return instance
+    
+    def _estado_consumo(self):
+        """Retorna (OS, serviço do contrato, quantidade, valor) usados no razão de consumo."""
+        campos = ('ordem_servico_id', 'contrato_servico_id', 'quantidade', 'valor_aplicado')
+        return tuple(self.__dict__.get(campo) for campo in campos)
+    
+    @staticmethod
+    def _travar_ordens_servico(*estados):
+        """
+        Status das OS dos estados do item, lidos com lock das linhas: uma troca
+        de status em paralelo (OrdemServico.save) não intercala com o item.
+        """
+        return OrdemServico.status_travado({estado[0] for estado in estados if estado and estado[0]})
+    
+    def _deltas_consumo(self, original, atual, status):
+        """
+        Calcula os deltas do razão de consumo entre dois estados do item.
+        
+        Args:
+            status: {id da OS: status} de _travar_ordens_servico
+        """
+        from apps.contratos.services.consumo import acumular, consome_contrato
+        
+        deltas = {}
+        for estado, sinal in ((original, -1), (atual, 1)):
+            if estado and consome_contrato(status.get(estado[0])):
+                _, contrato_servico_id, quantidade, valor = estado
+                acumular(deltas, contrato_servico_id, quantidade or 0, (quantidade or 0) * (valor or 0), sinal)
+        return deltas
+    
     def save(self, *args, **kwargs):
+        from apps.contratos.services.consumo import aplicar_consumo
+        
         # Se valor_aplicado não foi definido, usa o valor do contrato
         if self.valor_aplicado is None:
             self.valor_aplicado = self.contrato_servico.valor
-        super().save(*args, **kwargs)
-        # Recalcula totais da OS
-        self.ordem_servico.calcular_totais()
+        
+        original = getattr(self, '_consumo_original', None)
+        atual = self._estado_consumo()
+        with transaction.atomic():
+            status = self._travar_ordens_servico(original, atual) if original != atual else None
+            super().save(*args, **kwargs)
+            if original != atual:
+                aplicar_consumo(self._deltas_consumo(original, atual, status))
+                self._consumo_original = atual
+            # Recalcula totais da OS
+            self.ordem_servico.calcular_totais()
     
     def delete(self, *args, **kwargs):
+        from apps.contratos.services.consumo import aplicar_consumo
+        
         os = self.ordem_servico
-        super().delete(*args, **kwargs)
-        os.calcular_totais()
+        original = getattr(self, '_consumo_original', None) or self._estado_consumo()
+        with transaction.atomic():
+            status = self._travar_ordens_servico(original)
+            resultado = super().delete(*args, **kwargs)
+            aplicar_consumo(self._deltas_consumo(original, None, status))
+            os.calcular_totais()
+        return resultado
     
     def clean(self):
         """Valida que o serviço pertence ao contrato da OS."""
@@ -459,7 +701,7 @@ class TipoDespesa(models.Model):
     id = models.UUIDField(
         'ID',
         primary_key=True,
-        default=uuid.uuid4,
+        default=uuid7,
         editable=False,
         db_column='id_tipo_despesa'
     )
@@ -519,7 +761,7 @@ class DespesaOrdemServico(models.Model):
     id = models.UUIDField(
         'ID',
         primary_key=True,
-        default=uuid.uuid4,
+        default=uuid7,
         editable=False,
         db_column='id_despesa_ordem_servico'
     )
@@ -602,7 +844,7 @@ class OrdemServicoTitular(models.Model):
     id = models.UUIDField(
         'ID',
         primary_key=True,
-        default=uuid.uuid4,
+        default=uuid7,
         editable=False,
         db_column='id_ordem_servico_titular'
     )
@@ -666,7 +908,7 @@ class OrdemServicoDependente(models.Model):
     id = models.UUIDField(
         'ID',
         primary_key=True,
-        default=uuid.uuid4,
+        default=uuid7,
         editable=False,
         db_column='id_ordem_servico_dependente'
     )
@@ -728,10 +970,23 @@ class DocumentoOS(models.Model):
     Armazena metadados para rastreabilidade e validação.
     """
     
+    # Status da geração do PDF (renderização síncrona ou em background)
+    STATUS_GERACAO_PENDENTE = 'PENDENTE'
+    STATUS_GERACAO_PROCESSANDO = 'PROCESSANDO'
+    STATUS_GERACAO_CONCLUIDO = 'CONCLUIDO'
+    STATUS_GERACAO_ERRO = 'ERRO'
+    
+    STATUS_GERACAO_CHOICES = [
+        (STATUS_GERACAO_PENDENTE, 'Pendente'),
+        (STATUS_GERACAO_PROCESSANDO, 'Processando'),
+        (STATUS_GERACAO_CONCLUIDO, 'Concluído'),
+        (STATUS_GERACAO_ERRO, 'Erro'),
+    ]
+    
     id = models.UUIDField(
         'ID',
         primary_key=True,
-        default=uuid.uuid4,
+        default=uuid7,
         editable=False,
         db_column='id_documento_os'
     )
@@ -771,7 +1026,8 @@ class DocumentoOS(models.Model):
     )
     
     # Snapshot dos dados no momento da emissão (JSON)
-    dados_snapshot = models.JSONField(
+    # Armazenado como JSON comprimido (zlib) e decodificado no primeiro acesso
+    dados_snapshot = CompressedJSONField(
         'Snapshot dos Dados',
         help_text='Cópia dos dados da OS no momento da emissão',
         default=dict
@@ -788,32 +1044,54 @@ class DocumentoOS(models.Model):
         db_column='emitido_por'
     )
     
+    # Geração do PDF
+    status_geracao = models.CharField(
+        'Status da Geração',
+        max_length=20,
+        choices=STATUS_GERACAO_CHOICES,
+        default=STATUS_GERACAO_CONCLUIDO
+    )
+    erro_geracao = models.TextField('Erro na Geração', blank=True, default='')
+    
     class Meta:
         verbose_name = 'Documento de OS'
         verbose_name_plural = 'Documentos de OS'
         db_table = 'documento_os'
         ordering = ['-data_emissao']
         unique_together = ['ordem_servico', 'versao']
+        indexes = [
+            models.Index(fields=['hash_sha256']),
+        ]
+    
+    @staticmethod
+    def alocar_versao(ordem_servico_id):
+        """
+        Reserva atomicamente a próxima versão de documento de uma OS.
+        
+        Usa o contador `ultima_versao_documento` da OS com a linha bloqueada
+        (select_for_update), de modo que exportações simultâneas da mesma OS
+        recebem versões distintas.
+        
+        Returns:
+            tuple: (versao, codigo)
+        """
+        with transaction.atomic():
+            numero, ultima_versao = OrdemServico.objects.select_for_update().filter(
+                pk=ordem_servico_id
+            ).values_list('numero', 'ultima_versao_documento').get()
+            versao = ultima_versao + 1
+            OrdemServico.objects.filter(pk=ordem_servico_id).update(
+                ultima_versao_documento=versao
+            )
+        
+        codigo = f"DOC-OS-{str(numero).zfill(6)}-V{str(versao).zfill(3)}"
+        return versao, codigo
     
     def save(self, *args, **kwargs):
-        # Gera versão e código se for novo documento
+        # Reserva versão e código se for novo documento ainda sem código
         # Nota: usamos _state.adding pois pk já é definido pelo UUIDField default
-        if self._state.adding:
-            # Busca a última versão para esta OS
-            ultima_versao = DocumentoOS.objects.filter(
-                ordem_servico=self.ordem_servico
-            ).aggregate(models.Max('versao'))['versao__max'] or 0
-            self.versao = ultima_versao + 1
-            
-            # Busca o número da OS (refresh se necessário)
-            if self.ordem_servico_id:
-                os_obj = OrdemServico.objects.get(pk=self.ordem_servico_id)
-                numero_os = str(os_obj.numero).zfill(6)
-            else:
-                numero_os = str(self.ordem_servico.numero).zfill(6)
-            
-            versao_str = str(self.versao).zfill(3)
-            self.codigo = f"DOC-OS-{numero_os}-V{versao_str}"
+        if self._state.adding and not self.codigo:
+            self.versao, self.codigo = DocumentoOS.alocar_versao(self.ordem_servico_id)
         
         super().save(*args, **kwargs)
     
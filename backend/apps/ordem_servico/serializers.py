@@ -1,10 +1,11 @@
 from rest_framework import serializers
 from decimal import Decimal
 import re
+from apps.core.leitura import LeituraRapida
 from .models import (
     EmpresaPrestadora, Servico, OrdemServico, OrdemServicoItem,
     TipoDespesa, DespesaOrdemServico, OrdemServicoTitular, OrdemServicoDependente,
-    DocumentoOS
+    DocumentoOS, FaturamentoMensal
 )
 
 
@@ -168,6 +169,8 @@ class OrdemServicoItemSerializer(serializers.ModelSerializer):
     )
     valor_total = serializers.SerializerMethodField()
     
+    fontes_projecao = {'valor_total': ('valor_aplicado', 'quantidade')}
+    
     class Meta:
         model = OrdemServicoItem
         fields = [
@@ -243,6 +246,15 @@ class OrdemServicoDependenteSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'data_criacao', 'ultima_atualizacao', 'criado_por', 'atualizado_por']
 
 
+# Caminhos das propriedades de solicitante/pagador da OS (?fields=/?omit=)
+FONTES_SOLICITANTE_PAGADOR = {
+    'solicitante_os_nome': ('empresa_solicitante__nome', 'titular_solicitante__nome'),
+    'pagador_os_nome': ('empresa_pagadora__nome', 'titular_pagador__nome'),
+    'solicitante_os_tipo': ('empresa_solicitante', 'titular_solicitante'),
+    'pagador_os_tipo': ('empresa_pagadora', 'titular_pagador'),
+}
+
+
 class OrdemServicoSerializer(serializers.ModelSerializer):
     """Serializer completo para Ordem de Serviço."""
     status_display = serializers.CharField(source='get_status_display', read_only=True)
@@ -279,6 +291,8 @@ class OrdemServicoSerializer(serializers.ModelSerializer):
     titulares_vinculados = OrdemServicoTitularSerializer(many=True, read_only=True)
     dependentes_vinculados = OrdemServicoDependenteSerializer(many=True, read_only=True)
     
+    fontes_projecao = FONTES_SOLICITANTE_PAGADOR
+    
     class Meta:
         model = OrdemServico
         fields = [
@@ -347,6 +361,14 @@ class OrdemServicoListSerializer(serializers.ModelSerializer):
     titulares_vinculados = OrdemServicoTitularSerializer(many=True, read_only=True)
     dependentes_vinculados = OrdemServicoDependenteSerializer(many=True, read_only=True)
     
+    fontes_projecao = {
+        **FONTES_SOLICITANTE_PAGADOR,
+        'empresa_contratada_nome': ('contrato__empresa_contratada',),
+        'qtd_titulares': ('titulares_vinculados',),
+        'qtd_dependentes': ('dependentes_vinculados',),
+        'qtd_itens': ('itens',),
+    }
+    
     class Meta:
         model = OrdemServico
         fields = [
@@ -386,6 +408,100 @@ class OrdemServicoListSerializer(serializers.ModelSerializer):
         return obj.itens.count()
 
 
+def _nome_solicitante_pagador(empresa, titular):
+    """solicitante_nome_display/pagador_nome_display sobre as colunas de .values()."""
+    def nome(linha):
+        if linha[empresa] is not None:
+            return linha[f'{empresa}__nome']
+        if linha[titular] is not None:
+            return linha[f'{titular}__nome']
+        return None
+    return nome
+
+
+def _tipo_solicitante_pagador(empresa, titular):
+    """solicitante_tipo/pagador_tipo sobre as colunas de .values()."""
+    def tipo(linha):
+        if linha[empresa] is not None:
+            return 'empresa'
+        if linha[titular] is not None:
+            return 'titular'
+        return None
+    return tipo
+
+
+def _empresa_contratada_nome(linha):
+    if linha['contrato__empresa_contratada'] is None:
+        return None
+    return (
+        linha['contrato__empresa_contratada__nome_fantasia']
+        or linha['contrato__empresa_contratada__nome_juridico']
+    )
+
+
+# Listagem de OS via .values() (LeituraRapidaMixin)
+LEITURA_ORDEM_SERVICO_LIST = LeituraRapida(
+    OrdemServicoListSerializer,
+    calculados={
+        'empresa_contratada_nome': (
+            ('contrato__empresa_contratada', 'contrato__empresa_contratada__nome_fantasia',
+             'contrato__empresa_contratada__nome_juridico'),
+            _empresa_contratada_nome,
+        ),
+        'solicitante_os_nome': (
+            FONTES_SOLICITANTE_PAGADOR['solicitante_os_nome'] + FONTES_SOLICITANTE_PAGADOR['solicitante_os_tipo'],
+            _nome_solicitante_pagador('empresa_solicitante', 'titular_solicitante'),
+        ),
+        'pagador_os_nome': (
+            FONTES_SOLICITANTE_PAGADOR['pagador_os_nome'] + FONTES_SOLICITANTE_PAGADOR['pagador_os_tipo'],
+            _nome_solicitante_pagador('empresa_pagadora', 'titular_pagador'),
+        ),
+        'solicitante_os_tipo': (
+            FONTES_SOLICITANTE_PAGADOR['solicitante_os_tipo'],
+            _tipo_solicitante_pagador('empresa_solicitante', 'titular_solicitante'),
+        ),
+        'pagador_os_tipo': (
+            FONTES_SOLICITANTE_PAGADOR['pagador_os_tipo'],
+            _tipo_solicitante_pagador('empresa_pagadora', 'titular_pagador'),
+        ),
+        # Contagens a partir dos aninhados já montados
+        'qtd_titulares': ((), lambda linha: len(linha['titulares_vinculados'])),
+        'qtd_dependentes': ((), lambda linha: len(linha['dependentes_vinculados'])),
+        'qtd_itens': ((), lambda linha: len(linha['itens'])),
+    },
+    aninhados={
+        'itens': LeituraRapida(OrdemServicoItemSerializer, calculados={
+            'valor_total': (
+                ('valor_aplicado', 'quantidade'),
+                lambda linha: linha['valor_aplicado'] * linha['quantidade'],
+            ),
+        }),
+    },
+)
+
+
+class FaturamentoMensalSerializer(serializers.ModelSerializer):
+    """Serializer para o resumo materializado de faturamento."""
+    status_display = serializers.CharField(source='get_status_display', read_only=True)
+    empresa_pagadora_nome = serializers.CharField(source='empresa_pagadora.nome', read_only=True)
+    empresa_contratada_nome = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = FaturamentoMensal
+        fields = [
+            'mes', 'status', 'status_display',
+            'empresa_pagadora', 'empresa_pagadora_nome',
+            'empresa_contratada', 'empresa_contratada_nome',
+            'quantidade_os', 'valor_servicos', 'valor_despesas', 'valor_total',
+            'ultima_atualizacao'
+        ]
+    
+    def get_empresa_contratada_nome(self, obj):
+        if obj.empresa_contratada:
+            return obj.empresa_contratada.nome_fantasia or obj.empresa_contratada.nome_juridico
+        return None
+
+
 class OrdemServicoCreateUpdateSerializer(serializers.ModelSerializer):
     """Serializer para criação/atualização de OS."""
     
@@ -491,10 +607,10 @@ class DocumentoOSSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'ordem_servico', 'ordem_servico_numero', 'versao', 'codigo',
             'data_emissao', 'emitido_por', 'emitido_por_nome',
-            'url_validacao'
+            'url_validacao', 'status_geracao'
         ]
         read_only_fields = [
-            'id', 'versao', 'codigo', 'data_emissao'
+            'id', 'versao', 'codigo', 'data_emissao', 'status_geracao'
         ]
 
 
@@ -585,3 +701,14 @@ class DocumentoOSValidacaoSerializer(serializers.Serializer):
             raise serializers.ValidationError('O arquivo não pode exceder 10MB.')
         
         return value
+
+
+class OrdemServicoExportarPDFsSerializer(serializers.Serializer):
+    """Serializer para exportação de PDFs em lote (ZIP)."""
+    
+    ids = serializers.ListField(
+        child=serializers.UUIDField(),
+        required=False,
+        allow_empty=False,
+        help_text='IDs das OS a exportar; se omitido, usa os filtros da listagem'
+    )
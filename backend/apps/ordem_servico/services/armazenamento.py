@@ -0,0 +1,55 @@
+"""
+Armazenamento dos PDFs de Ordem de Serviço endereçado por conteúdo.
+
+Cada PDF gerado é gravado uma única vez, no caminho derivado do seu hash
+SHA-256 (`<hash[:2]>/<hash>.pdf` dentro de DOCUMENTOS_OS_ROOT). O registro
+DocumentoOS já guarda o hash, portanto qualquer versão pode ser baixada
+novamente sem renderizar o PDF outra vez.
+"""
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.utils.functional import LazyObject
+
+
+class _DocumentosStorage(LazyObject):
+    def _setup(self):
+        self._wrapped = FileSystemStorage(location=settings.DOCUMENTOS_OS_ROOT)
+
+
+documentos_storage = _DocumentosStorage()
+
+
+def caminho_pdf(hash_sha256):
+    """Retorna o caminho relativo do PDF no storage."""
+    return f'{hash_sha256[:2]}/{hash_sha256}.pdf'
+
+
+def armazenar_pdf(pdf_bytes, hash_sha256):
+    """
+    Grava o PDF no storage, se ainda não existir (conteúdo idêntico = mesmo caminho).
+
+    Returns:
+        str: caminho relativo do PDF
+    """
+    caminho = caminho_pdf(hash_sha256)
+    if not documentos_storage.exists(caminho):
+        nome = documentos_storage.save(caminho, ContentFile(pdf_bytes))
+        if nome != caminho:
+            # Gravação concorrente do mesmo conteúdo: mantém apenas o original
+            documentos_storage.delete(nome)
+    return caminho
+
+
+def abrir_pdf(hash_sha256):
+    """
+    Abre o PDF armazenado para leitura.
+
+    Returns:
+        tuple: (arquivo, tamanho) ou (None, None) se o PDF não estiver armazenado
+    """
+    caminho = caminho_pdf(hash_sha256)
+    if not hash_sha256 or not documentos_storage.exists(caminho):
+        return None, None
+    return documentos_storage.open(caminho, 'rb'), documentos_storage.size(caminho)
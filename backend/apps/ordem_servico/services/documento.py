@@ -0,0 +1,345 @@
+"""
+Dados de documento (PDF) de Ordem de Serviço.
+
+Carrega uma OS e todos os dados usados na emissão do documento com um
+número fixo de queries (1 + 4 prefetches) e os entrega em um DTO imutável.
+O mesmo DTO alimenta o gerador de PDF e o snapshot gravado em DocumentoOS,
+evitando que cada seção consulte o banco novamente.
+"""
+
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+from typing import Optional
+
+from django.db.models import Prefetch
+
+
+# =============================================================================
+# DTOs
+# =============================================================================
+@dataclass(frozen=True)
+class EmpresaDocumento:
+    nome: str
+    cnpj: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class UsuarioDocumento:
+    nome: str
+    email: str
+
+
+@dataclass(frozen=True)
+class TitularDocumento:
+    nome: str
+    cpf: Optional[str]
+    rnm: Optional[str]
+    observacao: Optional[str]
+
+
+@dataclass(frozen=True)
+class DependenteDocumento:
+    nome: str
+    rnm: Optional[str]
+    tipo_dependente: Optional[str]
+    titular_nome: Optional[str]
+    observacao: Optional[str]
+
+
+@dataclass(frozen=True)
+class ItemDocumento:
+    servico_item: Optional[str]
+    servico_descricao: Optional[str]
+    quantidade: int
+    valor_aplicado: Decimal
+    valor_total: Decimal
+
+
+@dataclass(frozen=True)
+class DespesaDocumento:
+    tipo_item: Optional[str]
+    tipo_descricao: Optional[str]
+    valor: Decimal
+    observacao: Optional[str]
+
+
+@dataclass(frozen=True)
+class DadosDocumentoOS:
+    """Dados de uma OS no momento da emissão do documento."""
+
+    id: object
+    numero: int
+    status: str
+    data_abertura: Optional[date]
+    data_fechamento: Optional[date]
+    observacao: Optional[str]
+    valor_servicos: Decimal
+    valor_despesas: Decimal
+    valor_total: Decimal
+
+    contrato_numero: Optional[str] = None
+    empresa_contratante: Optional[EmpresaDocumento] = None
+    empresa_contratada_nome: Optional[str] = None
+    empresa_solicitante: Optional[EmpresaDocumento] = None
+    empresa_pagadora: Optional[EmpresaDocumento] = None
+    titular_solicitante_nome: Optional[str] = None
+    titular_pagador_nome: Optional[str] = None
+    solicitante: Optional[UsuarioDocumento] = None
+    colaborador: Optional[UsuarioDocumento] = None
+
+    titulares: tuple = ()
+    dependentes: tuple = ()
+    itens: tuple = ()
+    despesas: tuple = ()
+
+
+# =============================================================================
+# LOADER
+# =============================================================================
+def _empresa(empresa, com_cnpj=True):
+    if not empresa:
+        return None
+    return EmpresaDocumento(nome=empresa.nome, cnpj=empresa.cnpj if com_cnpj else None)
+
+
+def _usuario(usuario):
+    if not usuario:
+        return None
+    return UsuarioDocumento(nome=usuario.nome, email=usuario.email)
+
+
+def carregar_dados_documento(ordem_servico_id) -> DadosDocumentoOS:
+    """
+    Carrega a OS e todos os dados do documento em 5 queries.
+
+    Args:
+        ordem_servico_id: UUID da OrdemServico
+
+    Returns:
+        DadosDocumentoOS
+
+    Raises:
+        OrdemServico.DoesNotExist
+    """
+    from ..models import (
+        OrdemServico, OrdemServicoItem, DespesaOrdemServico,
+        OrdemServicoTitular, OrdemServicoDependente,
+    )
+
+    os_obj = OrdemServico.objects.select_related(
+        'contrato', 'contrato__empresa_contratante', 'contrato__empresa_contratada',
+        'empresa_solicitante', 'empresa_pagadora',
+        'titular_solicitante', 'titular_pagador',
+        'solicitante', 'colaborador',
+    ).prefetch_related(
+        Prefetch(
+            'titulares_vinculados',
+            queryset=OrdemServicoTitular.objects.select_related('titular'),
+        ),
+        Prefetch(
+            'dependentes_vinculados',
+            queryset=OrdemServicoDependente.objects.select_related('dependente', 'dependente__titular'),
+        ),
+        Prefetch(
+            'itens',
+            queryset=OrdemServicoItem.objects.select_related('contrato_servico', 'contrato_servico__servico'),
+        ),
+        Prefetch(
+            'despesas',
+            queryset=DespesaOrdemServico.objects.filter(ativo=True).select_related('tipo_despesa'),
+        ),
+    ).get(pk=ordem_servico_id)
+
+    contrato = os_obj.contrato
+    empresa_contratada = contrato.empresa_contratada if contrato else None
+
+    titulares = tuple(
+        TitularDocumento(
+            nome=vinculo.titular.nome,
+            cpf=vinculo.titular.cpf,
+            rnm=vinculo.titular.rnm,
+            observacao=vinculo.observacao,
+        )
+        for vinculo in os_obj.titulares_vinculados.all()
+    )
+
+    dependentes = tuple(
+        DependenteDocumento(
+            nome=vinculo.dependente.nome,
+            rnm=vinculo.dependente.rnm,
+            tipo_dependente=vinculo.dependente.tipo_dependente,
+            titular_nome=vinculo.dependente.titular.nome if vinculo.dependente.titular else None,
+            observacao=vinculo.observacao,
+        )
+        for vinculo in os_obj.dependentes_vinculados.all()
+    )
+
+    itens = []
+    for item in os_obj.itens.all():
+        servico = item.contrato_servico.servico if item.contrato_servico else None
+        itens.append(ItemDocumento(
+            servico_item=servico.item if servico else None,
+            servico_descricao=servico.descricao if servico else None,
+            quantidade=item.quantidade,
+            valor_aplicado=item.valor_aplicado or Decimal('0'),
+            valor_total=item.valor_total,
+        ))
+
+    despesas = tuple(
+        DespesaDocumento(
+            tipo_item=despesa.tipo_despesa.item if despesa.tipo_despesa else None,
+            tipo_descricao=despesa.tipo_despesa.descricao if despesa.tipo_despesa else None,
+            valor=despesa.valor,
+            observacao=despesa.observacao,
+        )
+        for despesa in os_obj.despesas.all()
+    )
+
+    return DadosDocumentoOS(
+        id=os_obj.id,
+        numero=os_obj.numero,
+        status=os_obj.status,
+        data_abertura=os_obj.data_abertura,
+        data_fechamento=os_obj.data_fechamento,
+        observacao=os_obj.observacao,
+        valor_servicos=os_obj.valor_servicos,
+        valor_despesas=os_obj.valor_despesas,
+        valor_total=os_obj.valor_total,
+        contrato_numero=contrato.numero if contrato else None,
+        empresa_contratante=_empresa(contrato.empresa_contratante, com_cnpj=False) if contrato else None,
+        empresa_contratada_nome=(
+            empresa_contratada.nome_fantasia or empresa_contratada.nome_juridico
+        ) if empresa_contratada else None,
+        empresa_solicitante=_empresa(os_obj.empresa_solicitante),
+        empresa_pagadora=_empresa(os_obj.empresa_pagadora),
+        titular_solicitante_nome=os_obj.titular_solicitante.nome if os_obj.titular_solicitante else None,
+        titular_pagador_nome=os_obj.titular_pagador.nome if os_obj.titular_pagador else None,
+        solicitante=_usuario(os_obj.solicitante),
+        colaborador=_usuario(os_obj.colaborador),
+        titulares=titulares,
+        dependentes=dependentes,
+        itens=tuple(itens),
+        despesas=despesas,
+    )
+
+
+# =============================================================================
+# SNAPSHOT
+# =============================================================================
+def criar_snapshot(dados: DadosDocumentoOS) -> dict:
+    """Cria o snapshot (JSON) armazenado em DocumentoOS.dados_snapshot."""
+    snapshot = {
+        'os_numero': dados.numero,
+        'os_status': dados.status,
+        'os_data_abertura': str(dados.data_abertura) if dados.data_abertura else None,
+        'os_data_fechamento': str(dados.data_fechamento) if dados.data_fechamento else None,
+        'os_observacao': dados.observacao,
+        'os_valor_total': str(dados.valor_total) if dados.valor_total else '0.00',
+    }
+
+    if dados.contrato_numero is not None:
+        snapshot['contrato'] = {
+            'numero': dados.contrato_numero,
+            'empresa_contratante': dados.empresa_contratante.nome if dados.empresa_contratante else None,
+        }
+
+    if dados.empresa_solicitante:
+        snapshot['empresa_solicitante'] = {
+            'nome': dados.empresa_solicitante.nome,
+            'cnpj': dados.empresa_solicitante.cnpj,
+        }
+
+    if dados.empresa_pagadora:
+        snapshot['empresa_pagadora'] = {
+            'nome': dados.empresa_pagadora.nome,
+            'cnpj': dados.empresa_pagadora.cnpj,
+        }
+
+    if dados.solicitante:
+        snapshot['solicitante'] = {'nome': dados.solicitante.nome, 'email': dados.solicitante.email}
+
+    if dados.colaborador:
+        snapshot['colaborador'] = {'nome': dados.colaborador.nome, 'email': dados.colaborador.email}
+
+    snapshot['titulares'] = [
+        {'nome': t.nome, 'cpf': t.cpf, 'observacao': t.observacao}
+        for t in dados.titulares
+    ]
+
+    snapshot['dependentes'] = [
+        {
+            'nome': d.nome,
+            'tipo_dependente': d.tipo_dependente,
+            'titular_nome': d.titular_nome,
+            'observacao': d.observacao,
+        }
+        for d in dados.dependentes
+    ]
+
+    snapshot['itens'] = [
+        {
+            'servico_item': item.servico_item,
+            'servico_descricao': item.servico_descricao,
+            'quantidade': item.quantidade,
+            'valor_unitario': str(item.valor_aplicado) if item.valor_aplicado else '0.00',
+            'valor_total': str(item.valor_total) if item.valor_total else '0.00',
+        }
+        for item in dados.itens
+    ]
+
+    snapshot['despesas'] = [
+        {
+            'tipo_item': despesa.tipo_item,
+            'tipo_descricao': despesa.tipo_descricao,
+            'valor': str(despesa.valor) if despesa.valor else '0.00',
+            'observacao': despesa.observacao,
+        }
+        for despesa in dados.despesas
+    ]
+
+    return snapshot
+
+
+# =============================================================================
+# RENDERIZAÇÃO
+# =============================================================================
+def url_validacao_documento(documento_id) -> str:
+    """URL pública de validação impressa no PDF (QR code)."""
+    from django.conf import settings
+
+    frontend_url = getattr(settings, 'FRONTEND_URL', 'http://localhost:5173')
+    return f"{frontend_url}/validar-documento/{documento_id}"
+
+
+def concluir_documento(documento, dados: DadosDocumentoOS, pdf_bytes: bytes, hash_sha256: str):
+    """
+    Armazena o PDF renderizado por hash e preenche `hash_sha256` e
+    `dados_snapshot` no documento (sem salvá-lo).
+    """
+    from .armazenamento import armazenar_pdf
+
+    # Armazena o PDF por hash para novos downloads sem re-renderizar
+    armazenar_pdf(pdf_bytes, hash_sha256)
+
+    documento.hash_sha256 = hash_sha256
+    documento.dados_snapshot = criar_snapshot(dados)
+
+
+def renderizar_documento(documento, dados: DadosDocumentoOS) -> bytes:
+    """
+    Renderiza o PDF de um DocumentoOS com versão/código já reservados.
+
+    Armazena o PDF por hash e preenche `hash_sha256` e `dados_snapshot`
+    no documento (sem salvá-lo).
+
+    Returns:
+        bytes: conteúdo do PDF
+    """
+    from .pdf_generator import generate_os_pdf
+
+    pdf_bytes, hash_sha256 = generate_os_pdf(
+        dados, documento.codigo, url_validacao_documento(documento.id)
+    )
+    concluir_documento(documento, dados, pdf_bytes, hash_sha256)
+    return pdf_bytes
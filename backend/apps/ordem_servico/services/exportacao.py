@@ -0,0 +1,198 @@
+"""
+Exportação em lote de PDFs de Ordens de Serviço (ZIP).
+
+Os PDFs são renderizados em paralelo em um ProcessPoolExecutor (um processo
+por núcleo), criado uma vez por processo web e reaproveitado entre as
+requisições. O processo da requisição carrega os dados e reserva a versão
+de cada OS só quando há vaga no pool (no máximo 2 por processo em
+andamento), registra cada DocumentoOS e escreve o ZIP em streaming à medida
+que os documentos ficam prontos, então o primeiro PDF sai sem esperar a
+preparação das demais OS. Ao final, `manifesto.json` traz a lista de
+documentos e a vazão (documentos/segundo) para ajuste do pool.
+"""
+
+import json
+import multiprocessing
+import os
+import threading
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+
+from .documento import carregar_dados_documento, concluir_documento, url_validacao_documento
+from .pdf_generator import generate_os_pdf
+
+
+def _inicializar_worker():
+    """Prepara o Django nos processos do pool (iniciados com spawn)."""
+    import django
+    django.setup()
+
+
+def _maximo_workers():
+    return getattr(settings, 'EXPORTACAO_PDF_MAX_WORKERS', None) or os.cpu_count() or 1
+
+
+def tamanho_pool(quantidade_documentos):
+    """Quantidade de processos: núcleos disponíveis, limitada à quantidade de documentos."""
+    return max(1, min(_maximo_workers(), quantidade_documentos))
+
+
+_pool = None
+_trava_pool = threading.Lock()
+
+
+def obter_pool():
+    """Pool de processos do processo web, criado no primeiro uso."""
+    global _pool
+    with _trava_pool:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=_maximo_workers(),
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_inicializar_worker,
+            )
+        return _pool
+
+
+def _descartar_pool(pool):
+    """Descarta o pool quebrado (processo encerrado); o próximo uso cria outro."""
+    global _pool
+    with _trava_pool:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+class _ZipStream:
+    """Destino de escrita do ZipFile que acumula os bytes para o streaming."""
+
+    def __init__(self):
+        self._partes = []
+        self._posicao = 0
+
+    def write(self, dados):
+        self._partes.append(bytes(dados))
+        self._posicao += len(dados)
+        return len(dados)
+
+    def tell(self):
+        return self._posicao
+
+    def flush(self):
+        pass
+
+    def consumir(self):
+        dados = b''.join(self._partes)
+        self._partes = []
+        return dados
+
+
+def exportar_pdfs_zip(ordens_servico_ids, usuario):
+    """
+    Gera os PDFs das OS informadas e produz o ZIP em blocos (generator).
+
+    Para cada OS é reservada uma nova versão de DocumentoOS, registrada
+    assim que o PDF correspondente termina de renderizar.
+
+    Args:
+        ordens_servico_ids: lista de UUIDs de OrdemServico
+        usuario: usuário emissor dos documentos
+
+    Yields:
+        bytes: partes do arquivo ZIP
+    """
+    from ..models import DocumentoOS
+
+    inicio = time.perf_counter()
+    stream = _ZipStream()
+    documentos = []
+    erros = []
+
+    workers = tamanho_pool(len(ordens_servico_ids))
+    pendentes = iter(ordens_servico_ids)
+    em_andamento = {}
+
+    def preencher():
+        """Prepara e envia ao pool as próximas OS até o limite em andamento."""
+        while len(em_andamento) < 2 * workers:
+            ordem_servico_id = next(pendentes, None)
+            if ordem_servico_id is None:
+                return
+            # Dados e versão são preparados no processo principal (acesso ao banco)
+            try:
+                dados = carregar_dados_documento(ordem_servico_id)
+                documento = DocumentoOS(ordem_servico_id=ordem_servico_id, emitido_por=usuario)
+                documento.versao, documento.codigo = DocumentoOS.alocar_versao(ordem_servico_id)
+            except Exception as e:
+                # Ex.: OS excluída depois da validação da requisição; o ZIP segue
+                erros.append({
+                    'ordem_servico_id': str(ordem_servico_id), 'os_numero': None, 'codigo': None, 'erro': str(e),
+                })
+                continue
+            argumentos = (dados, documento.codigo, url_validacao_documento(documento.id))
+            pool = obter_pool()
+            try:
+                future = pool.submit(generate_os_pdf, *argumentos)
+            except BrokenProcessPool:
+                _descartar_pool(pool)
+                pool = obter_pool()
+                future = pool.submit(generate_os_pdf, *argumentos)
+            em_andamento[future] = (documento, dados, pool)
+
+    try:
+        with zipfile.ZipFile(stream, mode='w', compression=zipfile.ZIP_STORED) as arquivo_zip:
+            preencher()
+            while em_andamento:
+                concluidos, _ = wait(em_andamento, return_when=FIRST_COMPLETED)
+                prontos = [(future, em_andamento.pop(future)) for future in concluidos]
+                preencher()
+
+                for future, (documento, dados, pool) in prontos:
+                    try:
+                        pdf_bytes, hash_sha256 = future.result()
+                    except Exception as e:
+                        if isinstance(e, BrokenProcessPool):
+                            _descartar_pool(pool)
+                        # A versão reservada fica sem documento (lacuna na numeração)
+                        erros.append({
+                            'ordem_servico_id': str(documento.ordem_servico_id), 'os_numero': dados.numero,
+                            'codigo': documento.codigo, 'erro': str(e),
+                        })
+                        continue
+
+                    concluir_documento(documento, dados, pdf_bytes, hash_sha256)
+                    documento.save(force_insert=True)
+
+                    filename = f"OS-{str(dados.numero).zfill(6)}-{documento.codigo}.pdf"
+                    arquivo_zip.writestr(filename, pdf_bytes)
+                    documentos.append({
+                        'id': str(documento.id),
+                        'os_numero': dados.numero,
+                        'codigo': documento.codigo,
+                        'versao': documento.versao,
+                        'hash_sha256': hash_sha256,
+                        'arquivo': filename,
+                    })
+                    yield stream.consumir()
+
+            duracao = time.perf_counter() - inicio
+            manifesto = {
+                'total_documentos': len(documentos),
+                'total_erros': len(erros),
+                'workers': workers,
+                'duracao_segundos': round(duracao, 3),
+                'documentos_por_segundo': round(len(documentos) / duracao, 2) if duracao else None,
+                'documentos': documentos,
+                'erros': erros,
+            }
+            arquivo_zip.writestr('manifesto.json', json.dumps(manifesto, ensure_ascii=False, indent=2))
+    finally:
+        # Download interrompido: libera o pool compartilhado das OS ainda na fila
+        for future in em_andamento:
+            future.cancel()
+
+    yield stream.consumir()
@@ -0,0 +1,163 @@
+"""
+Resumo materializado de faturamento das Ordens de Serviço.
+
+Mantém a tabela `faturamento_mensal` agrupada por mês de abertura,
+empresa pagadora, empresa contratada (via contrato) e status.
+
+- Atualização incremental: OrdemServico.save()/delete() agendam o recálculo
+  apenas dos grupos afetados (chave antiga e nova), após o commit; a troca
+  da empresa contratada em Contrato.save() move os grupos das OS do contrato.
+- Reconstrução completa: comando `python manage.py rebuild_faturamento`
+  (necessária após alterações que não passam por save()/delete(), como
+  QuerySet.update()).
+"""
+
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncMonth
+
+
+def inicio_mes(data):
+    """Retorna o primeiro dia do mês da data informada."""
+    if isinstance(data, str):
+        data = date.fromisoformat(data[:10])
+    return data.replace(day=1)
+
+
+def agendar_atualizacao_faturamento(*estados):
+    """
+    Agenda o recálculo dos grupos de faturamento para depois do commit.
+
+    Args:
+        *estados: tuplas de OrdemServico._estado_faturamento() (antes/depois)
+    """
+    estados = [estado for estado in estados if estado]
+    if not estados:
+        return
+    transaction.on_commit(lambda: atualizar_faturamento(estados))
+
+
+def atualizar_faturamento(estados):
+    """Recalcula os grupos de faturamento correspondentes aos estados de OS."""
+    from apps.contratos.models import Contrato
+
+    contrato_ids = {estado[2] for estado in estados if estado[2]}
+    contratadas = dict(
+        Contrato.objects.filter(pk__in=contrato_ids).values_list('id', 'empresa_contratada_id')
+    )
+
+    chaves = set()
+    for data_abertura, empresa_pagadora_id, contrato_id, status, *_ in estados:
+        if not data_abertura or not contrato_id or not status:
+            continue
+        chaves.add((
+            inicio_mes(data_abertura),
+            empresa_pagadora_id,
+            contratadas.get(contrato_id),
+            status,
+        ))
+
+    for chave in chaves:
+        recalcular_grupo(*chave)
+
+
+def agendar_troca_contratada(contrato_id, contratada_anterior, contratada_nova):
+    """
+    Agenda, para depois do commit, o recálculo dos grupos das OS do contrato
+    com a empresa contratada anterior e a nova.
+    """
+    from ..models import OrdemServico
+
+    def atualizar():
+        grupos = OrdemServico.objects.filter(contrato_id=contrato_id).order_by().annotate(
+            mes=TruncMonth('data_abertura')
+        ).values_list('mes', 'empresa_pagadora_id', 'status').distinct()
+        for mes, empresa_pagadora_id, status in grupos:
+            for empresa_contratada_id in (contratada_anterior, contratada_nova):
+                recalcular_grupo(mes, empresa_pagadora_id, empresa_contratada_id, status)
+
+    transaction.on_commit(atualizar)
+
+
+def recalcular_grupo(mes, empresa_pagadora_id, empresa_contratada_id, status):
+    """Recalcula uma única linha do resumo a partir das OS do grupo."""
+    from ..models import OrdemServico, FaturamentoMensal
+
+    proximo_mes = (mes + timedelta(days=32)).replace(day=1)
+    totais = OrdemServico.objects.filter(
+        data_abertura__gte=mes,
+        data_abertura__lt=proximo_mes,
+        empresa_pagadora_id=empresa_pagadora_id,
+        contrato__empresa_contratada_id=empresa_contratada_id,
+        status=status,
+    ).aggregate(
+        quantidade_os=Count('id'),
+        soma_servicos=Sum('valor_servicos'),
+        soma_despesas=Sum('valor_despesas'),
+        soma_total=Sum('valor_total'),
+    )
+
+    chave = {
+        'mes': mes,
+        'empresa_pagadora_id': empresa_pagadora_id,
+        'empresa_contratada_id': empresa_contratada_id,
+        'status': status,
+    }
+
+    with transaction.atomic():
+        if not totais['quantidade_os']:
+            FaturamentoMensal.objects.filter(**chave).delete()
+            return
+        FaturamentoMensal.objects.update_or_create(
+            **chave,
+            defaults={
+                'quantidade_os': totais['quantidade_os'],
+                'valor_servicos': totais['soma_servicos'] or Decimal('0.00'),
+                'valor_despesas': totais['soma_despesas'] or Decimal('0.00'),
+                'valor_total': totais['soma_total'] or Decimal('0.00'),
+            }
+        )
+
+
+def reconstruir_faturamento():
+    """
+    Reconstrói todo o resumo de faturamento com uma única agregação.
+
+    Returns:
+        int: quantidade de linhas geradas
+    """
+    from ..models import OrdemServico, FaturamentoMensal
+
+    # order_by() limpa a ordenação padrão ('-numero'), que quebraria o GROUP BY
+    grupos = OrdemServico.objects.order_by().annotate(
+        mes=TruncMonth('data_abertura')
+    ).values(
+        'mes', 'empresa_pagadora', 'contrato__empresa_contratada', 'status'
+    ).annotate(
+        quantidade_os=Count('id'),
+        soma_servicos=Sum('valor_servicos'),
+        soma_despesas=Sum('valor_despesas'),
+        soma_total=Sum('valor_total'),
+    )
+
+    with transaction.atomic():
+        linhas = [
+            FaturamentoMensal(
+                mes=grupo['mes'],
+                empresa_pagadora_id=grupo['empresa_pagadora'],
+                empresa_contratada_id=grupo['contrato__empresa_contratada'],
+                status=grupo['status'],
+                quantidade_os=grupo['quantidade_os'],
+                valor_servicos=grupo['soma_servicos'] or Decimal('0.00'),
+                valor_despesas=grupo['soma_despesas'] or Decimal('0.00'),
+                valor_total=grupo['soma_total'] or Decimal('0.00'),
+            )
+            for grupo in grupos
+        ]
+        FaturamentoMensal.objects.all().delete()
+        FaturamentoMensal.objects.bulk_create(linhas, batch_size=1000)
+
+    return len(linhas)
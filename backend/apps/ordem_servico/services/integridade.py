@@ -0,0 +1,70 @@
+"""
+Verificação de integridade de PDFs enviados por upload.
+
+O hash SHA-256 é calculado em blocos, diretamente no upload handler,
+enquanto o Django recebe o arquivo, sem carregá-lo inteiro em memória.
+"""
+
+import hashlib
+
+from django.core.files.uploadhandler import FileUploadHandler
+
+
+class SHA256UploadHandler(FileUploadHandler):
+    """
+    Upload handler que calcula o SHA-256 de cada arquivo durante o recebimento.
+
+    Não armazena o arquivo: repassa os blocos ao próximo handler e guarda
+    o hash em `hashes[nome_do_campo]`. Deve ser inserido na posição 0 de
+    `request.upload_handlers` antes de `request.data`/`request.FILES`.
+    """
+
+    def __init__(self, request=None):
+        super().__init__(request)
+        self.hashes = {}
+        self._hasher = None
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self._hasher = hashlib.sha256()
+
+    def receive_data_chunk(self, raw_data, start):
+        self._hasher.update(raw_data)
+        return raw_data
+
+    def file_complete(self, file_size):
+        self.hashes[self.field_name] = self._hasher.hexdigest()
+        return None
+
+
+def instalar_hash_upload(request):
+    """Registra o SHA256UploadHandler na requisição e o retorna."""
+    handler = SHA256UploadHandler(request)
+    request.upload_handlers.insert(0, handler)
+    return handler
+
+
+def calcular_hash_arquivo(arquivo, handler=None, campo='arquivo'):
+    """
+    Retorna o SHA-256 do arquivo enviado.
+
+    Usa o hash calculado no upload handler, se disponível; caso contrário,
+    lê o arquivo em blocos (UploadedFile.chunks()).
+    """
+    if handler is not None and campo in handler.hashes:
+        return handler.hashes[campo]
+
+    hasher = hashlib.sha256()
+    arquivo.seek(0)
+    for bloco in arquivo.chunks():
+        hasher.update(bloco)
+    arquivo.seek(0)
+    return hasher.hexdigest()
+
+
+def is_pdf(arquivo):
+    """Verifica a assinatura do arquivo (começa com %PDF-)."""
+    arquivo.seek(0)
+    header = arquivo.read(5)
+    arquivo.seek(0)
+    return header == b'%PDF-'
@@ -10,6 +10,7 @@ Suporta múltiplas páginas com cabeçalho/rodapé desenhados via onPage callbac
 import io
 import hashlib
 import os
+import threading
 from decimal import Decimal
 from datetime import datetime
 from io import BytesIO
@@ -27,6 +28,8 @@ from reportlab.lib.enums import TA_LEFT, TA_RIGHT, TA_CENTER
 from reportlab.lib.utils import ImageReader
 from django.conf import settings
 
+from .documento import DadosDocumentoOS, carregar_dados_documento
+
 
 # =============================================================================
 # CONSTANTES DE LAYOUT - MARGENS ABNT
@@ -139,6 +142,80 @@ def get_logo_path():
     return os.path.join(settings.BASE_DIR, 'static', 'img', 'logo.png')
 
 
+# =============================================================================
+# RECURSOS COMPARTILHADOS (cache de módulo)
+# =============================================================================
+# Logo decodificado e folha de estilos são montados uma vez por processo e
+# compartilhados entre as threads do worker (gunicorn gthread). São apenas
+# lidos durante a geração; o lock protege só a inicialização.
+_recursos_lock = threading.Lock()
+_logo_cache = {}
+_stylesheet_cache = None
+
+
+def get_logo_image():
+    """Retorna o ImageReader do logo (decodificado uma única vez) ou None."""
+    logo_path = get_logo_path()
+    if logo_path in _logo_cache:
+        return _logo_cache[logo_path]
+    
+    with _recursos_lock:
+        if logo_path not in _logo_cache:
+            logo = None
+            if os.path.exists(logo_path):
+                try:
+                    logo = ImageReader(logo_path)
+                    logo.getRGBData()  # Força a decodificação fora do build
+                except Exception:
+                    logo = None
+            _logo_cache[logo_path] = logo
+    return _logo_cache[logo_path]
+
+
+def _build_stylesheet():
+    """Monta a folha de estilos base com os estilos customizados do documento."""
+    styles = getSampleStyleSheet()
+    styles.add(ParagraphStyle(
+        'OSSectionTitle',
+        parent=styles['Heading2'],
+        fontSize=10,
+        textColor=COLOR_DARK_GRAY,
+        spaceBefore=1 * mm,
+        spaceAfter=1 * mm,
+    ))
+    styles.add(ParagraphStyle(
+        'OSBodyText',
+        parent=styles['Normal'],
+        fontSize=9,
+        textColor=COLOR_DARK_GRAY,
+    ))
+    styles.add(ParagraphStyle(
+        'OSTableCell',
+        parent=styles['Normal'],
+        fontSize=8,
+        textColor=COLOR_DARK_GRAY,
+        leading=10,
+    ))
+    styles.add(ParagraphStyle(
+        'OSTableHeader',
+        parent=styles['Normal'],
+        fontSize=8,
+        fontName='Helvetica-Bold',
+        textColor=COLOR_BLACK,
+    ))
+    return styles
+
+
+def get_stylesheet():
+    """Retorna a folha de estilos compartilhada (somente leitura)."""
+    global _stylesheet_cache
+    if _stylesheet_cache is None:
+        with _recursos_lock:
+            if _stylesheet_cache is None:
+                _stylesheet_cache = _build_stylesheet()
+    return _stylesheet_cache
+
+
 # =============================================================================
 # CALLBACKS DE PÁGINA (HEADER/FOOTER)
 # =============================================================================
@@ -148,7 +225,8 @@ class PageInfo:
         self.os_numero = ''
         self.codigo_documento = ''
         self.url_validacao = ''
-        self.logo_path = ''
+        self.logo_image = None  # ImageReader compartilhado (get_logo_image)
+        self.qr_image = None    # ImageReader gerado uma vez por documento
         self.is_first_page = True
         self.data_emissao = ''  # Para dados invisíveis
         self.valor_total = ''   # Para dados invisíveis
@@ -168,13 +246,12 @@ def draw_header(canvas, doc, page_info):
     header_bottom = header_top - HEADER_HEIGHT
     
     # Logo à esquerda
-    logo_path = page_info.logo_path
-    if logo_path and os.path.exists(logo_path):
+    if page_info.logo_image is not None:
         logo_size = 12 * mm
         logo_x = MARGIN_LEFT
         logo_y = header_top - logo_size  # Alinha ao topo do header
         try:
-            canvas.drawImage(logo_path, logo_x, logo_y, 
+            canvas.drawImage(page_info.logo_image, logo_x, logo_y, 
                            width=logo_size, height=logo_size, 
                            preserveAspectRatio=True, mask='auto')
         except:
@@ -224,11 +301,9 @@ def draw_footer(canvas, doc, page_info):
     qr_x = PAGE_WIDTH - MARGIN_RIGHT - qr_size
     qr_y = footer_bottom + (FOOTER_HEIGHT - qr_size) / 2
     
-    if page_info.url_validacao:
+    if page_info.qr_image is not None:
         try:
-            qr_buffer = generate_qr_code_image(page_info.url_validacao)
-            img_reader = ImageReader(qr_buffer)
-            canvas.drawImage(img_reader, qr_x, qr_y, 
+            canvas.drawImage(page_info.qr_image, qr_x, qr_y, 
                            width=qr_size, height=qr_size,
                            preserveAspectRatio=True, mask='auto')
         except:
@@ -292,57 +367,30 @@ class OSPDFGenerator:
     - Header: área fixa no topo para logo e título
     - Content: área central para o conteúdo (flowables)
     - Footer: área fixa no rodapé para QR code e informações
+    
+    Os dados vêm de um DadosDocumentoOS (services/documento.py); se for
+    passada uma instância de OrdemServico, os dados são carregados dela.
     """
     
     def __init__(self, ordem_servico, codigo_documento: str, url_validacao: str):
+        if not isinstance(ordem_servico, DadosDocumentoOS):
+            ordem_servico = carregar_dados_documento(ordem_servico.pk)
         self.os = ordem_servico
         self.codigo_documento = codigo_documento
         self.url_validacao = url_validacao
-        self.styles = getSampleStyleSheet()
-        self._setup_styles()
+        self.styles = get_stylesheet()
         
         # Informações para header/footer
         self.page_info = PageInfo()
         self.page_info.os_numero = ordem_servico.numero
         self.page_info.codigo_documento = codigo_documento
         self.page_info.url_validacao = url_validacao
-        self.page_info.logo_path = get_logo_path()
+        self.page_info.logo_image = get_logo_image()
         
         # Dados invisíveis para rastreabilidade
         self.page_info.data_emissao = format_datetime(datetime.now())
         self.page_info.valor_total = format_currency(ordem_servico.valor_total)
     
-    def _setup_styles(self):
-        """Configura estilos customizados para o documento."""
-        self.styles.add(ParagraphStyle(
-            'OSSectionTitle',
-            parent=self.styles['Heading2'],
-            fontSize=10,
-            textColor=COLOR_DARK_GRAY,
-            spaceBefore=1 * mm,
-            spaceAfter=1 * mm,
-        ))
-        self.styles.add(ParagraphStyle(
-            'OSBodyText',
-            parent=self.styles['Normal'],
-            fontSize=9,
-            textColor=COLOR_DARK_GRAY,
-        ))
-        self.styles.add(ParagraphStyle(
-            'OSTableCell',
-            parent=self.styles['Normal'],
-            fontSize=8,
-            textColor=COLOR_DARK_GRAY,
-            leading=10,
-        ))
-        self.styles.add(ParagraphStyle(
-            'OSTableHeader',
-            parent=self.styles['Normal'],
-            fontSize=8,
-            fontName='Helvetica-Bold',
-            textColor=COLOR_BLACK,
-        ))
-    
     def _create_title_section(self):
         """Cria a seção de título/info inicial (abaixo do header)."""
         elements = []
@@ -377,33 +425,29 @@ class OSPDFGenerator:
         section.append(Paragraph("<b>INFORMAÇÕES GERAIS</b>", self.styles['OSSectionTitle']))
         
         # Dados
-        empresa_contratada = '-'
-        if self.os.contrato and self.os.contrato.empresa_contratada:
-            empresa_contratada = getattr(self.os.contrato.empresa_contratada, 'nome_fantasia', None) or getattr(self.os.contrato.empresa_contratada, 'nome_juridico', None) or '-'
+        empresa_contratada = self.os.empresa_contratada_nome or '-'
         
         # Solicitante da OS (pode ser empresa ou titular)
         solicitante_os = '-'
         if self.os.empresa_solicitante:
-            solicitante_os = getattr(self.os.empresa_solicitante, 'nome', None) or '-'
-        elif self.os.titular_solicitante:
-            solicitante_os = getattr(self.os.titular_solicitante, 'nome', None) or '-'
-            solicitante_os = f"{solicitante_os} (Particular)"
+            solicitante_os = self.os.empresa_solicitante.nome or '-'
+        elif self.os.titular_solicitante_nome is not None:
+            solicitante_os = f"{self.os.titular_solicitante_nome or '-'} (Particular)"
         
         # Pagador/Faturamento (pode ser empresa ou titular)
         pagador = '-'
         if self.os.empresa_pagadora:
-            pagador = getattr(self.os.empresa_pagadora, 'nome', None) or '-'
-        elif self.os.titular_pagador:
-            pagador = getattr(self.os.titular_pagador, 'nome', None) or '-'
-            pagador = f"{pagador} (Particular)"
+            pagador = self.os.empresa_pagadora.nome or '-'
+        elif self.os.titular_pagador_nome is not None:
+            pagador = f"{self.os.titular_pagador_nome or '-'} (Particular)"
         
         solicitante_user = '-'
         if self.os.solicitante:
-            solicitante_user = getattr(self.os.solicitante, 'nome', None) or '-'
+            solicitante_user = self.os.solicitante.nome or '-'
         
         colaborador_user = '-'
         if self.os.colaborador:
-            colaborador_user = getattr(self.os.colaborador, 'nome', None) or '-'
+            colaborador_user = self.os.colaborador.nome or '-'
         
         # Tabela 2 colunas
         info_data = [
@@ -432,8 +476,8 @@ class OSPDFGenerator:
     
     def _create_beneficiarios_section(self):
         """Cria a seção de beneficiários."""
-        titulares = list(self.os.titulares_vinculados.select_related('titular').all())
-        dependentes = list(self.os.dependentes_vinculados.select_related('dependente', 'dependente__titular').all())
+        titulares = self.os.titulares
+        dependentes = self.os.dependentes
         
         if not titulares and not dependentes:
             return []
@@ -453,18 +497,18 @@ class OSPDFGenerator:
         
         for t in titulares:
             data.append([
-                Paragraph(t.titular.nome if t.titular else '-', cell_style),
+                Paragraph(t.nome or '-', cell_style),
                 Paragraph('Titular', cell_style),
-                Paragraph(getattr(t.titular, 'rnm', '-') or '-', cell_style),
+                Paragraph(t.rnm or '-', cell_style),
                 Paragraph('—', cell_style)
             ])
         
         for d in dependentes:
-            titular_nome = d.dependente.titular.nome if d.dependente and d.dependente.titular else '—'
+            titular_nome = d.titular_nome or '—'
             data.append([
-                Paragraph(d.dependente.nome if d.dependente else '-', cell_style),
+                Paragraph(d.nome or '-', cell_style),
                 Paragraph('Dependente', cell_style),
-                Paragraph(getattr(d.dependente, 'rnm', '-') or '-', cell_style),
+                Paragraph(d.rnm or '-', cell_style),
                 Paragraph(titular_nome, cell_style)
             ])
         
@@ -489,7 +533,7 @@ class OSPDFGenerator:
         elements = []
         elements.append(Paragraph("<b>SERVIÇOS</b>", self.styles['OSSectionTitle']))
         
-        itens = list(self.os.itens.select_related('contrato_servico', 'contrato_servico__servico').all())
+        itens = self.os.itens
         
         if not itens:
             elements.append(Paragraph("<i>Nenhum serviço cadastrado.</i>", self.styles['OSBodyText']))
@@ -508,9 +552,7 @@ class OSPDFGenerator:
         ]]
         
         for idx, item in enumerate(itens, 1):
-            descricao = ''
-            if item.contrato_servico and item.contrato_servico.servico:
-                descricao = item.contrato_servico.servico.descricao or item.contrato_servico.servico.item
+            descricao = item.servico_descricao or item.servico_item or ''
             
             quantidade = item.quantidade or 1
             valor_unit = item.valor_aplicado or Decimal('0')
@@ -547,7 +589,7 @@ class OSPDFGenerator:
         elements = []
         elements.append(Paragraph("<b>DESPESAS</b>", self.styles['OSSectionTitle']))
         
-        despesas = list(self.os.despesas.filter(ativo=True).select_related('tipo_despesa').all())
+        despesas = self.os.despesas
         
         if not despesas:
             elements.append(Paragraph("<i>Nenhuma despesa cadastrada.</i>", self.styles['OSBodyText']))
@@ -564,9 +606,7 @@ class OSPDFGenerator:
         ]]
         
         for idx, despesa in enumerate(despesas, 1):
-            descricao = ''
-            if despesa.tipo_despesa:
-                descricao = despesa.tipo_despesa.descricao or despesa.tipo_despesa.item
+            descricao = despesa.tipo_descricao or despesa.tipo_item or ''
             
             data.append([
                 Paragraph(str(idx), cell_style),
@@ -675,8 +715,15 @@ class OSPDFGenerator:
             bottomPadding=0,
         )
         
-        # Callback para desenhar header/footer em cada página
+        # QR Code gerado uma única vez e reutilizado em todas as páginas
         page_info = self.page_info
+        if page_info.url_validacao and page_info.qr_image is None:
+            try:
+                page_info.qr_image = ImageReader(generate_qr_code_image(page_info.url_validacao))
+            except Exception:
+                page_info.qr_image = None
+        
+        # Callback para desenhar header/footer em cada página
         def page_callback(canvas, doc):
             on_page(canvas, doc, page_info)
         
@@ -716,7 +763,7 @@ def generate_os_pdf(ordem_servico, codigo_documento: str, url_validacao: str) ->
     Função auxiliar para gerar PDF de uma Ordem de Serviço.
     
     Args:
-        ordem_servico: Instância do modelo OrdemServico
+        ordem_servico: DadosDocumentoOS (ou instância de OrdemServico)
         codigo_documento: Código do documento (ex: DOC-OS-000001-V001)
         url_validacao: URL para validação do documento
     
@@ -0,0 +1,47 @@
+"""
+Cache do payload de validação pública de documentos (QR code).
+
+Documentos emitidos são imutáveis, então o payload de validação é guardado
+no cache por id e por código com TTL longo e só é removido se o documento
+for excluído (signals.py), depois do commit da exclusão.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+CACHE_PREFIX = 'documento_os:validacao'
+
+
+def timeout_validacao():
+    return getattr(settings, 'DOCUMENTO_VALIDACAO_CACHE_TIMEOUT', 60 * 60 * 24 * 30)
+
+
+def chave_por_id(documento_id):
+    return f'{CACHE_PREFIX}:id:{documento_id}'
+
+
+def chave_por_codigo(codigo):
+    return f'{CACHE_PREFIX}:codigo:{codigo}'
+
+
+def obter_validacao(chave):
+    """Retorna o payload em cache (ou None)."""
+    return cache.get(chave)
+
+
+def armazenar_validacao(documento, payload):
+    """Guarda o payload sob as duas chaves (id e código)."""
+    cache.set_many({
+        chave_por_id(documento.id): payload,
+        chave_por_codigo(documento.codigo): payload,
+    }, timeout=timeout_validacao())
+
+
+def agendar_invalidacao_validacao(documento):
+    """
+    Remove o payload do cache depois do commit: antes dele, uma validação
+    concorrente ainda lê o documento e gravaria o payload de novo.
+    """
+    chaves = [chave_por_id(documento.id), chave_por_codigo(documento.codigo)]
+    transaction.on_commit(lambda: cache.delete_many(chaves))
@@ -0,0 +1,21 @@
+"""
+Invalidação do cache de validação pública ao excluir um DocumentoOS.
+
+O post_delete é disparado pelo Collector do Django para cada documento
+excluído, inclusive em QuerySet.delete() e na exclusão em cascata da OS.
+"""
+
+from django.db.models.signals import post_delete
+
+from .models import DocumentoOS
+from .services.validacao import agendar_invalidacao_validacao
+
+
+def invalidar_documento_excluido(sender, instance, **kwargs):
+    agendar_invalidacao_validacao(instance)
+
+
+def conectar():
+    post_delete.connect(
+        invalidar_documento_excluido, sender=DocumentoOS, dispatch_uid='validacao_documento_os'
+    )
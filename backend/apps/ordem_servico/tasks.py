@@ -0,0 +1,37 @@
+"""
+Tasks Celery do Sistema de Ordens de Serviço.
+"""
+
+from celery import shared_task
+
+from .models import DocumentoOS
+from .services.documento import carregar_dados_documento, renderizar_documento
+
+
+@shared_task
+def gerar_pdf_documento(documento_id):
+    """
+    Renderiza em background o PDF de um DocumentoOS reservado como PENDENTE.
+
+    Ao concluir, o PDF fica disponível em /documentos-os/{id}/pdf/.
+    """
+    documento = DocumentoOS.objects.get(pk=documento_id)
+    if documento.status_geracao == DocumentoOS.STATUS_GERACAO_CONCLUIDO:
+        return documento.hash_sha256
+
+    documento.status_geracao = DocumentoOS.STATUS_GERACAO_PROCESSANDO
+    documento.save(update_fields=['status_geracao'])
+
+    try:
+        dados = carregar_dados_documento(documento.ordem_servico_id)
+        renderizar_documento(documento, dados)
+    except Exception as e:
+        documento.status_geracao = DocumentoOS.STATUS_GERACAO_ERRO
+        documento.erro_geracao = str(e)
+        documento.save(update_fields=['status_geracao', 'erro_geracao'])
+        raise
+
+    documento.status_geracao = DocumentoOS.STATUS_GERACAO_CONCLUIDO
+    documento.erro_geracao = ''
+    documento.save(update_fields=['hash_sha256', 'dados_snapshot', 'status_geracao', 'erro_geracao'])
+    return documento.hash_sha256
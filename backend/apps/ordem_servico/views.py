@@ -2,18 +2,21 @@ from rest_framework import viewsets, filters, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
+from rest_framework.throttling import UserRateThrottle
 from django_filters.rest_framework import DjangoFilterBackend
 from django_filters import rest_framework as django_filters
+from django.core.exceptions import ValidationError as DjangoValidationError
 from django.db.models import Sum
-from django.http import HttpResponse
+from django.http import HttpResponse, FileResponse, StreamingHttpResponse
+from django.utils.http import parse_etags
 from decimal import Decimal
-import hashlib
 import json
+import re
 
 from .models import (
     EmpresaPrestadora, Servico, OrdemServico, OrdemServicoItem,
     TipoDespesa, DespesaOrdemServico, OrdemServicoTitular, OrdemServicoDependente,
-    DocumentoOS
+    DocumentoOS, FaturamentoMensal
 )
 from .serializers import (
     EmpresaPrestadoraSerializer,
@@ -29,11 +32,17 @@ from .serializers import (
     DocumentoOSSerializer,
     DocumentoOSDetailSerializer,
     DocumentoOSCreateSerializer,
-    DocumentoOSValidacaoSerializer
+    DocumentoOSValidacaoSerializer,
+    FaturamentoMensalSerializer,
+    OrdemServicoExportarPDFsSerializer,
+    LEITURA_ORDEM_SERVICO_LIST
 )
 from apps.accounts.permissions import (
     CargoBasedPermission, PermissionMessageMixin, RequiresSistemaOS
 )
+from apps.core.leitura import LeituraRapidaMixin
+from apps.core.projecao import ProjecaoCamposMixin
+from apps.core.throttling import ValidacaoDocumentoThrottle
 
 
 # =============================================================================
@@ -90,6 +99,20 @@ class OrdemServicoFilter(django_filters.FilterSet):
         return queryset
 
 
+class FaturamentoMensalFilter(django_filters.FilterSet):
+    """Filtro para o relatório de faturamento (resumo materializado)."""
+    
+    mes_de = django_filters.DateFilter(field_name='mes', lookup_expr='gte')
+    mes_ate = django_filters.DateFilter(field_name='mes', lookup_expr='lte')
+    status = django_filters.ChoiceFilter(choices=OrdemServico.STATUS_CHOICES)
+    empresa_pagadora = django_filters.UUIDFilter(field_name='empresa_pagadora_id')
+    empresa_contratada = django_filters.UUIDFilter(field_name='empresa_contratada_id')
+    
+    class Meta:
+        model = FaturamentoMensal
+        fields = ['status', 'empresa_pagadora', 'empresa_contratada']
+
+
 class ServicoFilter(django_filters.FilterSet):
     """Filtro customizado para Serviço."""
     
@@ -132,7 +155,7 @@ class TipoDespesaFilter(django_filters.FilterSet):
 # VIEWSETS
 # =============================================================================
 
-class EmpresaPrestadoraViewSet(PermissionMessageMixin, viewsets.ModelViewSet):
+class EmpresaPrestadoraViewSet(PermissionMessageMixin, ProjecaoCamposMixin, viewsets.ModelViewSet):
     """
     ViewSet para gerenciamento de Empresas Prestadoras (CNPJs internos).
     
@@ -156,7 +179,7 @@ class EmpresaPrestadoraViewSet(PermissionMessageMixin, viewsets.ModelViewSet):
         serializer.save(atualizado_por=self.request.user)
 
 
-class ServicoViewSet(PermissionMessageMixin, viewsets.ModelViewSet):
+class ServicoViewSet(PermissionMessageMixin, ProjecaoCamposMixin, viewsets.ModelViewSet):
     """
     ViewSet para gerenciamento do catálogo de Serviços.
     
@@ -188,7 +211,7 @@ class ServicoViewSet(PermissionMessageMixin, viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class OrdemServicoViewSet(PermissionMessageMixin, viewsets.ModelViewSet):
+class OrdemServicoViewSet(PermissionMessageMixin, ProjecaoCamposMixin, LeituraRapidaMixin, viewsets.ModelViewSet):
     """
     ViewSet para gerenciamento de Ordens de Serviço.
     
@@ -203,6 +226,8 @@ class OrdemServicoViewSet(PermissionMessageMixin, viewsets.ModelViewSet):
     - /recalcular/ - Recalcula valores da OS
     - /finalizar/ - Marca a OS como finalizada
     - /cancelar/ - Cancela a OS
+    - /relatorios/faturamento/ - Totais por mês, pagadora, contratada e status
+    - /exportar-pdfs/ - Gera PDFs de várias OS em paralelo e retorna um ZIP
     """
     
     queryset = OrdemServico.objects.select_related(
@@ -220,6 +245,17 @@ class OrdemServicoViewSet(PermissionMessageMixin, viewsets.ModelViewSet):
     search_fields = ['numero', 'observacao', 'contrato__numero']
     ordering_fields = ['numero', 'status', 'data', 'valor_total', 'data_criacao']
     ordering = ['-numero']
+    leitura_rapida = LEITURA_ORDEM_SERVICO_LIST
+    
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action in ['gerar_pdf', 'exportar_pdfs']:
+            # Os dados do documento são carregados por carregar_dados_documento()
+            return queryset.select_related(None).prefetch_related(None)
+        if self.action == 'servicos_disponiveis':
+            # Só o contrato da OS é usado; os serviços são consultados à parte
+            return queryset.select_related(None).prefetch_related(None).only('id', 'contrato_id')
+        return queryset
     
     def get_serializer_class(self):
         if self.action == 'list':
@@ -269,15 +305,10 @@ class OrdemServicoViewSet(PermissionMessageMixin, viewsets.ModelViewSet):
     @action(detail=True, methods=['get'], url_path='servicos-disponiveis')
     def servicos_disponiveis(self, request, pk=None):
         """Retorna serviços do contrato disponíveis para adicionar na OS."""
-        from apps.contratos.serializers import ContratoServicoListSerializer
+        from apps.contratos.views import servicos_disponiveis_contrato
         
         ordem_servico = self.get_object()
-        servicos_contrato = ordem_servico.contrato.servicos_contratados.filter(
-            ativo=True
-        ).select_related('servico')
-        
-        serializer = ContratoServicoListSerializer(servicos_contrato, many=True)
-        return Response(serializer.data)
+        return Response(servicos_disponiveis_contrato(ordem_servico.contrato_id))
     
     @action(detail=True, methods=['post'])
     def recalcular(self, request, pk=None):
@@ -343,6 +374,11 @@ class OrdemServicoViewSet(PermissionMessageMixin, viewsets.ModelViewSet):
         O PDF é gerado no backend, o hash SHA-256 é calculado sobre o PDF,
         e um registro de DocumentoOS é criado para rastreabilidade.
         
+        Parâmetros:
+        - async=1: enfileira a renderização (Celery) e retorna 202 com o id do
+          documento reservado; acompanhar em /documentos-os/{id}/status/ e
+          baixar em /documentos-os/{id}/pdf/. Sem o parâmetro, gera na hora.
+        
         Retorna:
             - Arquivo PDF como resposta HTTP
             - Headers com informações do documento:
@@ -351,59 +387,39 @@ class OrdemServicoViewSet(PermissionMessageMixin, viewsets.ModelViewSet):
                 - X-Documento-Versao: Versão do documento
                 - X-Documento-Hash: Hash SHA-256 do PDF
         """
-        from .services.pdf_generator import OSPDFGenerator
-        from django.conf import settings
+        from .services.documento import carregar_dados_documento, renderizar_documento
         
         ordem_servico = self.get_object()
         
-        # Determina a versão do documento
-        ultima_versao = DocumentoOS.objects.filter(
-            ordem_servico=ordem_servico
-        ).order_by('-versao').first()
-        
-        nova_versao = (ultima_versao.versao + 1) if ultima_versao else 1
-        
-        # Cria o documento primeiro (para obter o código)
-        # O código será gerado automaticamente pelo model
+        # Reserva versão e código atomicamente (contador por OS com lock).
         documento = DocumentoOS(
             ordem_servico=ordem_servico,
-            versao=nova_versao,
             emitido_por=request.user,
-            dados_snapshot={},  # Será atualizado depois
-            hash_sha256='',  # Será atualizado depois
         )
-        documento.save()
+        documento.versao, documento.codigo = DocumentoOS.alocar_versao(ordem_servico.pk)
         
-        # URL de validação
-        frontend_url = getattr(settings, 'FRONTEND_URL', 'http://localhost:5173')
-        url_validacao = f"{frontend_url}/validar-documento/{documento.id}"
+        if request.query_params.get('async', '').lower() in ('1', 'true'):
+            return self._enfileirar_pdf(documento)
         
-        # Gera o PDF
+        # Todos os dados do documento em um número fixo de queries,
+        # compartilhados entre o PDF e o snapshot
+        dados = carregar_dados_documento(ordem_servico.pk)
+        
+        # Gera e armazena o PDF
         try:
-            generator = OSPDFGenerator(
-                ordem_servico=ordem_servico,
-                codigo_documento=documento.codigo,
-                url_validacao=url_validacao
-            )
-            pdf_bytes, hash_sha256 = generator.generate()
+            pdf_bytes = renderizar_documento(documento, dados)
         except Exception as e:
-            # Se falhar, remove o documento criado
-            documento.delete()
+            # A versão reservada fica sem documento (lacuna na numeração)
             return Response(
                 {'error': f'Erro ao gerar PDF: {str(e)}'},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
         
-        # Cria o snapshot dos dados
-        dados_snapshot = self._criar_snapshot_os(ordem_servico)
-        
-        # Atualiza o documento com o hash e snapshot
-        documento.hash_sha256 = hash_sha256
-        documento.dados_snapshot = dados_snapshot
-        documento.save()
+        # Registra o documento com hash e snapshot em um único INSERT
+        documento.save(force_insert=True)
         
         # Prepara a resposta HTTP com o PDF
-        filename = f"OS-{str(ordem_servico.numero).zfill(6)}-{documento.codigo}.pdf"
+        filename = f"OS-{str(dados.numero).zfill(6)}-{documento.codigo}.pdf"
         
         response = HttpResponse(
             pdf_bytes,
@@ -419,99 +435,132 @@ class OrdemServicoViewSet(PermissionMessageMixin, viewsets.ModelViewSet):
         
         return response
     
-    def _criar_snapshot_os(self, ordem_servico):
-        """Cria um snapshot dos dados da OS para armazenamento."""
-        # Dados básicos da OS
-        snapshot = {
-            'os_numero': ordem_servico.numero,
-            'os_status': ordem_servico.status,
-            'os_data_abertura': str(ordem_servico.data_abertura) if ordem_servico.data_abertura else None,
-            'os_data_fechamento': str(ordem_servico.data_fechamento) if ordem_servico.data_fechamento else None,
-            'os_observacao': ordem_servico.observacao,
-            'os_valor_total': str(ordem_servico.valor_total) if ordem_servico.valor_total else '0.00',
-        }
+    def _enfileirar_pdf(self, documento):
+        """Registra o documento como pendente e agenda a renderização em background."""
+        from django.db import transaction
+        from django.urls import reverse
+        from .tasks import gerar_pdf_documento
         
-        # Contrato
-        if ordem_servico.contrato:
-            snapshot['contrato'] = {
-                'numero': ordem_servico.contrato.numero,
-                'empresa_contratante': ordem_servico.contrato.empresa_contratante.nome if ordem_servico.contrato.empresa_contratante else None,
-            }
+        documento.status_geracao = DocumentoOS.STATUS_GERACAO_PENDENTE
+        documento.hash_sha256 = ''
+        documento.save(force_insert=True)
         
-        # Empresas (modelo Empresa tem campo 'nome')
-        if ordem_servico.empresa_solicitante:
-            snapshot['empresa_solicitante'] = {
-                'nome': ordem_servico.empresa_solicitante.nome,
-                'cnpj': ordem_servico.empresa_solicitante.cnpj,
-            }
+        documento_id = str(documento.id)
         
-        if ordem_servico.empresa_pagadora:
-            snapshot['empresa_pagadora'] = {
-                'nome': ordem_servico.empresa_pagadora.nome,
-                'cnpj': ordem_servico.empresa_pagadora.cnpj,
-            }
+        def enfileirar():
+            try:
+                gerar_pdf_documento.delay(documento_id)
+            except Exception as e:
+                # Broker indisponível: o documento não fica preso como PENDENTE
+                DocumentoOS.objects.filter(pk=documento_id).update(
+                    status_geracao=DocumentoOS.STATUS_GERACAO_ERRO,
+                    erro_geracao=f'Falha ao enfileirar a geração: {e}'
+                )
         
-        # Solicitante (User)
-        if ordem_servico.solicitante:
-            snapshot['solicitante'] = {
-                'nome': ordem_servico.solicitante.nome,
-                'email': ordem_servico.solicitante.email,
-            }
+        transaction.on_commit(enfileirar)
         
-        # Colaborador (User)
-        if ordem_servico.colaborador:
-            snapshot['colaborador'] = {
-                'nome': ordem_servico.colaborador.nome,
-                'email': ordem_servico.colaborador.email,
-            }
+        return Response({
+            'id': documento_id,
+            'codigo': documento.codigo,
+            'versao': documento.versao,
+            'status_geracao': documento.status_geracao,
+            'url_status': reverse('documento-os-status-geracao', args=[documento_id]),
+            'url_pdf': reverse('documento-os-pdf', args=[documento_id]),
+        }, status=status.HTTP_202_ACCEPTED)
+    
+    @action(detail=False, methods=['post'], url_path='exportar-pdfs')
+    def exportar_pdfs(self, request):
+        """
+        Exporta em lote os PDFs de várias OS como um arquivo ZIP (streaming).
         
-        # Titulares
-        titulares = []
-        for titular_vinculado in ordem_servico.titulares_vinculados.select_related('titular').all():
-            titular = titular_vinculado.titular
-            titulares.append({
-                'nome': titular.nome,
-                'cpf': titular.cpf,
-                'observacao': titular_vinculado.observacao,
-            })
-        snapshot['titulares'] = titulares
-        
-        # Dependentes
-        dependentes = []
-        for dependente_vinculado in ordem_servico.dependentes_vinculados.select_related('dependente', 'dependente__titular').all():
-            dependente = dependente_vinculado.dependente
-            dependentes.append({
-                'nome': dependente.nome,
-                'tipo_dependente': dependente.tipo_dependente,
-                'titular_nome': dependente.titular.nome if dependente.titular else None,
-                'observacao': dependente_vinculado.observacao,
-            })
-        snapshot['dependentes'] = dependentes
-        
-        # Itens (Serviços)
-        itens = []
-        for item in ordem_servico.itens.select_related('contrato_servico', 'contrato_servico__servico').all():
-            itens.append({
-                'servico_item': item.contrato_servico.servico.item if item.contrato_servico and item.contrato_servico.servico else None,
-                'servico_descricao': item.contrato_servico.servico.descricao if item.contrato_servico and item.contrato_servico.servico else None,
-                'quantidade': item.quantidade,
-                'valor_unitario': str(item.valor_aplicado) if item.valor_aplicado else '0.00',
-                'valor_total': str(item.valor_total) if item.valor_total else '0.00',
-            })
-        snapshot['itens'] = itens
-        
-        # Despesas
-        despesas = []
-        for despesa in ordem_servico.despesas.select_related('tipo_despesa').filter(ativo=True):
-            despesas.append({
-                'tipo_item': despesa.tipo_despesa.item if despesa.tipo_despesa else None,
-                'tipo_descricao': despesa.tipo_despesa.descricao if despesa.tipo_despesa else None,
-                'valor': str(despesa.valor) if despesa.valor else '0.00',
-                'observacao': despesa.observacao,
-            })
-        snapshot['despesas'] = despesas
+        Corpo (opcional):
+        - ids: lista de UUIDs das OS. Sem `ids`, usa os mesmos filtros da
+          listagem (query params, ex: ?status=FINALIZADA&data_abertura_after=...).
+        
+        Cada OS recebe uma nova versão de DocumentoOS. Os PDFs são renderizados
+        em paralelo (um processo por núcleo) e adicionados ao ZIP conforme
+        ficam prontos; `manifesto.json` (último arquivo do ZIP) traz os
+        documentos gerados, erros e a vazão em documentos/segundo.
+        """
+        from datetime import datetime
+        from django.conf import settings
+        from .services.exportacao import exportar_pdfs_zip, tamanho_pool
+        
+        serializer = OrdemServicoExportarPDFsSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        
+        queryset = self.filter_queryset(self.get_queryset())
+        ids = serializer.validated_data.get('ids')
+        if ids:
+            queryset = queryset.filter(pk__in=ids)
+        
+        limite = getattr(settings, 'EXPORTACAO_PDF_MAX_DOCUMENTOS', 500)
+        ordens_ids = list(queryset.values_list('pk', flat=True)[:limite + 1])
+        
+        if not ordens_ids:
+            return Response(
+                {'error': 'Nenhuma Ordem de Serviço encontrada para exportação.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(ordens_ids) > limite:
+            return Response(
+                {'error': f'A exportação é limitada a {limite} Ordens de Serviço por vez.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         
-        return snapshot
+        filename = f"ordens-servico-{datetime.now().strftime('%Y%m%d-%H%M%S')}.zip"
+        response = StreamingHttpResponse(
+            exportar_pdfs_zip(ordens_ids, request.user),
+            content_type='application/zip'
+        )
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        response['X-Exportacao-Total'] = str(len(ordens_ids))
+        response['X-Exportacao-Workers'] = str(tamanho_pool(len(ordens_ids)))
+        response['Access-Control-Expose-Headers'] = 'X-Exportacao-Total, X-Exportacao-Workers, Content-Disposition'
+        return response
+    
+    @action(detail=False, methods=['get'], url_path='relatorios/faturamento')
+    def relatorio_faturamento(self, request):
+        """
+        Relatório de faturamento por mês, empresa pagadora, empresa contratada e status.
+        
+        Lido do resumo materializado (FaturamentoMensal), sem varrer as OS.
+        
+        Parâmetros:
+        - mes_de / mes_ate: intervalo de meses (YYYY-MM-DD)
+        - empresa_pagadora, empresa_contratada: UUIDs
+        - status: status da OS
+        """
+        queryset = FaturamentoMensal.objects.select_related(
+            'empresa_pagadora', 'empresa_contratada'
+        )
+        filterset = FaturamentoMensalFilter(request.query_params, queryset=queryset)
+        if not filterset.is_valid():
+            return Response(filterset.errors, status=status.HTTP_400_BAD_REQUEST)
+        queryset = filterset.qs
+        
+        totais = queryset.aggregate(
+            quantidade_os=Sum('quantidade_os'),
+            soma_servicos=Sum('valor_servicos'),
+            soma_despesas=Sum('valor_despesas'),
+            soma_total=Sum('valor_total'),
+        )
+        totais = {
+            'quantidade_os': totais['quantidade_os'] or 0,
+            'valor_servicos': totais['soma_servicos'] or Decimal('0'),
+            'valor_despesas': totais['soma_despesas'] or Decimal('0'),
+            'valor_total': totais['soma_total'] or Decimal('0'),
+        }
+        
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = FaturamentoMensalSerializer(page, many=True)
+            response = self.get_paginated_response(serializer.data)
+            response.data['totais'] = totais
+            return response
+        
+        serializer = FaturamentoMensalSerializer(queryset, many=True)
+        return Response({'results': serializer.data, 'totais': totais})
     
     @action(detail=False, methods=['get'])
     def estatisticas(self, request):
@@ -539,7 +588,7 @@ class OrdemServicoViewSet(PermissionMessageMixin, viewsets.ModelViewSet):
         return Response(stats)
 
 
-class OrdemServicoItemViewSet(PermissionMessageMixin, viewsets.ModelViewSet):
+class OrdemServicoItemViewSet(PermissionMessageMixin, ProjecaoCamposMixin, viewsets.ModelViewSet):
     """
     ViewSet para gerenciamento de Itens da OS.
     
@@ -558,7 +607,7 @@ class OrdemServicoItemViewSet(PermissionMessageMixin, viewsets.ModelViewSet):
     filterset_fields = ['ordem_servico']
 
 
-class TipoDespesaViewSet(PermissionMessageMixin, viewsets.ModelViewSet):
+class TipoDespesaViewSet(PermissionMessageMixin, ProjecaoCamposMixin, viewsets.ModelViewSet):
     """
     ViewSet para gerenciamento do catálogo de Tipos de Despesa.
     
@@ -595,7 +644,7 @@ class TipoDespesaViewSet(PermissionMessageMixin, viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class DespesaOrdemServicoViewSet(PermissionMessageMixin, viewsets.ModelViewSet):
+class DespesaOrdemServicoViewSet(PermissionMessageMixin, ProjecaoCamposMixin, viewsets.ModelViewSet):
     """
     ViewSet para gerenciamento de Despesas de Ordem de Serviço.
     
@@ -620,7 +669,7 @@ class DespesaOrdemServicoViewSet(PermissionMessageMixin, viewsets.ModelViewSet):
         serializer.save(atualizado_por=self.request.user)
 
 
-class OrdemServicoTitularViewSet(PermissionMessageMixin, viewsets.ModelViewSet):
+class OrdemServicoTitularViewSet(PermissionMessageMixin, ProjecaoCamposMixin, viewsets.ModelViewSet):
     """
     ViewSet para gerenciamento de Titulares vinculados à OS.
     
@@ -645,7 +694,7 @@ class OrdemServicoTitularViewSet(PermissionMessageMixin, viewsets.ModelViewSet):
         serializer.save(atualizado_por=self.request.user)
 
 
-class OrdemServicoDependenteViewSet(PermissionMessageMixin, viewsets.ModelViewSet):
+class OrdemServicoDependenteViewSet(PermissionMessageMixin, ProjecaoCamposMixin, viewsets.ModelViewSet):
     """
     ViewSet para gerenciamento de Dependentes vinculados à OS.
     
@@ -688,7 +737,94 @@ class DocumentoOSFilter(django_filters.FilterSet):
         fields = ['ordem_servico', 'versao', 'emitido_por']
 
 
-class DocumentoOSViewSet(PermissionMessageMixin, viewsets.ModelViewSet):
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def etag_corresponde(request, etag):
+    """
+    If-None-Match contém o ETag (comparação fraca, RFC 9110): lista de tags
+    separadas por vírgula, com ou sem `W/`, ou `*`.
+    """
+    cabecalho = request.headers.get('If-None-Match')
+    if not cabecalho:
+        return False
+    tags = parse_etags(cabecalho)
+    return '*' in tags or etag in (tag.removeprefix('W/') for tag in tags)
+
+
+def _iterar_trecho(arquivo, inicio, tamanho, bloco=64 * 1024):
+    """Lê `tamanho` bytes do arquivo a partir de `inicio`, em blocos."""
+    try:
+        arquivo.seek(inicio)
+        restante = tamanho
+        while restante > 0:
+            dados = arquivo.read(min(bloco, restante))
+            if not dados:
+                break
+            restante -= len(dados)
+            yield dados
+    finally:
+        arquivo.close()
+
+
+def responder_arquivo(request, arquivo, tamanho, etag, filename, content_type='application/pdf'):
+    """
+    Responde um arquivo com ETag e suporte a Range (um único intervalo).
+    
+    - If-None-Match com o ETag (ou `*`): 304
+    - Range válido: 206 com Content-Range
+    - Range fora do arquivo: 416
+    - Sem Range: FileResponse completo
+    """
+    etag = f'"{etag}"'
+    if etag_corresponde(request, etag):
+        arquivo.close()
+        response = HttpResponse(status=status.HTTP_304_NOT_MODIFIED)
+        response['ETag'] = etag
+        return response
+    
+    intervalo = request.headers.get('Range')
+    # If-Range: só atende o intervalo se o ETag ainda for o mesmo
+    if intervalo and request.headers.get('If-Range', etag) != etag:
+        intervalo = None
+    
+    match = RANGE_RE.match(intervalo.strip()) if intervalo else None
+    if match and (match.group(1) or match.group(2)):
+        inicio_str, fim_str = match.groups()
+        if inicio_str:
+            inicio = int(inicio_str)
+            fim = min(int(fim_str), tamanho - 1) if fim_str else tamanho - 1
+        else:
+            # bytes=-N: últimos N bytes
+            inicio = max(tamanho - int(fim_str), 0)
+            fim = tamanho - 1
+        
+        if inicio >= tamanho or inicio > fim:
+            arquivo.close()
+            response = HttpResponse(status=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE)
+            response['Content-Range'] = f'bytes */{tamanho}'
+            return response
+        
+        comprimento = fim - inicio + 1
+        response = StreamingHttpResponse(
+            _iterar_trecho(arquivo, inicio, comprimento),
+            status=status.HTTP_206_PARTIAL_CONTENT,
+            content_type=content_type
+        )
+        response['Content-Length'] = str(comprimento)
+        response['Content-Range'] = f'bytes {inicio}-{fim}/{tamanho}'
+    else:
+        response = FileResponse(arquivo, content_type=content_type)
+        response['Content-Length'] = str(tamanho)
+    
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    response['Access-Control-Expose-Headers'] = 'ETag, Content-Range, Content-Disposition'
+    return response
+
+
+class DocumentoOSViewSet(PermissionMessageMixin, ProjecaoCamposMixin, viewsets.ModelViewSet):
     """
     ViewSet para gerenciamento de Documentos de OS (PDFs de Orçamento).
     
@@ -699,7 +835,10 @@ class DocumentoOSViewSet(PermissionMessageMixin, viewsets.ModelViewSet):
     - GET /documentos-os/ - Lista documentos
     - GET /documentos-os/{id}/ - Detalhes do documento
     - GET /documentos-os/{id}/validar/ - Valida documento (público)
+    - GET /documentos-os/{id}/pdf/ - Baixa o PDF armazenado da versão (ETag + Range)
+    - GET /documentos-os/{id}/status/ - Status da geração (PDF em background)
     - POST /documentos-os/{id}/validar-integridade/ - Valida integridade por upload
+    - POST /documentos-os/validar-arquivo/ - Identifica o documento pelo PDF (público)
     """
     
     queryset = DocumentoOS.objects.select_related(
@@ -712,6 +851,13 @@ class DocumentoOSViewSet(PermissionMessageMixin, viewsets.ModelViewSet):
     ordering_fields = ['data_emissao', 'versao', 'valor_total']
     ordering = ['-data_emissao']
     
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        # O snapshot só é exibido no detalhe; nas demais ações não é carregado
+        if self.action not in ['retrieve', 'create', 'update', 'partial_update']:
+            queryset = queryset.defer('dados_snapshot')
+        return queryset
+    
     def get_serializer_class(self):
         if self.action == 'create':
             return DocumentoOSCreateSerializer
@@ -721,56 +867,75 @@ class DocumentoOSViewSet(PermissionMessageMixin, viewsets.ModelViewSet):
     
     def get_permissions(self):
         # Validação é pública (sem autenticação necessária)
-        if self.action in ['validar', 'validar_por_codigo']:
+        if self.action in ['validar', 'validar_por_codigo', 'validar_arquivo']:
             return [AllowAny()]
         return super().get_permissions()
     
     def perform_create(self, serializer):
         serializer.save(emitido_por=self.request.user)
     
+    def get_throttles(self):
+        # Validação pública tem cota anônima própria (picos de leitura de QR code)
+        if self.action in ['validar', 'validar_por_codigo', 'validar_arquivo']:
+            return [ValidacaoDocumentoThrottle(), UserRateThrottle()]
+        return super().get_throttles()
+    
+    def _responder_validacao(self, request, chave_cache, **filtro):
+        """
+        Responde a validação pública a partir do cache (por id ou código).
+        
+        Documentos emitidos são imutáveis: o payload fica no cache com TTL
+        longo e a resposta leva Cache-Control público e ETag (hash do PDF).
+        """
+        from django.conf import settings
+        from .services.validacao import obter_validacao, armazenar_validacao
+        
+        payload = obter_validacao(chave_cache)
+        if payload is None:
+            try:
+                documento = DocumentoOS.objects.select_related(
+                    'ordem_servico', 'emitido_por'
+                ).get(status_geracao=DocumentoOS.STATUS_GERACAO_CONCLUIDO, **filtro)
+            except (DocumentoOS.DoesNotExist, ValueError, DjangoValidationError):
+                return Response(
+                    {'valid': False, 'error': 'Documento não encontrado.'},
+                    status=status.HTTP_404_NOT_FOUND
+                )
+            
+            payload = {
+                'valid': True,
+                'documento': DocumentoOSDetailSerializer(documento).data
+            }
+            armazenar_validacao(documento, payload)
+        
+        etag = f'"{payload["documento"]["hash_sha256"]}"'
+        if etag_corresponde(request, etag):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = Response(payload)
+        response['ETag'] = etag
+        response['Cache-Control'] = f'public, max-age={settings.DOCUMENTO_VALIDACAO_MAX_AGE}'
+        return response
+    
     @action(detail=True, methods=['get'], url_path='validar')
     def validar(self, request, pk=None):
         """
         Endpoint público para validação de documento.
-        Retorna metadados do documento para verificação.
+        Retorna metadados do documento para verificação (cacheado por id).
         """
-        try:
-            documento = DocumentoOS.objects.select_related(
-                'ordem_servico', 'emitido_por'
-            ).get(pk=pk)
-        except DocumentoOS.DoesNotExist:
-            return Response(
-                {'valid': False, 'error': 'Documento não encontrado.'},
-                status=status.HTTP_404_NOT_FOUND
-            )
+        from .services.validacao import chave_por_id
         
-        serializer = DocumentoOSDetailSerializer(documento)
-        return Response({
-            'valid': True,
-            'documento': serializer.data
-        })
+        return self._responder_validacao(request, chave_por_id(pk), pk=pk)
     
     @action(detail=False, methods=['get'], url_path='validar-codigo/(?P<codigo>[^/.]+)')
     def validar_por_codigo(self, request, codigo=None):
         """
-        Endpoint público para validação de documento pelo código.
+        Endpoint público para validação de documento pelo código (cacheado por código).
         Ex: GET /documentos-os/validar-codigo/DOC-OS-000001-V001/
         """
-        try:
-            documento = DocumentoOS.objects.select_related(
-                'ordem_servico', 'emitido_por'
-            ).get(codigo=codigo)
-        except DocumentoOS.DoesNotExist:
-            return Response(
-                {'valid': False, 'error': 'Documento não encontrado.'},
-                status=status.HTTP_404_NOT_FOUND
-            )
+        from .services.validacao import chave_por_codigo
         
-        serializer = DocumentoOSDetailSerializer(documento)
-        return Response({
-            'valid': True,
-            'documento': serializer.data
-        })
+        return self._responder_validacao(request, chave_por_codigo(codigo), codigo=codigo)
     
     @action(detail=True, methods=['post'], url_path='validar-integridade')
     def validar_integridade(self, request, pk=None):
@@ -780,9 +945,14 @@ class DocumentoOSViewSet(PermissionMessageMixin, viewsets.ModelViewSet):
         
         O hash armazenado é calculado sobre o PDF gerado no backend,
         portanto o upload do mesmo arquivo PDF deve produzir hash idêntico.
+        O hash do upload é calculado em blocos durante o recebimento.
         """
+        from .services.integridade import instalar_hash_upload, calcular_hash_arquivo, is_pdf
+        
+        hash_handler = instalar_hash_upload(request)
+        
         try:
-            documento = DocumentoOS.objects.get(pk=pk)
+            documento = DocumentoOS.objects.defer('dados_snapshot').get(pk=pk)
         except DocumentoOS.DoesNotExist:
             return Response(
                 {'valid': False, 'error': 'Documento não encontrado.'},
@@ -796,13 +966,7 @@ class DocumentoOSViewSet(PermissionMessageMixin, viewsets.ModelViewSet):
         arquivo = serializer.validated_data['arquivo']
         
         # Verifica se é um PDF válido (começa com %PDF)
-        arquivo.seek(0)
-        header = arquivo.read(5)
-        arquivo.seek(0)
-        
-        is_pdf = header == b'%PDF-'
-        
-        if not is_pdf:
+        if not is_pdf(arquivo):
             return Response({
                 'valid': True,
                 'integridade_valida': False,
@@ -810,10 +974,8 @@ class DocumentoOSViewSet(PermissionMessageMixin, viewsets.ModelViewSet):
                 'mensagem': 'O arquivo enviado não é um PDF válido.'
             })
         
-        # Calcula o hash do arquivo enviado
-        arquivo.seek(0)
-        conteudo = arquivo.read()
-        hash_arquivo = hashlib.sha256(conteudo).hexdigest()
+        # Hash do arquivo enviado (calculado em blocos no upload handler)
+        hash_arquivo = calcular_hash_arquivo(arquivo, hash_handler)
         
         # Compara com o hash armazenado
         integridade_valida = hash_arquivo == documento.hash_sha256
@@ -835,6 +997,96 @@ class DocumentoOSViewSet(PermissionMessageMixin, viewsets.ModelViewSet):
                 'mensagem': 'Integridade comprometida.'
             })
     
+    @action(detail=False, methods=['post'], url_path='validar-arquivo')
+    def validar_arquivo(self, request):
+        """
+        Endpoint público que identifica o documento a partir do próprio PDF.
+        
+        Calcula o SHA-256 do upload em blocos e localiza o documento/versão
+        com uma única consulta pelo índice de hash_sha256.
+        """
+        from .services.integridade import instalar_hash_upload, calcular_hash_arquivo, is_pdf
+        
+        hash_handler = instalar_hash_upload(request)
+        
+        serializer = DocumentoOSValidacaoSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        
+        arquivo = serializer.validated_data['arquivo']
+        if not is_pdf(arquivo):
+            return Response({
+                'valid': False,
+                'mensagem': 'O arquivo enviado não é um PDF válido.'
+            })
+        
+        hash_arquivo = calcular_hash_arquivo(arquivo, hash_handler)
+        documento = DocumentoOS.objects.select_related(
+            'ordem_servico', 'emitido_por'
+        ).filter(
+            hash_sha256=hash_arquivo,
+            status_geracao=DocumentoOS.STATUS_GERACAO_CONCLUIDO
+        ).order_by('versao').first()
+        
+        if documento is None:
+            return Response({
+                'valid': False,
+                'hash_arquivo': hash_arquivo,
+                'mensagem': 'Nenhum documento corresponde a este arquivo.'
+            }, status=status.HTTP_404_NOT_FOUND)
+        
+        return Response({
+            'valid': True,
+            'integridade_valida': True,
+            'codigo_documento': documento.codigo,
+            'versao': documento.versao,
+            'documento': DocumentoOSDetailSerializer(documento).data,
+            'mensagem': 'Documento íntegro.'
+        })
+    
+    @action(detail=True, methods=['get'], url_path='pdf')
+    def pdf(self, request, pk=None):
+        """
+        Baixa o PDF desta versão do documento, sem renderizar novamente.
+        
+        O arquivo é lido do armazenamento por hash (services/armazenamento.py).
+        ETag = hash SHA-256; suporta Range/If-Range e If-None-Match.
+        """
+        from .services.armazenamento import abrir_pdf
+        
+        documento = self.get_object()
+        arquivo, tamanho = abrir_pdf(documento.hash_sha256)
+        if arquivo is None:
+            return Response(
+                {'error': 'PDF não disponível para esta versão do documento.'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        filename = f"OS-{str(documento.ordem_servico.numero).zfill(6)}-{documento.codigo}.pdf"
+        return responder_arquivo(request, arquivo, tamanho, documento.hash_sha256, filename)
+    
+    @action(detail=True, methods=['get'], url_path='status')
+    def status_geracao(self, request, pk=None):
+        """
+        Status da geração do PDF (usado com gerar-pdf/?async=1).
+        
+        Quando `status_geracao` = CONCLUIDO, o PDF está em `url_pdf`.
+        """
+        from django.urls import reverse
+        
+        documento = self.get_object()
+        concluido = documento.status_geracao == DocumentoOS.STATUS_GERACAO_CONCLUIDO
+        return Response({
+            'id': str(documento.id),
+            'codigo': documento.codigo,
+            'versao': documento.versao,
+            'status_geracao': documento.status_geracao,
+            'status_geracao_display': documento.get_status_geracao_display(),
+            'erro_geracao': documento.erro_geracao or None,
+            'hash_sha256': documento.hash_sha256 if concluido else None,
+            'url_pdf': reverse('documento-os-pdf', args=[documento.id]) if concluido else None,
+        })
+    
     @action(detail=False, methods=['get'], url_path='por-os/(?P<os_id>[^/.]+)')
     def por_ordem_servico(self, request, os_id=None):
         """
@@ -842,7 +1094,7 @@ class DocumentoOSViewSet(PermissionMessageMixin, viewsets.ModelViewSet):
         """
         documentos = DocumentoOS.objects.filter(
             ordem_servico_id=os_id
-        ).select_related('ordem_servico', 'emitido_por').order_by('-versao')
+        ).select_related('ordem_servico', 'emitido_por').defer('dados_snapshot').order_by('-versao')
         
         serializer = DocumentoOSSerializer(documentos, many=True)
         return Response(serializer.data)
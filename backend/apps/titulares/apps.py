@@ -5,3 +5,9 @@ class TitularesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.titulares'
     verbose_name = 'Titulares e Dependentes'
+    
+    def ready(self):
+        """Conecta os registros de exclusão do feed de sincronização."""
+        from .signals import conectar
+        
+        conectar()
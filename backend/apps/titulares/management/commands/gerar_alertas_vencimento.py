@@ -0,0 +1,47 @@
+"""
+Management command para gerar os alertas de vencimento de vínculos.
+
+Grava uma notificação por vínculo ativo (titular ou dependente) que entrou
+em uma das janelas de ALERTAS_VENCIMENTO_JANELAS (padrão 90/60/30/15 dias).
+Pode ser executado várias vezes no mesmo dia sem duplicar notificações.
+Em produção roda diariamente pelo Celery Beat.
+
+Uso:
+    python manage.py gerar_alertas_vencimento
+    python manage.py gerar_alertas_vencimento --data 2026-01-31
+"""
+
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.titulares.services.alertas import gerar_alertas_vencimento
+
+
+class Command(BaseCommand):
+    help = 'Gera as notificações de vencimento de vínculos (janelas de antecedência)'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--data',
+            help='Data de referência (YYYY-MM-DD); padrão hoje',
+        )
+    
+    def handle(self, *args, **options):
+        hoje = None
+        if options.get('data'):
+            try:
+                hoje = date.fromisoformat(options['data'])
+            except ValueError:
+                raise CommandError('Data inválida. Use o formato YYYY-MM-DD.')
+        
+        self.stdout.write('Gerando alertas de vencimento...')
+        
+        execucao = gerar_alertas_vencimento(hoje)
+        
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'✓ {execucao.notificacoes_criadas} notificações geradas '
+                f'em {execucao.duracao_segundos:.3f}s (janelas: {execucao.janelas})'
+            )
+        )
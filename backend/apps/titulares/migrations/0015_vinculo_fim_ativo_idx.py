@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:34
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_remove_nacionalidade_consulado'),
+        ('empresa', '0004_add_contato_controle'),
+        ('titulares', '0014_remove_dependente_dependente_id_naci_ac7402_idx_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='vinculodependente',
+            index=models.Index(condition=models.Q(('status', True)), fields=['data_fim_vinculo'], name='vinc_dep_fim_ativo_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vinculotitular',
+            index=models.Index(condition=models.Q(('status', True)), fields=['data_fim_vinculo'], name='vinc_tit_fim_ativo_idx'),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:36
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('titulares', '0015_vinculo_fim_ativo_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExecucaoAlertaVencimento',
+            fields=[
+                ('id', models.UUIDField(db_column='id_execucao_alerta', default=uuid.uuid4, editable=False, primary_key=True, serialize=False, verbose_name='ID')),
+                ('data_referencia', models.DateField(verbose_name='Data de Referência')),
+                ('janelas', models.JSONField(default=list, verbose_name='Janelas (dias)')),
+                ('notificacoes_criadas', models.PositiveIntegerField(default=0, verbose_name='Notificações Criadas')),
+                ('duracao_segundos', models.FloatField(verbose_name='Duração (s)')),
+                ('data_execucao', models.DateTimeField(auto_now_add=True, verbose_name='Data da Execução')),
+            ],
+            options={
+                'verbose_name': 'Execução de Alertas de Vencimento',
+                'verbose_name_plural': 'Execuções de Alertas de Vencimento',
+                'db_table': 'execucao_alerta_vencimento',
+                'ordering': ['-data_execucao'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Notificacao',
+            fields=[
+                ('id', models.UUIDField(db_column='id_notificacao', default=uuid.uuid4, editable=False, primary_key=True, serialize=False, verbose_name='ID')),
+                ('janela_dias', models.PositiveSmallIntegerField(verbose_name='Janela (dias)')),
+                ('data_fim_vinculo', models.DateField(verbose_name='Data Fim do Vínculo')),
+                ('lida', models.BooleanField(default=False, verbose_name='Lida')),
+                ('data_criacao', models.DateTimeField(auto_now_add=True, verbose_name='Data Criação')),
+                ('vinculo_dependente', models.ForeignKey(blank=True, db_column='id_vinculo_dependente', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='notificacoes', to='titulares.vinculodependente', verbose_name='Vínculo do Dependente')),
+                ('vinculo_titular', models.ForeignKey(blank=True, db_column='id_vinculo_titular', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='notificacoes', to='titulares.vinculotitular', verbose_name='Vínculo do Titular')),
+            ],
+            options={
+                'verbose_name': 'Notificação',
+                'verbose_name_plural': 'Notificações',
+                'db_table': 'notificacao',
+                'ordering': ['data_fim_vinculo'],
+                'indexes': [models.Index(fields=['lida', 'data_fim_vinculo'], name='notificacao_lida_f9735f_idx')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('vinculo_titular__isnull', False)), fields=('vinculo_titular', 'janela_dias', 'data_fim_vinculo'), name='notificacao_vinc_tit_janela_uniq'), models.UniqueConstraint(condition=models.Q(('vinculo_dependente__isnull', False)), fields=('vinculo_dependente', 'janela_dias', 'data_fim_vinculo'), name='notificacao_vinc_dep_janela_uniq'), models.CheckConstraint(condition=models.Q(models.Q(('vinculo_dependente__isnull', True), ('vinculo_titular__isnull', False)), models.Q(('vinculo_dependente__isnull', False), ('vinculo_titular__isnull', True)), _connector='OR'), name='notificacao_um_vinculo')],
+            },
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:01
+
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_remove_nacionalidade_consulado'),
+        ('empresa', '0004_add_contato_controle'),
+        ('titulares', '0016_notificacao_vencimento'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RegistroExclusao',
+            fields=[
+                ('id', models.UUIDField(db_column='id_registro_exclusao', default=uuid.uuid4, editable=False, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tipo', models.CharField(choices=[('titular', 'Titular'), ('vinculo_titular', 'Vínculo do Titular'), ('dependente', 'Dependente'), ('vinculo_dependente', 'Vínculo do Dependente')], max_length=20, verbose_name='Tipo')),
+                ('objeto_id', models.UUIDField(verbose_name='ID do Registro Excluído')),
+                ('data_exclusao', models.DateTimeField(auto_now_add=True, verbose_name='Data da Exclusão')),
+            ],
+            options={
+                'verbose_name': 'Registro de Exclusão',
+                'verbose_name_plural': 'Registros de Exclusão',
+                'db_table': 'registro_exclusao',
+                'ordering': ['data_exclusao', 'id'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='dependente',
+            index=models.Index(fields=['ultima_atualizacao', 'id'], name='dependente_sync_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='titular',
+            index=models.Index(fields=['ultima_atualizacao', 'id'], name='titular_sync_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vinculodependente',
+            index=models.Index(fields=['ultima_atualizacao', 'id'], name='vinc_dep_sync_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vinculotitular',
+            index=models.Index(fields=['ultima_atualizacao', 'id'], name='vinc_tit_sync_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='registroexclusao',
+            index=models.Index(fields=['data_exclusao', 'id'], name='reg_exclusao_sync_idx'),
+        ),
+    ]
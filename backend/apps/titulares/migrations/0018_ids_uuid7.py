@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:04
+
+import apps.core.identificadores
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('titulares', '0017_sincronizacao'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='dependente',
+            name='id',
+            field=models.UUIDField(db_column='id_dependente', default=apps.core.identificadores.uuid7, editable=False, primary_key=True, serialize=False, verbose_name='ID'),
+        ),
+        migrations.AlterField(
+            model_name='execucaoalertavencimento',
+            name='id',
+            field=models.UUIDField(db_column='id_execucao_alerta', default=apps.core.identificadores.uuid7, editable=False, primary_key=True, serialize=False, verbose_name='ID'),
+        ),
+        migrations.AlterField(
+            model_name='notificacao',
+            name='id',
+            field=models.UUIDField(db_column='id_notificacao', default=apps.core.identificadores.uuid7, editable=False, primary_key=True, serialize=False, verbose_name='ID'),
+        ),
+        migrations.AlterField(
+            model_name='registroexclusao',
+            name='id',
+            field=models.UUIDField(db_column='id_registro_exclusao', default=apps.core.identificadores.uuid7, editable=False, primary_key=True, serialize=False, verbose_name='ID'),
+        ),
+        migrations.AlterField(
+            model_name='titular',
+            name='id',
+            field=models.UUIDField(db_column='id_titular', default=apps.core.identificadores.uuid7, editable=False, primary_key=True, serialize=False, verbose_name='ID'),
+        ),
+        migrations.AlterField(
+            model_name='vinculodependente',
+            name='id',
+            field=models.UUIDField(db_column='id_vinculo', default=apps.core.identificadores.uuid7, editable=False, primary_key=True, serialize=False, verbose_name='ID'),
+        ),
+        migrations.AlterField(
+            model_name='vinculotitular',
+            name='id',
+            field=models.UUIDField(db_column='id_vinculo', default=apps.core.identificadores.uuid7, editable=False, primary_key=True, serialize=False, verbose_name='ID'),
+        ),
+    ]
@@ -1,6 +1,6 @@
-import uuid
 from django.conf import settings
 from django.db import models
+from apps.core.identificadores import uuid7
 
 
 class Titular(models.Model):
@@ -15,7 +15,7 @@ class Titular(models.Model):
     id = models.UUIDField(
         'ID',
         primary_key=True,
-        default=uuid.uuid4,
+        default=uuid7,
         editable=False,
         db_column='id_titular'
     )
@@ -75,6 +75,8 @@ class Titular(models.Model):
         indexes = [
             models.Index(fields=['nome', 'data_nascimento']),
             models.Index(fields=['nacionalidade'], name='titular_nac_text_idx'),
+            # Feed de sincronização (GET /sync/): ordem de keyset
+            models.Index(fields=['ultima_atualizacao', 'id'], name='titular_sync_idx'),
         ]
     
     def __str__(self):
@@ -96,7 +98,7 @@ class VinculoTitular(models.Model):
     id = models.UUIDField(
         'ID',
         primary_key=True,
-        default=uuid.uuid4,
+        default=uuid7,
         editable=False,
         db_column='id_vinculo'
     )
@@ -195,6 +197,12 @@ class VinculoTitular(models.Model):
             models.Index(fields=['empresa']),
             models.Index(fields=['data_fim_vinculo']),
             models.Index(fields=['consulado'], name='vinc_tit_consul_text_idx'),
+            # Vencimentos de vínculos ativos (calendário e alertas)
+            models.Index(
+                fields=['data_fim_vinculo'], condition=models.Q(status=True),
+                name='vinc_tit_fim_ativo_idx'
+            ),
+            models.Index(fields=['ultima_atualizacao', 'id'], name='vinc_tit_sync_idx'),
         ]
     
     def __str__(self):
@@ -221,7 +229,7 @@ class Dependente(models.Model):
     id = models.UUIDField(
         'ID',
         primary_key=True,
-        default=uuid.uuid4,
+        default=uuid7,
         editable=False,
         db_column='id_dependente'
     )
@@ -294,6 +302,7 @@ class Dependente(models.Model):
             models.Index(fields=['titular']),
             models.Index(fields=['passaporte']),
             models.Index(fields=['nacionalidade'], name='dependente_nac_text_idx'),
+            models.Index(fields=['ultima_atualizacao', 'id'], name='dependente_sync_idx'),
         ]
     
     def __str__(self):
@@ -306,7 +315,7 @@ class VinculoDependente(models.Model):
     id = models.UUIDField(
         'ID',
         primary_key=True,
-        default=uuid.uuid4,
+        default=uuid7,
         editable=False,
         db_column='id_vinculo'
     )
@@ -389,8 +398,158 @@ class VinculoDependente(models.Model):
             models.Index(fields=['data_fim_vinculo']),
             models.Index(fields=['amparo']),
             models.Index(fields=['consulado'], name='vinc_dep_consul_text_idx'),
+            # Vencimentos de vínculos ativos (calendário e alertas)
+            models.Index(
+                fields=['data_fim_vinculo'], condition=models.Q(status=True),
+                name='vinc_dep_fim_ativo_idx'
+            ),
             models.Index(fields=['tipo_atualizacao']),
+            models.Index(fields=['ultima_atualizacao', 'id'], name='vinc_dep_sync_idx'),
         ]
     
     def __str__(self):
         return f"Vínculo de {self.dependente.nome} - {'Ativo' if self.status else 'Inativo'}"
+
+
+class Notificacao(models.Model):
+    """
+    Alerta de vencimento de um vínculo (titular ou dependente) ao entrar em
+    uma janela de antecedência (ex.: 90/60/30/15 dias).
+    
+    Gerado diariamente por `gerar_alertas_vencimento`. A unicidade por
+    (vínculo, janela, data fim) torna a geração idempotente; uma renovação
+    (nova data fim) gera novos alertas.
+    """
+    
+    id = models.UUIDField(
+        'ID',
+        primary_key=True,
+        default=uuid7,
+        editable=False,
+        db_column='id_notificacao'
+    )
+    vinculo_titular = models.ForeignKey(
+        VinculoTitular,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='notificacoes',
+        verbose_name='Vínculo do Titular',
+        db_column='id_vinculo_titular'
+    )
+    vinculo_dependente = models.ForeignKey(
+        VinculoDependente,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='notificacoes',
+        verbose_name='Vínculo do Dependente',
+        db_column='id_vinculo_dependente'
+    )
+    janela_dias = models.PositiveSmallIntegerField('Janela (dias)')
+    data_fim_vinculo = models.DateField('Data Fim do Vínculo')
+    lida = models.BooleanField('Lida', default=False)
+    
+    # Timestamps
+    data_criacao = models.DateTimeField('Data Criação', auto_now_add=True)
+    
+    class Meta:
+        verbose_name = 'Notificação'
+        verbose_name_plural = 'Notificações'
+        db_table = 'notificacao'
+        ordering = ['data_fim_vinculo']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['vinculo_titular', 'janela_dias', 'data_fim_vinculo'],
+                condition=models.Q(vinculo_titular__isnull=False),
+                name='notificacao_vinc_tit_janela_uniq'
+            ),
+            models.UniqueConstraint(
+                fields=['vinculo_dependente', 'janela_dias', 'data_fim_vinculo'],
+                condition=models.Q(vinculo_dependente__isnull=False),
+                name='notificacao_vinc_dep_janela_uniq'
+            ),
+            models.CheckConstraint(
+                condition=(
+                    models.Q(vinculo_titular__isnull=False, vinculo_dependente__isnull=True)
+                    | models.Q(vinculo_titular__isnull=True, vinculo_dependente__isnull=False)
+                ),
+                name='notificacao_um_vinculo'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['lida', 'data_fim_vinculo']),
+        ]
+    
+    def __str__(self):
+        return f"Vencimento em {self.janela_dias} dias ({self.data_fim_vinculo})"
+
+
+class ExecucaoAlertaVencimento(models.Model):
+    """Registro de cada execução da geração de alertas de vencimento."""
+    
+    id = models.UUIDField(
+        'ID',
+        primary_key=True,
+        default=uuid7,
+        editable=False,
+        db_column='id_execucao_alerta'
+    )
+    data_referencia = models.DateField('Data de Referência')
+    janelas = models.JSONField('Janelas (dias)', default=list)
+    notificacoes_criadas = models.PositiveIntegerField('Notificações Criadas', default=0)
+    duracao_segundos = models.FloatField('Duração (s)')
+    data_execucao = models.DateTimeField('Data da Execução', auto_now_add=True)
+    
+    class Meta:
+        verbose_name = 'Execução de Alertas de Vencimento'
+        verbose_name_plural = 'Execuções de Alertas de Vencimento'
+        db_table = 'execucao_alerta_vencimento'
+        ordering = ['-data_execucao']
+    
+    def __str__(self):
+        return f"{self.data_referencia} - {self.notificacoes_criadas} notificações"
+
+
+class RegistroExclusao(models.Model):
+    """
+    Registro da exclusão de um titular, dependente ou vínculo (tombstone),
+    lido pelo feed de sincronização (GET /sync/).
+    
+    Gravado pelo receiver de post_delete de cada modelo (signals.py), que o
+    Django dispara também em QuerySet.delete() e nas exclusões em cascata.
+    """
+    
+    TIPO_TITULAR = 'titular'
+    TIPO_VINCULO_TITULAR = 'vinculo_titular'
+    TIPO_DEPENDENTE = 'dependente'
+    TIPO_VINCULO_DEPENDENTE = 'vinculo_dependente'
+    TIPO_CHOICES = [
+        (TIPO_TITULAR, 'Titular'),
+        (TIPO_VINCULO_TITULAR, 'Vínculo do Titular'),
+        (TIPO_DEPENDENTE, 'Dependente'),
+        (TIPO_VINCULO_DEPENDENTE, 'Vínculo do Dependente'),
+    ]
+    
+    id = models.UUIDField(
+        'ID',
+        primary_key=True,
+        default=uuid7,
+        editable=False,
+        db_column='id_registro_exclusao'
+    )
+    tipo = models.CharField('Tipo', max_length=20, choices=TIPO_CHOICES)
+    objeto_id = models.UUIDField('ID do Registro Excluído')
+    data_exclusao = models.DateTimeField('Data da Exclusão', auto_now_add=True)
+    
+    class Meta:
+        verbose_name = 'Registro de Exclusão'
+        verbose_name_plural = 'Registros de Exclusão'
+        db_table = 'registro_exclusao'
+        ordering = ['data_exclusao', 'id']
+        indexes = [
+            models.Index(fields=['data_exclusao', 'id'], name='reg_exclusao_sync_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.get_tipo_display()} {self.objeto_id} excluído em {self.data_exclusao}"
@@ -1,7 +1,14 @@
-from rest_framework import serializers
+from operator import itemgetter
+
+from rest_framework import ISO_8601, serializers
+from apps.core.bulk import ListaEmLoteSerializer, RelacionadoPorPk, valores_em_uso
+from apps.core.leitura import LeituraRapida
 from apps.core.serializers import AmparoLegalSerializer, TipoAtualizacaoSerializer
 from apps.empresa.serializers import EmpresaListSerializer
-from .models import Titular, VinculoTitular, Dependente, VinculoDependente
+from .models import (
+    Titular, VinculoTitular, Dependente, VinculoDependente,
+    Notificacao, ExecucaoAlertaVencimento, RegistroExclusao
+)
 
 
 class VinculoDependenteSerializer(serializers.ModelSerializer):
@@ -12,6 +19,8 @@ class VinculoDependenteSerializer(serializers.ModelSerializer):
     criado_por_nome = serializers.CharField(source='criado_por.nome', read_only=True)
     atualizado_por_nome = serializers.CharField(source='atualizado_por.nome', read_only=True)
     
+    serializer_related_field = RelacionadoPorPk
+    
     class Meta:
         model = VinculoDependente
         fields = [
@@ -23,6 +32,7 @@ class VinculoDependenteSerializer(serializers.ModelSerializer):
             'criado_por', 'criado_por_nome', 'atualizado_por', 'atualizado_por_nome'
         ]
         read_only_fields = ['id', 'data_criacao', 'ultima_atualizacao', 'criado_por', 'atualizado_por']
+        list_serializer_class = ListaEmLoteSerializer
 
 
 class DependenteSerializer(serializers.ModelSerializer):
@@ -33,6 +43,8 @@ class DependenteSerializer(serializers.ModelSerializer):
     sexo_display = serializers.CharField(source='get_sexo_display', read_only=True)
     vinculos = VinculoDependenteSerializer(many=True, read_only=True)
     
+    serializer_related_field = RelacionadoPorPk
+    
     class Meta:
         model = Dependente
         fields = [
@@ -46,6 +58,7 @@ class DependenteSerializer(serializers.ModelSerializer):
             'vinculos'
         ]
         read_only_fields = ['id', 'data_criacao', 'ultima_atualizacao', 'criado_por', 'atualizado_por']
+        list_serializer_class = ListaEmLoteSerializer
     
     def validate_nome(self, value):
         """Normaliza e valida nome."""
@@ -107,6 +120,8 @@ class VinculoTitularSerializer(serializers.ModelSerializer):
     criado_por_nome = serializers.CharField(source='criado_por.nome', read_only=True)
     atualizado_por_nome = serializers.CharField(source='atualizado_por.nome', read_only=True)
     
+    serializer_related_field = RelacionadoPorPk
+    
     class Meta:
         model = VinculoTitular
         fields = [
@@ -118,6 +133,7 @@ class VinculoTitularSerializer(serializers.ModelSerializer):
             'criado_por', 'criado_por_nome', 'atualizado_por', 'atualizado_por_nome'
         ]
         read_only_fields = ['id', 'data_criacao', 'ultima_atualizacao', 'criado_por', 'atualizado_por']
+        list_serializer_class = ListaEmLoteSerializer
 
 
 class TitularSerializer(serializers.ModelSerializer):
@@ -159,6 +175,9 @@ class TitularListSerializer(serializers.ModelSerializer):
     dependentes_count = serializers.SerializerMethodField()
     vinculos = VinculoSimplificadoSerializer(many=True, read_only=True)
     
+    # Contagens anotadas em TitularViewSet.get_queryset (?fields=/?omit=)
+    fontes_projecao = {'vinculos_count': (), 'dependentes_count': ()}
+    
     class Meta:
         model = Titular
         fields = ['id', 'nome', 'rnm', 'cpf', 'passaporte', 'nacionalidade', 'email', 'telefone',
@@ -166,15 +185,64 @@ class TitularListSerializer(serializers.ModelSerializer):
                   'vinculos', 'data_criacao', 'ultima_atualizacao']
     
     def get_vinculos_count(self, obj):
+        # Anotado em TitularViewSet.get_queryset
+        if hasattr(obj, 'vinculos_count'):
+            return obj.vinculos_count
         return obj.vinculos.filter(status=True).count()
     
     def get_dependentes_count(self, obj):
+        if hasattr(obj, 'dependentes_count'):
+            return obj.dependentes_count
         return obj.dependentes.count()
 
 
+# Listagens via .values() (LeituraRapidaMixin); as contagens do titular são
+# as anotações de TitularViewSet.get_queryset
+LEITURA_TITULAR_LIST = LeituraRapida(TitularListSerializer, calculados={
+    'vinculos_count': (('vinculos_count',), itemgetter('vinculos_count')),
+    'dependentes_count': (('dependentes_count',), itemgetter('dependentes_count')),
+})
+LEITURA_VINCULO_TITULAR = LeituraRapida(VinculoTitularSerializer)
+
+
+# Campos de documento únicos do titular e a mensagem de duplicidade
+DOCUMENTOS_UNICOS_TITULAR = {
+    'cpf': 'Este CPF já está cadastrado.',
+    'rnm': 'Este RNM já está cadastrado.',
+    'cnh': 'Esta CNH já está cadastrada.',
+}
+
+
+def documentos_em_uso(itens):
+    """
+    Verifica em uma única consulta quais documentos únicos já estão em uso.
+    
+    Args:
+        itens: lista de (dados validados, pk do titular em edição ou None)
+    
+    Returns:
+        list: um dict {campo: mensagem} por item (vazio quando não há conflito)
+    """
+    return valores_em_uso(Titular, DOCUMENTOS_UNICOS_TITULAR, itens)
+
+
+class TitularLoteSerializer(ListaEmLoteSerializer):
+    """
+    Validação de vários titulares (many=True): a unicidade dos documentos é
+    verificada para o lote inteiro de uma vez, com lookups `__in`, em vez
+    de uma consulta por item.
+    """
+    
+    campos_unicos = DOCUMENTOS_UNICOS_TITULAR
+
+
 class TitularCreateUpdateSerializer(serializers.ModelSerializer):
     """Serializer para criação/atualização de titular."""
     
+    # Ligada pelo TitularLoteSerializer, que valida a unicidade do lote inteiro
+    validacao_em_lote = False
+    serializer_related_field = RelacionadoPorPk
+    
     class Meta:
         model = Titular
         fields = [
@@ -183,16 +251,20 @@ class TitularCreateUpdateSerializer(serializers.ModelSerializer):
             'data_nascimento', 'data_validade_cnh'
         ]
         read_only_fields = ['id']
+        # Unicidade verificada em validate(), em uma única consulta para
+        # todos os documentos (valores já normalizados)
+        extra_kwargs = {campo: {'validators': []} for campo in DOCUMENTOS_UNICOS_TITULAR}
+        list_serializer_class = TitularLoteSerializer
     
-    def _check_unique(self, field_name, value, error_message):
-        """Verifica unicidade de um campo, excluindo o registro atual em edição."""
-        if not value:
-            return
-        queryset = Titular.objects.filter(**{field_name: value})
-        if self.instance:
-            queryset = queryset.exclude(pk=self.instance.pk)
-        if queryset.exists():
-            raise serializers.ValidationError(error_message)
+    def validate(self, attrs):
+        """Verifica a unicidade de CPF, RNM e CNH em uma única consulta."""
+        attrs = super().validate(attrs)
+        if not self.validacao_em_lote:
+            pk = self.instance.pk if isinstance(self.instance, Titular) else None
+            erros = documentos_em_uso([(attrs, pk)])[0]
+            if erros:
+                raise serializers.ValidationError(erros)
+        return attrs
     
     def validate_nome(self, value):
         """Normaliza e valida nome."""
@@ -207,26 +279,20 @@ class TitularCreateUpdateSerializer(serializers.ModelSerializer):
         return normalized
     
     def validate_cpf(self, value):
-        """Valida, limpa e verifica unicidade do CPF."""
+        """Valida e limpa CPF (unicidade verificada em validate())."""
         if not value:
             return value
         from apps.core.validators import validate_cpf, clean_document
         validate_cpf(value)
-        cleaned = clean_document(value, 'cpf')
-        # Verifica unicidade
-        self._check_unique('cpf', cleaned, 'Este CPF já está cadastrado.')
-        return cleaned
+        return clean_document(value, 'cpf')
     
     def validate_rnm(self, value):
-        """Valida, limpa e verifica unicidade do RNM."""
+        """Valida e limpa RNM (unicidade verificada em validate())."""
         if not value:
             return value
         from apps.core.validators import validate_rnm, clean_document
         validate_rnm(value)
-        cleaned = clean_document(value, 'rnm')
-        # Verifica unicidade
-        self._check_unique('rnm', cleaned, 'Este RNM já está cadastrado.')
-        return cleaned
+        return clean_document(value, 'rnm')
     
     def validate_passaporte(self, value):
         """Valida e limpa passaporte."""
@@ -245,15 +311,12 @@ class TitularCreateUpdateSerializer(serializers.ModelSerializer):
         return clean_document(value, 'ctps')
     
     def validate_cnh(self, value):
-        """Valida, limpa e verifica unicidade da CNH."""
+        """Valida e limpa CNH (unicidade verificada em validate())."""
         if not value:
             return value
         from apps.core.validators import validate_cnh, clean_document
         validate_cnh(value)
-        cleaned = clean_document(value, 'cnh')
-        # Verifica unicidade
-        self._check_unique('cnh', cleaned, 'Esta CNH já está cadastrada.')
-        return cleaned
+        return clean_document(value, 'cnh')
     
     def validate_data_nascimento(self, value):
         """Valida data de nascimento."""
@@ -262,3 +325,115 @@ class TitularCreateUpdateSerializer(serializers.ModelSerializer):
         from apps.core.validators import validate_data_nascimento
         validate_data_nascimento(value)
         return value
+
+
+class VencimentosParametrosSerializer(serializers.Serializer):
+    """Parâmetros do calendário de vencimentos (GET /vencimentos/)."""
+    MAX_DIAS = 366
+    
+    de = serializers.DateField(required=False)
+    ate = serializers.DateField(required=False)
+    empresa = serializers.UUIDField(required=False)
+    agrupamento = serializers.ChoiceField(choices=['dia', 'semana', 'mes'], default='dia')
+    
+    def validate(self, data):
+        from datetime import timedelta
+        from django.utils import timezone
+        
+        data['de'] = data.get('de') or timezone.now().date()
+        data['ate'] = data.get('ate') or data['de'] + timedelta(days=30)
+        
+        if data['ate'] < data['de']:
+            raise serializers.ValidationError({'ate': 'A data final não pode ser anterior à data inicial.'})
+        if (data['ate'] - data['de']).days > self.MAX_DIAS:
+            raise serializers.ValidationError({'ate': f'O intervalo máximo é de {self.MAX_DIAS} dias.'})
+        return data
+
+
+class NotificacaoSerializer(serializers.ModelSerializer):
+    """Serializer de notificação de vencimento de vínculo."""
+    tipo = serializers.SerializerMethodField()
+    titular = serializers.SerializerMethodField()
+    nome = serializers.SerializerMethodField()
+    
+    fontes_projecao = {
+        'tipo': ('vinculo_titular',),
+        'titular': ('vinculo_titular__titular', 'vinculo_dependente__dependente__titular'),
+        'nome': ('vinculo_titular__titular__nome', 'vinculo_dependente__dependente__nome'),
+    }
+    
+    class Meta:
+        model = Notificacao
+        fields = [
+            'id', 'tipo', 'vinculo_titular', 'vinculo_dependente', 'titular', 'nome',
+            'janela_dias', 'data_fim_vinculo', 'lida', 'data_criacao'
+        ]
+        read_only_fields = fields
+    
+    def get_tipo(self, obj):
+        return 'titular' if obj.vinculo_titular_id else 'dependente'
+    
+    def get_titular(self, obj):
+        if obj.vinculo_titular_id:
+            return obj.vinculo_titular.titular_id
+        return obj.vinculo_dependente.dependente.titular_id
+    
+    def get_nome(self, obj):
+        if obj.vinculo_titular_id:
+            return obj.vinculo_titular.titular.nome
+        return obj.vinculo_dependente.dependente.nome
+
+
+class ExecucaoAlertaVencimentoSerializer(serializers.ModelSerializer):
+    """Serializer de execução da geração de alertas de vencimento."""
+    
+    class Meta:
+        model = ExecucaoAlertaVencimento
+        fields = ['id', 'data_referencia', 'janelas', 'notificacoes_criadas', 'duracao_segundos', 'data_execucao']
+
+
+class TitularSincronizacaoSerializer(TitularSerializer):
+    """Titular no feed de sincronização: vínculos e dependentes vêm como itens próprios."""
+    
+    class Meta(TitularSerializer.Meta):
+        fields = [campo for campo in TitularSerializer.Meta.fields if campo not in ('vinculos', 'dependentes')]
+
+
+class DependenteSincronizacaoSerializer(DependenteSerializer):
+    """Dependente no feed de sincronização: os vínculos vêm como itens próprios."""
+    
+    class Meta(DependenteSerializer.Meta):
+        fields = [campo for campo in DependenteSerializer.Meta.fields if campo != 'vinculos']
+
+
+# Tipos do feed de sincronização (GET /sync/), na ordem de keyset
+LEITURAS_SINCRONIZACAO = {
+    RegistroExclusao.TIPO_TITULAR: LeituraRapida(TitularSincronizacaoSerializer),
+    RegistroExclusao.TIPO_VINCULO_TITULAR: LEITURA_VINCULO_TITULAR,
+    RegistroExclusao.TIPO_DEPENDENTE: LeituraRapida(DependenteSincronizacaoSerializer),
+    RegistroExclusao.TIPO_VINCULO_DEPENDENTE: LeituraRapida(VinculoDependenteSerializer),
+}
+
+# Tipos exclusivos do sistema de Prazos (RequiresSistemaPrazos)
+TIPOS_SINCRONIZACAO_PRAZOS = {
+    RegistroExclusao.TIPO_DEPENDENTE,
+    RegistroExclusao.TIPO_VINCULO_DEPENDENTE,
+}
+
+
+class SincronizacaoParametrosSerializer(serializers.Serializer):
+    """Parâmetros do feed de sincronização (GET /sync/)."""
+    MAX_LIMITE = 1000
+    
+    since = serializers.DateTimeField(required=False, input_formats=[ISO_8601])
+    cursor = serializers.CharField(required=False)
+    limite = serializers.IntegerField(min_value=1, max_value=MAX_LIMITE, default=500)
+    
+    def validate_cursor(self, value):
+        from .services.sincronizacao import CursorInvalido, decodificar_cursor
+        
+        try:
+            decodificar_cursor(value)
+        except CursorInvalido as e:
+            raise serializers.ValidationError(str(e))
+        return value
@@ -0,0 +1,112 @@
+"""
+Alertas de vencimento de vínculos (NF-08).
+
+Job diário: para cada janela de antecedência (ALERTAS_VENCIMENTO_JANELAS,
+padrão 90/60/30/15 dias) busca os vínculos ativos cujo vencimento está na
+faixa da janela e grava uma Notificacao por (vínculo, janela, data fim).
+
+- Cada vínculo entra apenas na menor janela que o contém (vencendo em
+  10 dias gera só o alerta de 15), então uma primeira execução não cria
+  alertas atrasados das janelas maiores.
+- As faixas são consultas por intervalo nos índices parciais de vínculos
+  ativos; vínculos já notificados são excluídos por NOT EXISTS e a
+  constraint única garante a idempotência em execuções concorrentes.
+- As linhas são lidas com iterator() e gravadas em lotes (bulk_create).
+  Conflitos ignorados não contam como criadas: conta-se só os ids do lote
+  que foram gravados.
+"""
+
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from .vencimentos import vinculos_dependente_vencendo, vinculos_titular_vencendo
+
+TAMANHO_LOTE = 2000
+
+
+def janelas_alerta():
+    """Janelas configuradas, em ordem crescente de dias."""
+    return sorted(set(getattr(settings, 'ALERTAS_VENCIMENTO_JANELAS', [90, 60, 30, 15])))
+
+
+def faixas_janelas(hoje, janelas):
+    """
+    Faixa de datas de vencimento de cada janela: (janela, de, ate).
+
+    A janela N cobre os vencimentos entre a janela anterior (exclusive) e N dias.
+    """
+    anterior = -1
+    for janela in janelas:
+        yield janela, hoje + timedelta(days=anterior + 1), hoje + timedelta(days=janela)
+        anterior = janela
+
+
+def _inserir(lote):
+    """Grava o lote ignorando conflitos; retorna quantas linhas foram inseridas."""
+    from ..models import Notificacao
+
+    Notificacao.objects.bulk_create(lote, ignore_conflicts=True)
+    # Os ids são gerados na aplicação: os do lote que existem são os inseridos
+    return Notificacao.objects.filter(pk__in=[notificacao.pk for notificacao in lote]).count()
+
+
+def _gravar_notificacoes(queryset, campo, janela, tamanho_lote):
+    """Cria as notificações da janela para os vínculos do queryset; retorna a quantidade."""
+    from ..models import Notificacao
+
+    pendentes = queryset.filter(~Exists(
+        Notificacao.objects.filter(
+            **{campo: OuterRef('pk')},
+            janela_dias=janela,
+            data_fim_vinculo=OuterRef('data_fim_vinculo'),
+        )
+    )).order_by().values_list('id', 'data_fim_vinculo')
+
+    criadas = 0
+    lote = []
+    for vinculo_id, data_fim_vinculo in pendentes.iterator(chunk_size=tamanho_lote):
+        lote.append(Notificacao(
+            **{f'{campo}_id': vinculo_id},
+            janela_dias=janela,
+            data_fim_vinculo=data_fim_vinculo,
+        ))
+        if len(lote) >= tamanho_lote:
+            criadas += _inserir(lote)
+            lote = []
+    if lote:
+        criadas += _inserir(lote)
+    return criadas
+
+
+def gerar_alertas_vencimento(hoje=None, tamanho_lote=TAMANHO_LOTE):
+    """
+    Gera as notificações de vencimento do dia e registra a execução.
+
+    Returns:
+        ExecucaoAlertaVencimento
+    """
+    from ..models import ExecucaoAlertaVencimento
+
+    inicio = time.perf_counter()
+    hoje = hoje or timezone.now().date()
+    janelas = janelas_alerta()
+
+    criadas = 0
+    for janela, de, ate in faixas_janelas(hoje, janelas):
+        criadas += _gravar_notificacoes(
+            vinculos_titular_vencendo(de, ate), 'vinculo_titular', janela, tamanho_lote
+        )
+        criadas += _gravar_notificacoes(
+            vinculos_dependente_vencendo(de, ate), 'vinculo_dependente', janela, tamanho_lote
+        )
+
+    return ExecucaoAlertaVencimento.objects.create(
+        data_referencia=hoje,
+        janelas=janelas,
+        notificacoes_criadas=criadas,
+        duracao_segundos=round(time.perf_counter() - inicio, 3),
+    )
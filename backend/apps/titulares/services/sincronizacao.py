@@ -0,0 +1,171 @@
+"""
+Feed de alterações de titulares, dependentes e vínculos (GET /sync/).
+
+O feed é uma sequência única, em ordem de keyset
+(momento, fonte, id), com:
+
+- alterações (criação ou atualização): linhas de Titular, VinculoTitular,
+  Dependente e VinculoDependente por `ultima_atualizacao`;
+- exclusões (tombstones): RegistroExclusao por `data_exclusao`.
+
+Cada fonte é lida no índice (momento, id) a partir do cursor, com até
+`limite` + 1 linhas, e as fontes são intercaladas em memória. O cursor
+devolvido é a chave da última linha, então o cliente continua de onde
+parou e repete a mesma chamada para receber as próximas alterações.
+
+Linhas alteradas há menos de SINCRONIZACAO_MARGEM_SEGUNDOS ficam para a
+próxima chamada: transações ainda abertas podem gravar `ultima_atualizacao`
+anteriores ao último cursor entregue.
+
+Alterações feitas por SET_NULL em cascata (ex.: exclusão da empresa de um
+vínculo) não atualizam `ultima_atualizacao` e não entram no feed.
+"""
+
+import base64
+import binascii
+import heapq
+import json
+import uuid
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+OPERACAO_ALTERACAO = 'alteracao'
+OPERACAO_EXCLUSAO = 'exclusao'
+
+
+class CursorInvalido(ValueError):
+    """Cursor que não foi gerado por este feed."""
+
+
+def registrar_exclusoes(ids_por_tipo):
+    """
+    Grava os registros de exclusão.
+
+    Args:
+        ids_por_tipo: {RegistroExclusao.TIPO_*: ids excluídos}
+    """
+    from ..models import RegistroExclusao
+
+    RegistroExclusao.objects.bulk_create([
+        RegistroExclusao(tipo=tipo, objeto_id=objeto_id)
+        for tipo, ids in ids_por_tipo.items()
+        for objeto_id in ids
+    ], batch_size=1000)
+
+
+def codificar_cursor(momento, fonte, objeto_id):
+    dados = [momento.isoformat(), fonte, str(objeto_id) if objeto_id else None]
+    return base64.urlsafe_b64encode(json.dumps(dados).encode()).decode()
+
+
+def decodificar_cursor(cursor):
+    """(momento, fonte, id) do cursor; CursorInvalido se não puder ser lido."""
+    try:
+        momento, fonte, objeto_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return (
+            datetime.fromisoformat(momento),
+            int(fonte),
+            uuid.UUID(objeto_id) if objeto_id else None,
+        )
+    except (binascii.Error, TypeError, ValueError, UnicodeError):
+        raise CursorInvalido('Cursor inválido.')
+
+
+def cursor_inicial(desde):
+    """Cursor que inclui tudo a partir de `desde` (antes de qualquer fonte)."""
+    return codificar_cursor(desde, -1, None)
+
+
+def _depois_do_cursor(fonte, campo, chave):
+    """Filtro das linhas da fonte posteriores à chave (momento, fonte, id)."""
+    if chave is None:
+        return Q()
+    momento, fonte_cursor, objeto_id = chave
+    if fonte > fonte_cursor:
+        return Q(**{f'{campo}__gte': momento})
+    if fonte < fonte_cursor:
+        return Q(**{f'{campo}__gt': momento})
+    return Q(**{f'{campo}__gt': momento}) | Q(**{campo: momento, 'pk__gt': objeto_id})
+
+
+def alteracoes(leituras, tipos=None, cursor=None, limite=500, agora=None):
+    """
+    Próxima página do feed.
+
+    Args:
+        leituras: {RegistroExclusao.TIPO_*: LeituraRapida} de todos os tipos
+            do feed (LEITURAS_SINCRONIZACAO); a ordem define a fonte de cada
+            tipo no keyset, igual para qualquer usuário
+        tipos: tipos incluídos (os que o usuário pode ver); None inclui todos
+        cursor: cursor da página anterior (ou de cursor_inicial); None lê
+            desde o início
+        limite: máximo de itens
+
+    Returns:
+        dict: {'resultados': [...], 'cursor': str | None, 'tem_mais': bool}
+    """
+    from ..models import RegistroExclusao
+
+    chave = decodificar_cursor(cursor) if cursor else None
+    agora = agora or timezone.now()
+    ate = agora - timedelta(seconds=getattr(settings, 'SINCRONIZACAO_MARGEM_SEGUNDOS', 5))
+
+    # A fonte de cada tipo é a posição em `leituras`, não entre os incluídos,
+    # para o mesmo cursor valer com qualquer conjunto de permissões
+    incluidos = {
+        tipo: (fonte, leitura) for fonte, (tipo, leitura) in enumerate(leituras.items())
+        if tipos is None or tipo in tipos
+    }
+
+    fontes = []
+    for tipo, (fonte, leitura) in incluidos.items():
+        queryset = leitura.model._default_manager.filter(
+            _depois_do_cursor(fonte, 'ultima_atualizacao', chave),
+            ultima_atualizacao__lte=ate,
+        ).order_by('ultima_atualizacao', 'pk')
+        linhas = leitura.linhas(queryset)[:limite + 1]
+        fontes.append([
+            (linha['ultima_atualizacao'], fonte, linha['id'], tipo, linha)
+            for linha in linhas
+        ])
+
+    fonte_exclusoes = len(leituras)
+    exclusoes = RegistroExclusao.objects.filter(
+        _depois_do_cursor(fonte_exclusoes, 'data_exclusao', chave),
+        tipo__in=list(incluidos),
+        data_exclusao__lte=ate,
+    ).order_by('data_exclusao', 'pk').values_list('data_exclusao', 'id', 'tipo', 'objeto_id')[:limite + 1]
+    fontes.append([
+        (data_exclusao, fonte_exclusoes, registro_id, tipo, objeto_id)
+        for data_exclusao, registro_id, tipo, objeto_id in exclusoes
+    ])
+
+    itens = list(heapq.merge(*fontes, key=lambda item: item[:3]))
+    tem_mais = len(itens) > limite
+    itens = itens[:limite]
+
+    # Só as linhas entregues passam pela serialização, agrupadas por tipo
+    dados = {}
+    for tipo, (_, leitura) in incluidos.items():
+        linhas = [item[4] for item in itens if item[1] < fonte_exclusoes and item[3] == tipo]
+        for linha, saida in zip(linhas, leitura.serializar(linhas)):
+            dados[id(linha)] = saida
+
+    resultados = []
+    for momento, fonte, _, tipo, valor in itens:
+        if fonte == fonte_exclusoes:
+            resultados.append({
+                'tipo': tipo, 'operacao': OPERACAO_EXCLUSAO, 'id': valor, 'data_exclusao': momento,
+            })
+        else:
+            resultados.append({
+                'tipo': tipo, 'operacao': OPERACAO_ALTERACAO, 'id': valor['id'], 'dados': dados[id(valor)],
+            })
+
+    if itens:
+        momento, fonte, objeto_id = itens[-1][:3]
+        cursor = codificar_cursor(momento, fonte, objeto_id)
+    return {'resultados': resultados, 'cursor': cursor, 'tem_mais': tem_mais}
@@ -0,0 +1,131 @@
+"""
+Vencimentos de vínculos ativos de titulares e dependentes.
+
+As consultas vão direto em VinculoTitular e VinculoDependente com
+`status=True` e faixa em `data_fim_vinculo`, cobertas pelos índices parciais
+`vinc_tit_fim_ativo_idx` e `vinc_dep_fim_ativo_idx`.
+"""
+
+from datetime import timedelta
+
+from django.db.models import Exists, OuterRef
+
+TIPO_TITULAR = 'titular'
+TIPO_DEPENDENTE = 'dependente'
+
+AGRUPAMENTO_DIA = 'dia'
+AGRUPAMENTO_SEMANA = 'semana'
+AGRUPAMENTO_MES = 'mes'
+AGRUPAMENTOS = [AGRUPAMENTO_DIA, AGRUPAMENTO_SEMANA, AGRUPAMENTO_MES]
+
+
+def vinculos_titular_vencendo(de, ate, empresa=None):
+    """Vínculos ativos de titulares com data_fim_vinculo entre `de` e `ate` (inclusive)."""
+    from ..models import VinculoTitular
+
+    queryset = VinculoTitular.objects.filter(
+        status=True, data_fim_vinculo__gte=de, data_fim_vinculo__lte=ate
+    )
+    if empresa:
+        queryset = queryset.filter(empresa=empresa)
+    return queryset
+
+
+def vinculos_dependente_vencendo(de, ate, empresa=None):
+    """
+    Vínculos ativos de dependentes com data_fim_vinculo entre `de` e `ate`.
+
+    Com `empresa`, considera os dependentes cujo titular tem vínculo ativo
+    com a empresa.
+    """
+    from ..models import VinculoDependente, VinculoTitular
+
+    queryset = VinculoDependente.objects.filter(
+        status=True, data_fim_vinculo__gte=de, data_fim_vinculo__lte=ate
+    )
+    if empresa:
+        queryset = queryset.filter(Exists(
+            VinculoTitular.objects.filter(
+                titular=OuterRef('dependente__titular'), empresa=empresa, status=True
+            )
+        ))
+    return queryset
+
+
+def inicio_periodo(data, agrupamento):
+    """Primeiro dia do período (dia, semana iniciando na segunda-feira ou mês)."""
+    if agrupamento == AGRUPAMENTO_SEMANA:
+        return data - timedelta(days=data.weekday())
+    if agrupamento == AGRUPAMENTO_MES:
+        return data.replace(day=1)
+    return data
+
+
+def calendario_vencimentos(de, ate, empresa=None, agrupamento=AGRUPAMENTO_DIA):
+    """
+    Monta o calendário de vencimentos do intervalo: totais por período e as
+    linhas de cada vínculo, com uma consulta por modelo.
+
+    Returns:
+        dict: {'total', 'calendario': [...], 'vencimentos': [...]}
+    """
+    titulares = vinculos_titular_vencendo(de, ate, empresa).order_by(
+        'data_fim_vinculo'
+    ).values(
+        'id', 'data_fim_vinculo', 'tipo_vinculo', 'titular_id', 'titular__nome',
+        'empresa_id', 'empresa__nome', 'amparo__nome',
+    )
+    dependentes = vinculos_dependente_vencendo(de, ate, empresa).order_by(
+        'data_fim_vinculo'
+    ).values(
+        'id', 'data_fim_vinculo', 'dependente_id', 'dependente__nome',
+        'dependente__titular_id', 'dependente__titular__nome', 'amparo__nome',
+    )
+
+    vencimentos = [
+        {
+            'tipo': TIPO_TITULAR,
+            'vinculo_id': vinculo['id'],
+            'data_fim_vinculo': vinculo['data_fim_vinculo'],
+            'pessoa_id': vinculo['titular_id'],
+            'nome': vinculo['titular__nome'],
+            'titular_id': vinculo['titular_id'],
+            'titular_nome': vinculo['titular__nome'],
+            'tipo_vinculo': vinculo['tipo_vinculo'],
+            'empresa_id': vinculo['empresa_id'],
+            'empresa_nome': vinculo['empresa__nome'],
+            'amparo_nome': vinculo['amparo__nome'],
+        }
+        for vinculo in titulares
+    ] + [
+        {
+            'tipo': TIPO_DEPENDENTE,
+            'vinculo_id': vinculo['id'],
+            'data_fim_vinculo': vinculo['data_fim_vinculo'],
+            'pessoa_id': vinculo['dependente_id'],
+            'nome': vinculo['dependente__nome'],
+            'titular_id': vinculo['dependente__titular_id'],
+            'titular_nome': vinculo['dependente__titular__nome'],
+            'tipo_vinculo': None,
+            'empresa_id': None,
+            'empresa_nome': None,
+            'amparo_nome': vinculo['amparo__nome'],
+        }
+        for vinculo in dependentes
+    ]
+    vencimentos.sort(key=lambda vencimento: (vencimento['data_fim_vinculo'], vencimento['nome'] or ''))
+
+    periodos = {}
+    for vencimento in vencimentos:
+        periodo = inicio_periodo(vencimento['data_fim_vinculo'], agrupamento)
+        totais = periodos.setdefault(periodo, {
+            'periodo': periodo, 'total': 0, 'titulares': 0, 'dependentes': 0,
+        })
+        totais['total'] += 1
+        totais['titulares' if vencimento['tipo'] == TIPO_TITULAR else 'dependentes'] += 1
+
+    return {
+        'total': len(vencimentos),
+        'calendario': [periodos[periodo] for periodo in sorted(periodos)],
+        'vencimentos': vencimentos,
+    }
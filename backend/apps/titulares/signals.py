@@ -0,0 +1,30 @@
+"""
+Registros de exclusão (tombstones) do feed de sincronização (GET /sync/).
+
+O post_delete é disparado pelo Collector do Django para cada linha excluída,
+inclusive em QuerySet.delete(), na ação "excluir selecionados" do admin e
+nas exclusões em cascata, dentro da transação da exclusão.
+"""
+
+from django.db.models.signals import post_delete
+
+from .models import Dependente, RegistroExclusao, Titular, VinculoDependente, VinculoTitular
+from .services.sincronizacao import registrar_exclusoes
+
+TIPOS_EXCLUSAO = {
+    Titular: RegistroExclusao.TIPO_TITULAR,
+    VinculoTitular: RegistroExclusao.TIPO_VINCULO_TITULAR,
+    Dependente: RegistroExclusao.TIPO_DEPENDENTE,
+    VinculoDependente: RegistroExclusao.TIPO_VINCULO_DEPENDENTE,
+}
+
+
+def registrar_exclusao(sender, instance, **kwargs):
+    registrar_exclusoes({TIPOS_EXCLUSAO[sender]: [instance.pk]})
+
+
+def conectar():
+    for model in TIPOS_EXCLUSAO:
+        post_delete.connect(
+            registrar_exclusao, sender=model, dispatch_uid=f'sincronizacao_{model._meta.model_name}'
+        )
@@ -0,0 +1,17 @@
+"""
+Tasks Celery do Sistema de Prazos.
+"""
+
+from celery import shared_task
+
+from .services.alertas import gerar_alertas_vencimento
+
+
+@shared_task
+def gerar_alertas_vencimento_diario():
+    """Gera as notificações de vencimento do dia (agendada no Celery Beat)."""
+    execucao = gerar_alertas_vencimento()
+    return {
+        'notificacoes_criadas': execucao.notificacoes_criadas,
+        'duracao_segundos': execucao.duracao_segundos,
+    }
@@ -0,0 +1,86 @@
+import datetime
+
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from apps.accounts.models import User
+from apps.core.models import AmparoLegal, TipoAtualizacao
+from apps.empresa.models import Empresa
+
+from .models import Dependente, RegistroExclusao, Titular, VinculoDependente, VinculoTitular
+
+
+class TitularDetalheQueriesTest(TestCase):
+    """
+    GET /titulares/{id}/ lê o titular, vínculos, dependentes e vínculos dos
+    dependentes com um número fixo de queries (TitularViewSet._queryset_detalhe).
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.usuario = User.objects.create_superuser('admin@teste.com', 'senha', nome='Admin')
+        amparo = AmparoLegal.objects.create(nome='Amparo')
+        tipo_atualizacao = TipoAtualizacao.objects.create(nome='Renovação')
+        fim = datetime.date.today() + datetime.timedelta(days=90)
+
+        cls.titular = Titular.objects.create(
+            nome='Titular Teste', rnm='RNM0001', criado_por=cls.usuario, atualizado_por=cls.usuario
+        )
+        for indice in range(3):
+            empresa = Empresa.objects.create(nome=f'Empresa {indice}', cnpj=f'{indice:014d}')
+            VinculoTitular.objects.create(
+                titular=cls.titular, tipo_vinculo='EMPRESA', empresa=empresa, amparo=amparo,
+                tipo_atualizacao=tipo_atualizacao, data_fim_vinculo=fim,
+                criado_por=cls.usuario, atualizado_por=cls.usuario,
+            )
+        for indice in range(3):
+            dependente = Dependente.objects.create(
+                titular=cls.titular, nome=f'Dependente {indice}',
+                criado_por=cls.usuario, atualizado_por=cls.usuario,
+            )
+            for _ in range(2):
+                VinculoDependente.objects.create(
+                    dependente=dependente, amparo=amparo, tipo_atualizacao=tipo_atualizacao,
+                    data_fim_vinculo=fim, criado_por=cls.usuario, atualizado_por=cls.usuario,
+                )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.usuario)
+
+    def test_detalhe_sem_n_mais_1(self):
+        # titular + vínculos + dependentes + vínculos dos dependentes
+        with self.assertNumQueries(4):
+            response = self.client.get(f'/api/v1/titulares/{self.titular.pk}/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['vinculos']), 3)
+        self.assertEqual(len(response.data['dependentes']), 3)
+        self.assertTrue(all(len(dependente['vinculos']) == 2 for dependente in response.data['dependentes']))
+
+
+class RegistroExclusaoTest(TestCase):
+    """Exclusões registradas para o feed de sincronização (GET /sync/)."""
+
+    def test_exclusao_por_queryset_registra_cascata(self):
+        amparo = AmparoLegal.objects.create(nome='Amparo')
+        titulares = [Titular.objects.create(nome=f'Titular {indice}') for indice in range(2)]
+        for titular in titulares:
+            VinculoTitular.objects.create(titular=titular, tipo_vinculo='PARTICULAR', amparo=amparo)
+            dependente = Dependente.objects.create(titular=titular, nome=f'Dependente de {titular.nome}')
+            VinculoDependente.objects.create(dependente=dependente, amparo=amparo)
+
+        esperado = {
+            (RegistroExclusao.TIPO_TITULAR, titular.pk) for titular in titulares
+        } | {
+            (RegistroExclusao.TIPO_VINCULO_TITULAR, pk) for pk in VinculoTitular.objects.values_list('pk', flat=True)
+        } | {
+            (RegistroExclusao.TIPO_DEPENDENTE, pk) for pk in Dependente.objects.values_list('pk', flat=True)
+        } | {
+            (RegistroExclusao.TIPO_VINCULO_DEPENDENTE, pk)
+            for pk in VinculoDependente.objects.values_list('pk', flat=True)
+        }
+
+        Titular.objects.filter(pk__in=[titular.pk for titular in titulares]).delete()
+
+        self.assertEqual(set(RegistroExclusao.objects.values_list('tipo', 'objeto_id')), esperado)
@@ -1,6 +1,9 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import TitularViewSet, VinculoTitularViewSet, DependenteViewSet, VinculoDependenteViewSet, PesquisaUnificadaViewSet
+from .views import (
+    TitularViewSet, VinculoTitularViewSet, DependenteViewSet, VinculoDependenteViewSet, PesquisaUnificadaViewSet,
+    VencimentoViewSet, NotificacaoViewSet, SincronizacaoViewSet
+)
 
 router = DefaultRouter()
 router.register(r'titulares', TitularViewSet, basename='titular')
@@ -8,6 +11,9 @@ router.register(r'vinculos-titular', VinculoTitularViewSet, basename='vinculo-ti
 router.register(r'dependentes', DependenteViewSet, basename='dependente')
 router.register(r'vinculos-dependentes', VinculoDependenteViewSet, basename='vinculo-dependente')
 router.register(r'pesquisa', PesquisaUnificadaViewSet, basename='pesquisa')
+router.register(r'vencimentos', VencimentoViewSet, basename='vencimento')
+router.register(r'notificacoes', NotificacaoViewSet, basename='notificacao')
+router.register(r'sync', SincronizacaoViewSet, basename='sync')
 
 urlpatterns = [
     path('', include(router.urls)),
@@ -1,4 +1,4 @@
-from rest_framework import viewsets, filters, status
+from rest_framework import viewsets, filters, serializers, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
@@ -6,14 +6,23 @@ from rest_framework.parsers import MultiPartParser, FormParser
 from django_filters.rest_framework import DjangoFilterBackend
 from django_filters import rest_framework as django_filters
 from django.db import transaction
-from django.db.models import Q
+from django.db.models import Count, Exists, OuterRef, Prefetch, Q
 import openpyxl
 from io import BytesIO
-from .models import Titular, VinculoTitular, Dependente, VinculoDependente
+from .models import (
+    Titular, VinculoTitular, Dependente, VinculoDependente,
+    Notificacao, ExecucaoAlertaVencimento
+)
 from .serializers import (
     TitularSerializer, TitularListSerializer, TitularCreateUpdateSerializer,
-    VinculoTitularSerializer, DependenteSerializer, VinculoDependenteSerializer
+    VinculoTitularSerializer, DependenteSerializer, VinculoDependenteSerializer,
+    VencimentosParametrosSerializer, NotificacaoSerializer, ExecucaoAlertaVencimentoSerializer,
+    LEITURA_TITULAR_LIST, LEITURA_VINCULO_TITULAR,
+    LEITURAS_SINCRONIZACAO, TIPOS_SINCRONIZACAO_PRAZOS, SincronizacaoParametrosSerializer
 )
+from apps.core.bulk import EmLoteMixin
+from apps.core.leitura import LeituraRapidaMixin
+from apps.core.projecao import ProjecaoCamposMixin
 from apps.core.models import AmparoLegal
 from apps.accounts.permissions import (
     CargoBasedPermission, PermissionMessageMixin, IsGestorOuSuperior,
@@ -22,7 +31,14 @@ from apps.accounts.permissions import (
 
 
 class TitularFilter(django_filters.FilterSet):
-    """Filtro customizado para Titular."""
+    """
+    Filtro customizado para Titular.
+    
+    Os filtros de vínculo não fazem join: cada um acrescenta um predicado e
+    todos são combinados em um único EXISTS correlacionado sobre
+    VinculoTitular (ver filter_queryset). Assim os predicados valem para o
+    mesmo vínculo e não é preciso DISTINCT.
+    """
     empresa = django_filters.UUIDFilter(method='filter_by_empresa')
     tipo_vinculo = django_filters.CharFilter(method='filter_by_tipo_vinculo')
     vinculo_status = django_filters.BooleanFilter(method='filter_by_vinculo_status')
@@ -37,62 +53,77 @@ class TitularFilter(django_filters.FilterSet):
         model = Titular
         fields = ['nacionalidade', 'sexo']
     
+    def filter_queryset(self, queryset):
+        self._predicados_vinculo = []
+        queryset = super().filter_queryset(queryset)
+        if self._predicados_vinculo:
+            queryset = queryset.filter(Exists(
+                VinculoTitular.objects.filter(titular=OuterRef('pk'), *self._predicados_vinculo)
+            ))
+        return queryset
+    
+    def _filtrar_vinculo(self, queryset, **predicado):
+        """Registra um predicado de vínculo (aplicado no EXISTS de filter_queryset)."""
+        self._predicados_vinculo.append(Q(**predicado))
+        return queryset
+    
     def filter_by_empresa(self, queryset, name, value):
         """Filtra titulares que têm vínculo com a empresa especificada."""
         if value:
-            return queryset.filter(vinculos__empresa=value).distinct()
+            return self._filtrar_vinculo(queryset, empresa=value)
         return queryset
     
     def filter_by_tipo_vinculo(self, queryset, name, value):
         """Filtra titulares pelo tipo de vínculo."""
         if value:
-            return queryset.filter(vinculos__tipo_vinculo=value).distinct()
+            return self._filtrar_vinculo(queryset, tipo_vinculo=value)
         return queryset
     
     def filter_by_vinculo_status(self, queryset, name, value):
         """Filtra titulares pelo status do vínculo."""
         if value is not None:
-            return queryset.filter(vinculos__status=value).distinct()
+            return self._filtrar_vinculo(queryset, status=value)
         return queryset
     
     def filter_data_fim_gte(self, queryset, name, value):
         """Filtra titulares com data fim vínculo >= valor."""
         if value:
-            return queryset.filter(vinculos__data_fim_vinculo__gte=value).distinct()
+            return self._filtrar_vinculo(queryset, data_fim_vinculo__gte=value)
         return queryset
     
     def filter_data_fim_lte(self, queryset, name, value):
         """Filtra titulares com data fim vínculo <= valor."""
         if value:
-            return queryset.filter(vinculos__data_fim_vinculo__lte=value).distinct()
+            return self._filtrar_vinculo(queryset, data_fim_vinculo__lte=value)
         return queryset
     
     def filter_data_entrada_gte(self, queryset, name, value):
         """Filtra titulares com data entrada no país >= valor."""
         if value:
-            return queryset.filter(vinculos__data_entrada_pais__gte=value).distinct()
+            return self._filtrar_vinculo(queryset, data_entrada_pais__gte=value)
         return queryset
     
     def filter_data_entrada_lte(self, queryset, name, value):
         """Filtra titulares com data entrada no país <= valor."""
         if value:
-            return queryset.filter(vinculos__data_entrada_pais__lte=value).distinct()
+            return self._filtrar_vinculo(queryset, data_entrada_pais__lte=value)
         return queryset
     
     def filter_ultima_atualizacao_gte(self, queryset, name, value):
         """Filtra titulares com última atualização >= valor."""
         if value:
-            return queryset.filter(vinculos__ultima_atualizacao__gte=value).distinct()
+            return self._filtrar_vinculo(queryset, ultima_atualizacao__gte=value)
         return queryset
     
     def filter_ultima_atualizacao_lte(self, queryset, name, value):
         """Filtra titulares com última atualização <= valor."""
         if value:
-            return queryset.filter(vinculos__ultima_atualizacao__lte=value).distinct()
+            return self._filtrar_vinculo(queryset, ultima_atualizacao__lte=value)
         return queryset
 
 
-class TitularViewSet(PermissionMessageMixin, viewsets.ModelViewSet):
+class TitularViewSet(PermissionMessageMixin, ProjecaoCamposMixin, LeituraRapidaMixin, EmLoteMixin,
+                     viewsets.ModelViewSet):
     """
     ViewSet para gerenciamento de titulares.
     
@@ -111,11 +142,55 @@ class TitularViewSet(PermissionMessageMixin, viewsets.ModelViewSet):
     search_fields = ['nome', 'rnm', 'cpf', 'passaporte', 'email']
     ordering_fields = ['nome', 'rnm', 'data_criacao', 'data_nascimento', 'ultima_atualizacao']
     ordering = ['nome']
+    leitura_rapida = LEITURA_TITULAR_LIST
+    
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == 'list':
+            # Contagens anotadas (TitularListSerializer); só os vínculos são pré-carregados
+            return Titular.objects.annotate(
+                vinculos_count=Count('vinculos', filter=Q(vinculos__status=True), distinct=True),
+                dependentes_count=Count('dependentes', distinct=True),
+            ).prefetch_related(
+                Prefetch('vinculos', queryset=VinculoTitular.objects.select_related('empresa', 'amparo'))
+            )
+        if self.action in ['retrieve', 'vinculos', 'dependentes']:
+            return self._queryset_detalhe()
+        return queryset
+    
+    @staticmethod
+    def _queryset_detalhe():
+        """
+        Titular com todas as relações lidas pelo TitularSerializer
+        (vínculos, dependentes e vínculos dos dependentes com amparo, tipo de
+        atualização e nomes de auditoria): 4 queries, independente da
+        quantidade de dependentes e vínculos.
+        """
+        auditoria = ('criado_por', 'atualizado_por')
+        return Titular.objects.select_related(*auditoria).prefetch_related(
+            Prefetch(
+                'vinculos',
+                queryset=VinculoTitular.objects.select_related(
+                    'empresa', 'amparo', 'tipo_atualizacao', *auditoria
+                )
+            ),
+            Prefetch(
+                'dependentes',
+                queryset=Dependente.objects.select_related(*auditoria).prefetch_related(
+                    Prefetch(
+                        'vinculos',
+                        queryset=VinculoDependente.objects.select_related(
+                            'amparo', 'tipo_atualizacao', *auditoria
+                        )
+                    )
+                )
+            ),
+        )
     
     def get_serializer_class(self):
         if self.action == 'list':
             return TitularListSerializer
-        elif self.action in ['create', 'update', 'partial_update']:
+        elif self.action in ['create', 'update', 'partial_update', 'bulk']:
             return TitularCreateUpdateSerializer
         return TitularSerializer
     
@@ -298,7 +373,8 @@ class TitularViewSet(PermissionMessageMixin, viewsets.ModelViewSet):
             return Response({'error': f'Erro ao processar arquivo: {str(e)}'}, status=status.HTTP_400_BAD_REQUEST)
 
 
-class VinculoTitularViewSet(PermissionMessageMixin, viewsets.ModelViewSet):
+class VinculoTitularViewSet(PermissionMessageMixin, ProjecaoCamposMixin, LeituraRapidaMixin, EmLoteMixin,
+                            viewsets.ModelViewSet):
     """
     ViewSet para gerenciamento de vínculos de titulares.
     
@@ -323,6 +399,7 @@ class VinculoTitularViewSet(PermissionMessageMixin, viewsets.ModelViewSet):
     search_fields = ['titular__nome', 'titular__rnm', 'empresa__nome', 'observacoes']
     ordering_fields = ['data_criacao', 'data_entrada_pais', 'data_fim_vinculo', 'titular__nome']
     ordering = ['-data_criacao']
+    leitura_rapida = LEITURA_VINCULO_TITULAR
     
     def perform_create(self, serializer):
         serializer.save(criado_por=self.request.user, atualizado_por=self.request.user)
@@ -331,7 +408,7 @@ class VinculoTitularViewSet(PermissionMessageMixin, viewsets.ModelViewSet):
         serializer.save(atualizado_por=self.request.user)
 
 
-class DependenteViewSet(PermissionMessageMixin, viewsets.ModelViewSet):
+class DependenteViewSet(PermissionMessageMixin, ProjecaoCamposMixin, EmLoteMixin, viewsets.ModelViewSet):
     """
     ViewSet para gerenciamento de dependentes.
     
@@ -358,7 +435,7 @@ class DependenteViewSet(PermissionMessageMixin, viewsets.ModelViewSet):
         serializer.save(atualizado_por=self.request.user)
 
 
-class VinculoDependenteViewSet(PermissionMessageMixin, viewsets.ModelViewSet):
+class VinculoDependenteViewSet(PermissionMessageMixin, ProjecaoCamposMixin, EmLoteMixin, viewsets.ModelViewSet):
     """
     ViewSet para gerenciamento de vínculos de dependentes.
     
@@ -386,6 +463,150 @@ class VinculoDependenteViewSet(PermissionMessageMixin, viewsets.ModelViewSet):
         serializer.save(atualizado_por=self.request.user)
 
 
+class VencimentoViewSet(PermissionMessageMixin, viewsets.ViewSet):
+    """
+    Calendário de vencimentos de vínculos ativos (titulares e dependentes).
+    
+    EXCLUSIVO DO SISTEMA DE PRAZOS.
+    
+    GET /vencimentos/?de=YYYY-MM-DD&ate=YYYY-MM-DD&empresa=<uuid>&agrupamento=dia|semana|mes
+    
+    - de: padrão hoje; ate: padrão de + 30 dias (intervalo máximo de 366 dias)
+    - empresa: vínculos de titulares com a empresa e dependentes desses titulares
+    - agrupamento: granularidade dos totais em `calendario` (padrão dia)
+    
+    Retorna os totais por período (`calendario`) e as linhas (`vencimentos`)
+    ordenadas por data, com uma consulta por modelo no índice parcial de
+    vínculos ativos.
+    """
+    permission_classes = [IsAuthenticated, RequiresSistemaPrazos, CargoBasedPermission]
+    
+    # Define o modelo para a verificação de permissões
+    queryset = VinculoTitular.objects.none()
+    
+    def list(self, request):
+        from .services.vencimentos import calendario_vencimentos
+        
+        parametros = VencimentosParametrosSerializer(data=request.query_params)
+        parametros.is_valid(raise_exception=True)
+        dados = parametros.validated_data
+        
+        calendario = calendario_vencimentos(
+            dados['de'], dados['ate'],
+            empresa=dados.get('empresa'),
+            agrupamento=dados['agrupamento'],
+        )
+        return Response({
+            'de': dados['de'],
+            'ate': dados['ate'],
+            'agrupamento': dados['agrupamento'],
+            **calendario,
+        })
+
+
+class SincronizacaoViewSet(PermissionMessageMixin, viewsets.ViewSet):
+    """
+    Feed incremental de alterações de titulares, dependentes e vínculos.
+    
+    GET /sync/?since=<timestamp>&cursor=<cursor>&limite=500
+    
+    - since: alterações a partir do momento informado (sem since e sem
+      cursor, desde o início: carga inicial)
+    - cursor: continuação da chamada anterior (tem precedência sobre since)
+    - limite: itens por chamada (máximo 1000)
+    
+    Retorna alterações (criação/atualização, com os dados do registro) e
+    exclusões de Titular, VinculoTitular, Dependente e VinculoDependente em
+    ordem de keyset, o `cursor` da próxima chamada e `tem_mais`. Só entram
+    os tipos que o usuário pode visualizar; dependentes e seus vínculos só
+    com acesso ao sistema de Prazos.
+    """
+    permission_classes = [IsAuthenticated, CargoBasedPermission]
+    
+    # Define o modelo para a verificação de permissões
+    queryset = Titular.objects.none()
+    
+    def list(self, request):
+        from .services.sincronizacao import alteracoes, cursor_inicial
+        
+        parametros = SincronizacaoParametrosSerializer(data=request.query_params)
+        parametros.is_valid(raise_exception=True)
+        dados = parametros.validated_data
+        
+        cursor = dados.get('cursor')
+        if not cursor and dados.get('since'):
+            cursor = cursor_inicial(dados['since'])
+        
+        # Dependentes são exclusivos do sistema de Prazos (como nos seus ViewSets)
+        sistema_prazos = RequiresSistemaPrazos().has_permission(request, self)
+        tipos = [
+            tipo for tipo, leitura in LEITURAS_SINCRONIZACAO.items()
+            if request.user.has_perm(
+                f'{leitura.model._meta.app_label}.view_{leitura.model._meta.model_name}'
+            )
+            and (sistema_prazos or tipo not in TIPOS_SINCRONIZACAO_PRAZOS)
+        ]
+        resultado = alteracoes(
+            LEITURAS_SINCRONIZACAO, tipos=tipos, cursor=cursor, limite=dados['limite']
+        )
+        
+        # Mesmo formato de data/hora dos registros (REST_FRAMEWORK['DATETIME_FORMAT'])
+        formato = serializers.DateTimeField()
+        for item in resultado['resultados']:
+            if 'data_exclusao' in item:
+                item['data_exclusao'] = formato.to_representation(item['data_exclusao'])
+        return Response(resultado)
+
+
+class NotificacaoViewSet(PermissionMessageMixin, ProjecaoCamposMixin, viewsets.ReadOnlyModelViewSet):
+    """
+    Notificações de vencimento geradas pelo job diário (gerar_alertas_vencimento).
+    
+    EXCLUSIVO DO SISTEMA DE PRAZOS.
+    
+    Endpoints:
+    - GET /notificacoes/ - Lista notificações (filtros: lida, janela_dias, data_fim_vinculo)
+    - PATCH /notificacoes/{id}/marcar-lida/ - Marca a notificação como lida
+    - GET /notificacoes/ultima-execucao/ - Última execução do job (duração, quantidade)
+    """
+    
+    queryset = Notificacao.objects.select_related(
+        'vinculo_titular__titular', 'vinculo_dependente__dependente'
+    )
+    serializer_class = NotificacaoSerializer
+    permission_classes = [IsAuthenticated, RequiresSistemaPrazos, CargoBasedPermission]
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
+    filterset_fields = {
+        'lida': ['exact'],
+        'janela_dias': ['exact'],
+        'data_fim_vinculo': ['exact', 'gte', 'lte'],
+    }
+    ordering_fields = ['data_fim_vinculo', 'janela_dias', 'data_criacao']
+    ordering = ['data_fim_vinculo']
+    # Marcar como lida faz parte da leitura: basta view_notificacao (ex.: Consultor)
+    permissoes_por_acao = {'marcar_lida': 'view'}
+    
+    @action(detail=True, methods=['patch'], url_path='marcar-lida')
+    def marcar_lida(self, request, pk=None):
+        """Marca a notificação como lida."""
+        notificacao = self.get_object()
+        if not notificacao.lida:
+            notificacao.lida = True
+            notificacao.save(update_fields=['lida'])
+        return Response(self.get_serializer(notificacao).data)
+    
+    @action(detail=False, methods=['get'], url_path='ultima-execucao')
+    def ultima_execucao(self, request):
+        """Retorna a última execução da geração de alertas (duração e quantidade)."""
+        execucao = ExecucaoAlertaVencimento.objects.order_by('-data_execucao').first()
+        if execucao is None:
+            return Response(
+                {'error': 'A geração de alertas ainda não foi executada.'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        return Response(ExecucaoAlertaVencimentoSerializer(execucao).data)
+
+
 class PesquisaUnificadaViewSet(PermissionMessageMixin, viewsets.ViewSet):
     """
     ViewSet para pesquisa unificada de titulares e dependentes com paginação real.
@@ -0,0 +1,4 @@
+# Garante que o app Celery é carregado junto com o Django (para @shared_task)
+from .celery import app as celery_app
+
+__all__ = ('celery_app',)
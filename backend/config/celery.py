@@ -0,0 +1,23 @@
+"""
+Configuração do Celery para o projeto Atlas.
+
+Worker:
+    celery -A config worker -l info
+
+Worker com agendador (tarefas periódicas de CELERY_BEAT_SCHEDULE):
+    celery -A config worker -B -l info
+"""
+
+import os
+
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+app = Celery('atlas')
+
+# Lê as configurações CELERY_* do settings.py
+app.config_from_object('django.conf:settings', namespace='CELERY')
+
+# Descobre tasks.py em cada app instalado
+app.autodiscover_tasks()
@@ -1,42 +1,187 @@
+from django.conf import settings
+from django.core.paginator import EmptyPage, InvalidPage, Page, PageNotAnInteger, Paginator
+from django.db import connections
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
 
+PARAMETRO_CONTAGEM = 'contagem'
+CONTAGEM_EXATA = 'exata'
+CONTAGEM_APROXIMADA = 'aproximada'
+
+
+def estimar_total(queryset):
+    """
+    Total estimado de linhas pelas estatísticas do planner (pg_class.reltuples).
+
+    Só vale para querysets sem filtros, DISTINCT, fatiamento ou agrupamento
+    diferente da própria tabela, no PostgreSQL.
+
+    Returns:
+        int | None: estimativa, ou None quando não é possível estimar
+    """
+    query = queryset.query
+    if connections[queryset.db].vendor != 'postgresql':
+        return None
+    if (query.where or query.distinct or query.combinator or query.extra_tables
+            or query.low_mark or query.high_mark is not None
+            or query.group_by not in (None, True)):
+        return None
+
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(
+            'SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(%s)',
+            [queryset.model._meta.db_table],
+        )
+        linha = cursor.fetchone()
+    # reltuples = -1: tabela ainda não analisada (ANALYZE/autovacuum)
+    if linha is None or linha[0] is None or linha[0] < 0:
+        return None
+    return linha[0]
+
+
+class PaginaAproximada(Page):
+    """Página cuja próxima é conhecida pela linha extra buscada, não pelo total."""
+
+    def __init__(self, object_list, number, paginator, tem_proxima):
+        super().__init__(object_list, number, paginator)
+        self.tem_proxima = tem_proxima
+
+    def has_next(self):
+        return self.tem_proxima
+
+
+class PaginatorContagemAproximada(Paginator):
+    """
+    Paginator com contagem aproximada:
+
+    - sem filtros: estimativa do planner, quando passa de `limite`;
+    - com filtros: COUNT limitado a `limite` + 1 linhas ("10000+").
+
+    Abaixo do limite a contagem é exata. As páginas não dependem do total:
+    cada uma busca uma linha a mais para saber se há próxima, e a contagem
+    exata só é feita para achar a última página (página fora do intervalo).
+    """
+
+    def __init__(self, object_list, per_page, limite, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.limite = limite
+        self.aproximado = False
+        self._total = None
+
+    @property
+    def count(self):
+        if self._total is None:
+            self._total = self._contar()
+        return self._total
+
+    def _contar(self):
+        estimativa = estimar_total(self.object_list)
+        if estimativa is not None and estimativa > self.limite:
+            self.aproximado = True
+            return estimativa
+        total = self.object_list.order_by()[:self.limite + 1].count()
+        if total > self.limite:
+            self.aproximado = True
+            return self.limite
+        return total
+
+    def validate_number(self, number):
+        """Valida só o limite inferior; o superior é visto ao buscar a página."""
+        try:
+            if isinstance(number, float) and not number.is_integer():
+                raise ValueError
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger(self.error_messages['invalid_page'])
+        if number < 1:
+            raise EmptyPage(self.error_messages['min_page'])
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        inicio = (number - 1) * self.per_page
+        linhas = list(self.object_list[inicio:inicio + self.per_page + 1])
+        if not linhas and number > 1:
+            raise EmptyPage(self.error_messages['no_results'])
+        return PaginaAproximada(linhas[:self.per_page], number, self, len(linhas) > self.per_page)
+
+    def ultima_pagina(self):
+        """
+        Última página pela contagem exata, que passa a ser o `count`.
+
+        Returns:
+            PaginaAproximada | None: None quando não há resultados
+        """
+        self._total = self.object_list.count()
+        self.aproximado = False
+        if self._total == 0:
+            return None
+        numero = -(-self._total // self.per_page)
+        inicio = (numero - 1) * self.per_page
+        return PaginaAproximada(list(self.object_list[inicio:self._total]), numero, self, False)
+
 
 class SafePageNumberPagination(PageNumberPagination):
     """
-    Paginação customizada que retorna uma lista vazia quando a página
+    Paginação customizada que retorna a última página válida quando a página
     solicitada está fora do intervalo, em vez de retornar 404.
+
+    Contagem aproximada (`?contagem=aproximada`, ou em todas as listagens
+    com PAGINACAO_CONTAGEM_APROXIMADA): estimativa do planner sem filtros e
+    contagem limitada a PAGINACAO_LIMITE_CONTAGEM com filtros; a resposta
+    traz `count_aproximado`. `?contagem=exata` força o COUNT(*).
     """
     page_size = 20
     page_size_query_param = 'page_size'
     max_page_size = 1000
 
+    def contagem_aproximada(self, request):
+        contagem = request.query_params.get(PARAMETRO_CONTAGEM)
+        if contagem in (CONTAGEM_EXATA, CONTAGEM_APROXIMADA):
+            return contagem == CONTAGEM_APROXIMADA
+        return getattr(settings, 'PAGINACAO_CONTAGEM_APROXIMADA', False)
+
     def paginate_queryset(self, queryset, request, view=None):
         """
-        Override para tratar páginas fora do intervalo.
+        Override para tratar páginas fora do intervalo com uma única contagem.
         """
+        self.request = request
+        self.page = None
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        if self.contagem_aproximada(request) and hasattr(queryset, 'query'):
+            paginator = PaginatorContagemAproximada(
+                queryset, page_size, getattr(settings, 'PAGINACAO_LIMITE_CONTAGEM', 10000)
+            )
+            if request.query_params.get(self.page_query_param) in self.last_page_strings:
+                self.page = paginator.ultima_pagina()
+                return list(self.page) if self.page is not None else []
+        else:
+            paginator = self.django_paginator_class(queryset, page_size)
+
         try:
-            return super().paginate_queryset(queryset, request, view)
-        except Exception:
-            # Se a página não existe, retorna a última página válida
-            from django.core.paginator import Paginator
-            page_size = self.get_page_size(request)
-            if page_size is None:
-                return None
-            
-            paginator = Paginator(queryset, page_size)
-            
-            # Se não há resultados, retorna lista vazia
-            if paginator.count == 0:
-                self.page = None
-                self.request = request
+            self.page = paginator.page(self.get_page_number(request, paginator))
+        except InvalidPage:
+            # Retorna a última página válida (o total já calculado é reaproveitado);
+            # se não há resultados, retorna lista vazia
+            self.page = self._ultima_pagina(paginator)
+            if self.page is None:
                 return []
-            
-            # Retorna a última página válida
-            page_number = paginator.num_pages
-            self.page = paginator.page(page_number)
-            self.request = request
-            return list(self.page)
+
+        if not isinstance(paginator, PaginatorContagemAproximada):
+            if paginator.num_pages > 1 and self.template is not None:
+                self.display_page_controls = True
+        return list(self.page)
+
+    @staticmethod
+    def _ultima_pagina(paginator):
+        if isinstance(paginator, PaginatorContagemAproximada):
+            return paginator.ultima_pagina()
+        if paginator.count == 0:
+            return None
+        return paginator.page(paginator.num_pages)
 
     def get_paginated_response(self, data):
         """
@@ -49,10 +194,13 @@ class SafePageNumberPagination(PageNumberPagination):
                 'previous': None,
                 'results': data
             })
-        
-        return Response({
+
+        resposta = {
             'count': self.page.paginator.count,
             'next': self.get_next_link(),
             'previous': self.get_previous_link(),
             'results': data
-        })
+        }
+        if isinstance(self.page.paginator, PaginatorContagemAproximada):
+            resposta['count_aproximado'] = self.page.paginator.aproximado
+        return Response(resposta)
@@ -7,6 +7,7 @@ from datetime import timedelta
 from pathlib import Path
 
 import dj_database_url
+from celery.schedules import crontab
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -137,7 +138,7 @@ else:
     }
 
 # ===========================================
-# CELERY (preparado para futuro)
+# CELERY
 # ===========================================
 
 CELERY_BROKER_URL = os.environ.get('CELERY_BROKER_URL', 'redis://localhost:6379/1')
@@ -146,6 +147,21 @@ CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = 'America/Sao_Paulo'
+# Executa as tasks no próprio processo (desenvolvimento sem worker)
+CELERY_TASK_ALWAYS_EAGER = os.environ.get('CELERY_TASK_ALWAYS_EAGER', 'False').lower() in ('true', '1', 'yes')
+
+# Tarefas periódicas (Celery Beat)
+CELERY_BEAT_SCHEDULE = {
+    'gerar-alertas-vencimento': {
+        'task': 'apps.titulares.tasks.gerar_alertas_vencimento_diario',
+        'schedule': crontab(hour=int(os.environ.get('ALERTAS_VENCIMENTO_HORA', '6')), minute=0),
+    },
+}
+
+# Alertas de vencimento: janelas de antecedência em dias (ex: "90,60,30,15")
+ALERTAS_VENCIMENTO_JANELAS = [
+    int(dias) for dias in os.environ.get('ALERTAS_VENCIMENTO_JANELAS', '90,60,30,15').split(',') if dias.strip()
+]
 
 # ===========================================
 # PASSWORD VALIDATION
@@ -186,6 +202,36 @@ STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# PDFs de Ordem de Serviço armazenados por hash SHA-256 (conteúdo endereçável).
+# Fora do MEDIA_ROOT: o acesso é só pelo DocumentoOSViewSet.pdf (autenticado),
+# e o hash, de que deriva o caminho, é público na validação do documento
+DOCUMENTOS_OS_ROOT = BASE_DIR / 'documentos_os'
+
+# Payload de validação pública de documentos (imutáveis): TTL do cache e do Cache-Control
+DOCUMENTO_VALIDACAO_CACHE_TIMEOUT = 60 * 60 * 24 * 30
+DOCUMENTO_VALIDACAO_MAX_AGE = 60 * 60 * 24
+
+# Respostas de contratos usadas no formulário de OS (ativos, serviços disponíveis)
+CONTRATOS_CACHE_TIMEOUT = int(os.environ.get('CONTRATOS_CACHE_TIMEOUT', str(60 * 5)))
+
+# Exportação de PDFs em lote (ZIP): limite por requisição e processos do pool
+EXPORTACAO_PDF_MAX_DOCUMENTOS = int(os.environ.get('EXPORTACAO_PDF_MAX_DOCUMENTOS', '500'))
+EXPORTACAO_PDF_MAX_WORKERS = int(os.environ.get('EXPORTACAO_PDF_MAX_WORKERS', '0')) or None
+
+# Criação/atualização em lote (POST /<recurso>/bulk/): itens por requisição.
+# O corpo JSON de um lote cheio passa do limite padrão de 2,5 MB do Django.
+BULK_MAX_ITENS = int(os.environ.get('BULK_MAX_ITENS', '5000'))
+DATA_UPLOAD_MAX_MEMORY_SIZE = int(os.environ.get('DATA_UPLOAD_MAX_MEMORY_SIZE', str(10 * 1024 * 1024)))
+
+# Paginação: contagem aproximada em todas as listagens (sem filtros, estimativa
+# do planner; com filtros, COUNT limitado). Por requisição: ?contagem=aproximada|exata
+PAGINACAO_CONTAGEM_APROXIMADA = os.environ.get('PAGINACAO_CONTAGEM_APROXIMADA', 'False').lower() in ('true', '1', 'yes')
+PAGINACAO_LIMITE_CONTAGEM = int(os.environ.get('PAGINACAO_LIMITE_CONTAGEM', '10000'))
+
+# Feed de sincronização (GET /sync/): alterações mais recentes que a margem
+# ficam para a próxima chamada (transações ainda abertas)
+SINCRONIZACAO_MARGEM_SEGUNDOS = int(os.environ.get('SINCRONIZACAO_MARGEM_SEGUNDOS', '5'))
+
 # ===========================================
 # DEFAULT PRIMARY KEY
 # ===========================================
@@ -227,7 +273,9 @@ REST_FRAMEWORK = {
     ],
     'DEFAULT_THROTTLE_RATES': {
         'anon': '100/hour',
-        'user': '1000/hour'
+        'user': '1000/hour',
+        # Validação pública de documentos (leitura de QR code)
+        'validacao_documento': '300/hour'
     },
     # Exception handler customizado para mensagens padronizadas
     'EXCEPTION_HANDLER': 'apps.core.exceptions.custom_exception_handler',
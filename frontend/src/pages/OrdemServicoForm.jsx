@@ -974,7 +974,7 @@ function OrdemServicoForm() {
                     >
                       <div style={{ fontWeight: 500 }}>{dependente.nome}</div>
                       <div style={{ fontSize: '0.85em', color: '#6b7280' }}>
-                        {dependente.cpf || 'Sem CPF'}
+                        {dependente.rnm || 'Sem RNM'}
                         {dependente.titular_nome && ` • Titular: ${dependente.titular_nome}`}
                       </div>
                     </div>
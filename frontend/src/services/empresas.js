@@ -7,4 +7,4 @@ export const updateEmpresa = (id, data) => api.patch(`/api/v1/empresas/${id}/`,
 export const deleteEmpresa = (id) => api.delete(`/api/v1/empresas/${id}/`)
 
 // Search para autocomplete (busca por nome ou CNPJ)
-export const searchEmpresas = (search) => api.get('/api/v1/empresas/', { params: { search, status: true, page_size: 20 } })
+export const searchEmpresas = (search) => api.get('/api/v1/empresas/', { params: { search, status: true, page_size: 20, fields: 'id,nome' } })
@@ -12,7 +12,7 @@ export const getTitularDependentes = (id) => api.get(`/api/v1/titulares/${id}/de
 // Busca de titulares para AutoComplete
 export const searchTitulares = async (query) => {
   const res = await api.get('/api/v1/titulares/', { 
-    params: { search: query, page_size: 20 } 
+    params: { search: query, page_size: 20, fields: 'id,nome,cpf' } 
   })
   const results = res.data.results || res.data || []
   return {
@@ -50,15 +50,16 @@ export const deleteDependente = (id) => api.delete(`/api/v1/dependentes/${id}/`)
 // Busca de dependentes para AutoComplete
 export const searchDependentes = async (query) => {
   const res = await api.get('/api/v1/dependentes/', { 
-    params: { search: query, page_size: 20 } 
+    params: { search: query, page_size: 20, fields: 'id,nome,rnm,tipo_dependente,titular_nome' } 
   })
   const results = res.data.results || res.data || []
   return {
     data: results.map(d => ({
       id: d.id,
-      label: `${d.nome} - ${d.cpf || 'Sem CPF'}`,
+      label: `${d.nome} - ${d.rnm || 'Sem RNM'}`,
       nome: d.nome,
-      cpf: d.cpf,
+      rnm: d.rnm,
+      tipo_dependente: d.tipo_dependente,
       titular_nome: d.titular_nome
     }))
   }